@@ -26,7 +26,6 @@
 import numpy as np  # Library untuk fungsi matematika
 import pandas as pd # Library untuk mengolah dataset
 import random, secrets  # Library untuk membuat nilai random
-from collections import Counter # Import library untuk menghitung
 
 # Import library yang akan digunakan untuk Optimasi MaOO
 # Library yang akan digunakna adalah pymoo
@@ -37,38 +36,73 @@ from pymoo.util.ref_dirs import get_reference_directions    # Import reference d
 from pymoo.core.problem import ElementwiseProblem   # Import Element Wise Problem untuk mendefinisikan penyusunan menu makanan sebagai masalah optimisasi
 from pymoo.operators.crossover.sbx import SBX   # Import crossover yang digunakan dalam optimasi
 from pymoo.operators.mutation.pm import PM  # Import mutasi yang digunakan dalam optimasi
+from Website.planner import Meal_Planning_Batch, Meal_Planning_Slot, EliminasiDuplikatMultiset  # Import masalah optimasi yang dievaluasi per populasi dan eliminasi duplikat
+from Website.planner.paralel import PoolEvaluasi  # Import pool worker untuk evaluasi paralel
+from Website.planner.katalog import KatalogMakanan  # Import katalog makanan berbasis array
+from Website.planner.alergi import IndeksAlergi  # Import indeks alergi makanan
+from Website.planner.target_akg import bangun_tabel_akg, cari_profil_akg  # Import tabel target AKG per tahun, usia, dan ketersediaan susu
+from Website.planner.operator_genetik import operator_diskrit  # Import operator genetik diskrit
+from Website.planner.dataset import baca_dataset  # Import pembacaan dataset melalui snapshot biner
+from Website.planner.mingguan import buat_indeks_nama, batas_per_nama, pilih_acak, cari_tepat  # Import indeks makanan untuk penyusunan menu mingguan
+from Website.planner.terminasi import TerminasiKonvergensi, ringkasan_terminasi  # Import penghentian optimasi berdasarkan konvergensi
+
+# Mode evaluasi calon solusi pada optimasi
+#   1. "batch" : seluruh populasi dievaluasi sekaligus dengan numpy (Meal_Planning_Batch)
+#   2. "jit" : seluruh populasi dievaluasi sekaligus dengan kernel Numba (Meal_Planning_Batch), numpy jika Numba tidak terpasang
+#   3. "elementwise" : calon solusi dievaluasi satu per satu dengan pandas (Meal_Planning)
+MODE_EVALUASI = "batch"
+
+# Evaluasi paralel (hanya untuk mode "batch" dan "jit")
+# Jumlah worker yang digunakan untuk mengevaluasi populasi, 1 berarti evaluasi tidak dilakukan secara paralel
+N_WORKER = 1
+# Jenis pool worker : "proses" atau "thread"
+# Pada Windows, mode "proses" akan menjalankan ulang kode ini di setiap worker, sehingga disarankan menggunakan "thread"
+MODE_PARALEL = "thread"
+
+# Cache hasil evaluasi (hanya untuk mode "batch" dan "jit")
+# Jumlah maksimal calon solusi yang disimpan pada cache, 0 berarti cache tidak digunakan
+UKURAN_CACHE_EVALUASI = 50000
+# Eliminasi calon solusi dengan kumpulan makanan yang sama (tanpa melihat urutan) dari populasi
+ELIMINASI_DUPLIKAT = True
+
+# Enkode genom calon solusi (hanya untuk mode "batch" dan "jit")
+#   1. "indeks" : setiap gen memilih makanan mana saja pada dataset makanan
+#   2. "slot" : setiap gen terikat pada satu jenis makanan dan hanya memilih makanan dari jenis tersebut (Meal_Planning_Slot)
+ENKODE_GENOM = "indeks"
+
+# Operator genetik pada C-TAEA (hanya untuk mode "batch" dan "jit")
+#   1. "sbx" : crossover SBX dan mutasi PM pada bilangan real, calon solusi dibulatkan ke bawah saat evaluasi
+#   2. "diskrit" : sampling, crossover, mutasi, dan repair pada genom integer berdasarkan jenis makanan (planner.operator_genetik)
+OPERATOR_GENETIK = "sbx"
+
+# Jumlah maksimal generasi optimasi
+N_GENERASI = 500
+
+# Penghentian optimasi
+#   1. "n_gen" : optimasi selalu berjalan sampai generasi ke-N_GENERASI
+#   2. "konvergen" : optimasi berhenti lebih awal jika front solusi feasible tidak bergerak lagi (TerminasiKonvergensi),
+#      dengan N_GENERASI sebagai batas maksimal generasi
+MODE_TERMINASI = "n_gen"
+TOLERANSI_KONVERGENSI = 0.02    # Toleransi pergerakan front yang dinormalisasi terhadap front satu jendela sebelumnya
+JENDELA_KONVERGENSI = 30    # Jumlah generasi berturut-turut dengan pergerakan front di bawah toleransi
+RASIO_FEASIBLE_MIN = 0.9    # Rasio calon solusi feasible minimal pada populasi sebelum optimasi dapat berhenti
+
+# Cara memilih 7 menu harian untuk menu mingguan
+#   1. "tepat" : backtracking (planner.mingguan.cari_tepat), menu mingguan pasti ditemukan jika ada,
+#      ambang batas hanya dilonggarkan jika menu mingguan terbukti tidak ada
+#   2. "acak" : menu harian dipilih secara acak sebanyak maksimal 5000 percobaan untuk setiap pelonggaran
+MODE_SUSUN_MINGGUAN = "tepat"
 
 # Membaca Dataset yang digunakan
 # Digunakan dua dataset pada optimasi
 #   1. Dataset AKG yang akan menyimpan data AKG berdasarkan usia anak dan tahun standar AKG yang digunakan
 #   2. Dataset makanan yang menyimpan data makanan dan informasi-informasi seperti kandungan nutrisi, porsi, dan tipe makanan
-data_AKG = pd.read_excel("AKG.xlsx")    # Membaca dataset AKG target
-data_makanan = pd.read_excel("Dataset_Makanan.xlsx")    # Membaca dataset makanan
+# Dataset dibaca dari snapshot biner di samping file Excel (planner.dataset), snapshot dibangun ulang jika file Excel berubah
+data_AKG = baca_dataset("AKG.xlsx")    # Membaca dataset AKG target
+data_makanan = baca_dataset("Dataset_Makanan.xlsx")    # Membaca dataset makanan
 
 # Mendeklarasikan fungsi-fungsi yang akan digunakan dalam kode utama
 
-# Membuat fungsi untuk mencari nilai AKG target
-# Pencarian AKG target terdiri ata dua tahap
-#   1. Mencari AKG targer berdasarkan usia, terdapat 5 pilihan yaitu 1, 2, 3, 4, dan 5 tahun
-#   2. Mencari AKG target berdasarkan tahun standar yang digunakan, terdapat 2 pilihan yaitu tahun 2014 dan 2019
-# Membuat fungsi untuk mencari nilai AKG target berdasarkan tahun
-# Fungsi akan mencari nilai target AKG sesuai dengan tahun standar yang diinput oleh user
-def cari_Tahun_AKG(tahun_AKG, df_AKG):
-    row_data = df_AKG[df_AKG["Tahun"] == tahun_AKG] # Mencari tahun pada kolom "tahun" di dataset yang sama dengan tahun standar yang diinput
-    if row_data.empty:
-        return ValueError(f"Tidak ditemukan data AKG untuk tahun {tahun_AKG}.") # Jika tidak ditemukan, maka akan muncul peringatan
-    # Jika usia ditemukan, maka akan dikembalikan data AKG yang sesuai dengan usia input
-    return row_data.drop(columns=["Tahun"]).reset_index(drop=True) # AKG dengan tahun yang tidak sesuai akan didrop
-
-# Membuat fungsi untuk mencari nilai AKG target berdasarkan usia
-# Fungsi akan mencari nilai target AKG sesuai dengan usia yang diinput oleh user
-def cari_Target_AKG(umur_user, df_AKG):
-    row_data = df_AKG[df_AKG["umur"] == umur_user] # Mencari usia pada kolom "umur" di dataset yang sama dengan usia user
-    if row_data.empty:
-        return ValueError(f"Tidak ditemukan data AKG untuk umur {umur_user} tahun.")    # Jika tidak ditemukan, maka akan muncul peringatan
-    # jika usia ditemukan, maka akan dikembalikan data AKG yang sesuai dengan usia input
-    return row_data.drop(columns=["umur"]).reset_index(drop=True)   # AKG untuk usia yang tidak sesuai akan didrop
-
 # Beberapa fungsi tambahan yang akan digunakan untuk menyusun menu mingguan
 # Membuat fungsi untuk reindex dataframe menjadi 6 index
 def pad_df_to_six(df):
@@ -179,94 +213,36 @@ class Meal_Planning(ElementwiseProblem):
 # Kode Utama
 # Mendeklarasikan input tahun standar AKG yang akan digunakan
 input_tahun = 2019
-# Mencari AKG yang sesuai dengan tahun standar input
-Tahun_AKG = cari_Tahun_AKG(input_tahun, data_AKG)
 # Menerima input usia user dan menyimpannya kedalam variabel input_umur_user
 input_umur_user = int(input("Masukkan data usia dalam tahun : "))
-# Mencari AKG yang sesuai dengan usia input
-Target_AKG = cari_Target_AKG(input_umur_user, Tahun_AKG)
 # Menerima input alergi user
 # Algoritma dapat menerima beberapa makanan data alergi anak, dengan syarat setiap makanannya dipisahkan dengan koma
 input_alergi_user = input("Masukkan data alergi anak (pisahkan dengan koma jika lebih dari satu) : ").strip()
 
 # Menghilangkan data makanan alergi user data dataset makanan
-if input_alergi_user:
-    alergi_list = [a.strip().lower() for a in input_alergi_user.split(",")] # Membuat input data makanan menjadi list
-
-    # Memfilter makanan alergi dari dataset
-    # Mencari data makanan alergi di dataset makanan
-    # Pencarian makanan dilakukan berdasarkan kolom "Nama makanan" dan "Tipe"
-
-    # Mendeklarasi kondisi nama dan kondisi tipe yang mendefinisikan alergi makanan
-    kondisi_nama = data_makanan["Nama Makanan"].str.lower().str.contains("|".join(alergi_list))
-    kondisi_tipe = data_makanan["Tipe"].str.lower().str.contains("|".join(alergi_list))
-
-    # Menyimpan kondisi alergi makanan jika ia terdapat di kolom "Nama Makanan" atau "Tipe" sebagai kondisi gabungan
-    kondisi_gabungan = kondisi_nama | kondisi_tipe
-
-    # Drop alergi makanan dari dataset berdasarkan kondisi gabungan
-    data_makanan = data_makanan[~kondisi_gabungan].reset_index(drop=True)
-
+# Katalog makanan lengkap dan indeks alergi (kata pada kolom "Nama Makanan" dan "Tipe" -> bitmask makanan) dibangun satu kali
+# Makanan alergi dicari pada indeks alergi sebagai teks biasa, bukan regex
 # Anak dibawah 1 tahun gak boleh makan kacang karena ukurannya yang kecil dapat mengakibatkan anak tersedak
-# Jika anak di bawah 1 tahun, maka makanan kacang akan didrop dari dataset
-# Makanan kacang terdapat pada dataset sebagai jenis makanan "snack" dengan tipe makanan "kacang"
-if input_umur_user == 1:
-    # Mencari kacang pada dataset makanan
+# Jika anak di bawah 1 tahun, maka snack kacang (jenis makanan "snack" dengan tipe makanan "kacang") juga dihapus
+katalog_lengkap = KatalogMakanan.dari_dataframe(data_makanan)
+indeks_alergi = IndeksAlergi(katalog_lengkap)
+izin = indeks_alergi.diizinkan(input_alergi_user, input_umur_user)    # Array boolean makanan yang diizinkan
 
-    # Mendeklarasi kondisi suatu makanan sebagai mendefinisikan kacang
-    kondisi_snack_kacang = (data_makanan["Jenis"].str.lower() == "snack") & \
-                           (data_makanan["Tipe"].str.lower() == "kacang")
-
-    # Menghapus kacang dari dataset makanan
-    data_makanan = data_makanan[~kondisi_snack_kacang].reset_index(drop=True)
+# Data makanan difilter satu kali (digunakan untuk menyimpan hasil menu)
+data_makanan = data_makanan[izin].reset_index(drop=True)
 
 # Susu akan selalu hadir pada menu makanan harian sesuai dengan rekomendari Pedoman Makanan bergizi
 # Kecuali anak alergi terhadap susu
-# Jika tidak alergi, maka nilai nutrisi susu akan dikurangi dari nilai target AKG
-kolom_nutrisi = [kol for kol in Target_AKG.columns if kol in data_makanan.columns]  # Memilih kolom nutrisi
-susu_df = data_makanan[data_makanan["Jenis"] == "Susu"] # Memastikan susu ada dalam dataset (tidak alergi)
-ada_susu = False  # Mendeklarasi keadaan ada susu atau tidak
-
-# Jika ada susu (tidak alergi), maka
-if not susu_df.empty:
-    ada_susu = True # keadaan dideklarasikan menjadi ada susu
-    total_nutrisi_susu = susu_df[kolom_nutrisi].sum()   # Memilih kolom nutrisi susu
-    Target_nutrisi = Target_AKG.iloc[0][kolom_nutrisi].astype(float) # Memilih kolom nutrisi pada AKG
-    # Kurangi nutrisi susu dari target dan clip minimal 0
-    Target_AKG.iloc[0][kolom_nutrisi] = (Target_nutrisi - total_nutrisi_susu).clip(lower=0)
-
-# Jumlah makanan untuk setiap usia, dengan usia termuda memiliki jumlah makanan terkecil dan usia tertua dnegan jumlah terbanyak
-# Hal ini dilakukan mengingat semakin tinggi usia, semakin tinggi juga AKG yang perlu dicapai
-
-# Berdasarkan standar AKG 2014, berikut adalah jumlah makanan untuk setiap usia
-if input_tahun == 2014 :
-    # Menjumlahkan makanan yang dipilih per hari
-    if input_umur_user == 1 :
-        jumlah_n = 11
-    elif input_umur_user == 2 or input_umur_user == 3 :
-        jumlah_n = 12
-    else  : # input_umur_user == 4 and input_umur_user == 5 
-        jumlah_n = 14
-
-# Bedasarkan standar AKG 2019, berikut adalah jumlah makanan untuk setiap usia
-else :
-    if input_umur_user == 4 or input_umur_user == 5:
-        jumlah_n = 15
-    else : # input_umur_user == 1 or input_umur_user == 2 or input_umur_user == 3 
-        jumlah_n = 14
-
-# Mendeklarasi jumlah maksimal snack dalam menu harian
-if input_umur_user == 4 or input_umur_user == 5:
-    n5 = 3
-else : # input_umur_user == 1 or input_umur_user == 2 or input_umur_user == 3 
-    n5 = 2
-
-# Jika anak alergi dengan susu, maka
-#   1. Jumlah makanan akan ditambah 1, mengingat susu tidak akan ditambahkan ke menu makanan
-#   2. Batas maksimal snack pada menu makanan ditambah 1
-if ada_susu == False :
-    jumlah_n += 1
-    n5 += 1
+ada_susu = bool((data_makanan["Jenis"] == "Susu").any())   # Memastikan susu ada dalam dataset (tidak alergi)
+
+# Target AKG, jumlah makanan harian (jumlah_n), jumlah maksimal snack (n5), dan ambang batas menu mingguan
+# diambil dari tabel target AKG sesuai dengan tahun standar, usia, dan ketersediaan susu
+# Jika anak alergi dengan susu, maka jumlah makanan dan batas maksimal snack pada menu makanan ditambah 1
+# Target AKG tidak dikurangi nutrisi susu, karena total nutrisi menu harian sudah termasuk susu
+tabel_akg = bangun_tabel_akg(data_AKG)
+profil_akg = cari_profil_akg(tabel_akg, input_tahun, input_umur_user, ada_susu)
+Target_AKG = profil_akg.Target_AKG
+jumlah_n, n5 = profil_akg.jumlah_n, profil_akg.n5
 
 # Mendefinisikan algoritma solving optimasi
 # Optimasi dilakukan dengan solver C-TAEA
@@ -276,25 +252,70 @@ if ada_susu == False :
 # Jumlah reference direction adalah 153
 ref_dirs = get_reference_directions("das-dennis", 17, n_partitions=2)
 
+# Katalog makanan yang diizinkan adalah saringan katalog makanan lengkap, id makanan tetap menunjuk ke katalog lengkap
+# Katalog digunakan oleh masalah optimasi dan penyusunan menu mingguan
+katalog_makanan = katalog_lengkap.saring(izin)
+
+# Membuat pool worker, katalog makanan lengkap dikirim satu kali ke setiap worker
+pool_evaluasi = None
+if N_WORKER > 1 and MODE_EVALUASI != "elementwise":
+    pool_evaluasi = PoolEvaluasi(katalog_lengkap, n_worker=N_WORKER, mode=MODE_PARALEL)
+
+# Mendeklarasi masalah optimasi rekomendasi menu makanan sesuai dengan mode evaluasi dan enkode genom
+if MODE_EVALUASI == "elementwise":
+    problem = Meal_Planning(Target_AKG, jumlah_n, n5)
+else:
+    kernel = "jit" if MODE_EVALUASI == "jit" else "numpy"  # Kernel fitness sesuai mode evaluasi
+    target, bobot = profil_akg.target_bobot(Target_AKG.columns)  # Vektor target dan bobot objektif dari tabel target AKG
+    if ENKODE_GENOM == "slot":
+        problem = Meal_Planning_Slot(Target_AKG, jumlah_n, n5, katalog_makanan, ada_susu=ada_susu, kernel=kernel, pool=pool_evaluasi, ukuran_cache=UKURAN_CACHE_EVALUASI, target=target, bobot=bobot)
+    else:
+        problem = Meal_Planning_Batch(Target_AKG, jumlah_n, n5, katalog_makanan, kernel=kernel, pool=pool_evaluasi, ukuran_cache=UKURAN_CACHE_EVALUASI, target=target, bobot=bobot)
+
+# Operator genetik sesuai dengan pilihan operator
+if OPERATOR_GENETIK == "diskrit" and MODE_EVALUASI != "elementwise":
+    operator = operator_diskrit()  # Sampling, crossover, mutasi, dan repair pada genom integer
+else:
+    operator = dict(crossover=SBX(prob=0.9, eta=20), # Mengatur kondisi crossover
+                    mutation=PM(prob=0.5, eta=15)) # Mengatur kondisi mutasi
+
 # Algoritma CTAEA
 # Definisikan algoritma C-TAEA
 algorithm = CTAEA(op_size=153,  # besar populasi dibuat sesuai dengan nilai reference directionnnya
                     ref_dirs=ref_dirs, # Mendeklarasi reference direction
-                    crossover=SBX(prob=0.9, eta=20), # Mengatur kondisi crossover
-                    mutation=PM(prob=0.5, eta=15)) # Mengatur kondisi mutasi
+                    eliminate_duplicates=EliminasiDuplikatMultiset(getattr(problem, "ke_indeks", None)) if ELIMINASI_DUPLIKAT else True, # Mengatur eliminasi duplikat
+                    **operator) # Mengatur operator genetik
     
+# Kriteria penghentian optimasi sesuai dengan mode terminasi
+if MODE_TERMINASI == "konvergen":
+    terminasi = TerminasiKonvergensi(N_GENERASI, TOLERANSI_KONVERGENSI, JENDELA_KONVERGENSI, RASIO_FEASIBLE_MIN)
+else:
+    terminasi = ('n_gen', N_GENERASI)
+
 # Melakukan optimasi
 # Optimasi dilakukan dengan mencari nilai objektif terkecil, dengan demikian digunakan minimize
 # Mendeklarasi optimasi
 Hasil = minimize(
-        problem = Meal_Planning(Target_AKG, jumlah_n, n5), # Mendeklarasi masalah optimasi rekomendasi menu makanan sebagai mana yang telah didefinisikan
+        problem = problem, # Mendeklarasi masalah optimasi rekomendasi menu makanan sebagai mana yang telah didefinisikan
         algorithm = algorithm, # Mendeklarasi algoritma solver
-        termination=('n_gen', 500), # Mendeklarasi bahwa optimasi dihentikan pada iterasi ke 500
+        termination=terminasi, # Mendeklarasi kriteria penghentian optimasi (maksimal N_GENERASI generasi)
         verbose=True,
         copy_algorithm=False
     )
 # Hasil optimasi akan disimpan ke dalam variabel Hasil
 
+# Menampilkan generasi dan alasan optimasi berhenti
+print(ringkasan_terminasi(Hasil))
+
+# Menampilkan statistik cache evaluasi
+if getattr(problem, "cache", None) is not None:
+    stat = problem.cache.statistik()
+    print(f"Cache evaluasi : {stat['miss']} evaluasi dihitung, {stat['hit']} evaluasi diambil dari cache ({stat['rasio_hit']:.1%})")
+
+# Menutup pool worker setelah optimasi selesai
+if pool_evaluasi is not None:
+    pool_evaluasi.tutup()
+
 # Menyimpan solusi optimasi
 # Mendeklarasi variabel untuk menyimpan solusi optimasi
 list_solusi = []
@@ -317,7 +338,11 @@ target_values = target[kolom_nutrisi].values
 #   3. Makan siang : terdiri atas makanan pokok, lauk-pauk, dan sayur-mayur
 #   4. Snack sore : terdiri atas snack dan buah
 #   5. Makan malam : terdiri atas makanan pokok, lauk-pauk, dan sayur-mayur
-for idx, solusi in enumerate(Hasil.X):
+# Mengubah genom solusi optimasi menjadi indeks makanan pada dataset makanan
+# Pada enkode slot, makanan sudah tersusun berurutan sesuai jenisnya
+X_solusi = problem.ke_indeks(Hasil.X) if hasattr(problem, "ke_indeks") else Hasil.X
+
+for idx, solusi in enumerate(X_solusi):
     # Indeks menyimpan data indeks-indeks makanan solusi optimasi
     indeks = [int(i) for i in solusi] 
 
@@ -433,33 +458,10 @@ if len(menu_valid) < 7 :
 #   1. Memastikan jumlah makanan pokok tidak lebih dari ambang batas
 #   2. Memastikan jumlah lauk-pauk tidak lebih dari ambang batas 
 #   3. Memastikan jumlah snack tidak lebih dari ambang batas 
-# Berikut adalah ambang batas yang ditetapkan untuk tidak jenis makanan
-if input_tahun == 2014 : # Jika standar yang digunakan adalah standar AKG tahun 2014
-    if input_umur_user == 1 or input_umur_user == 2 :
-        n2 = 5
-    else :
-        n2 = 6
-    if input_umur_user == 1 or input_umur_user == 2 :
-        n3 = 3
-    else :
-        n3 = 4
-
-else : # Jika standar yang digunakan adalah standar AKG tahun 2014
-    if input_umur_user == 1 or input_umur_user == 2 :
-        n2 = 12
-    else :
-        n2 = 12
-    if input_umur_user == 1 or input_umur_user == 2 :
-        n3 = 4
-    else :
-        n3 = 4
-
-# Ambang batas jumlah makanan yang sama untuk tiap jenis makanan
-Batas_maks_jumlah = {
-    "Lauk-pauk": n3,    # Ambang batas jumlah lauk-pauk yang sama dalam menu mingguan
-    "Snack": n3 + 1,    # Ambang batas jumlah snack yang sama dalam menu mingguan
-    "Makanan Pokok" : n2    # Ambang batas jumlah makanan yang sama dalam menu mingguan
-}
+# Ambang batas jumlah makanan yang sama untuk tiap jenis makanan diambil dari tabel target AKG
+#   1. Standar AKG 2014 : makanan pokok 5 (usia 1 dan 2) atau 6, lauk-pauk 3 (usia 1 dan 2) atau 4, snack lauk-pauk + 1
+#   2. Standar AKG 2019 : makanan pokok 12, lauk-pauk 4, snack 5
+Batas_maks_jumlah = profil_akg.batas_jenis
 maks_jumlah = Batas_maks_jumlah.copy()
 
 # Jika tidak ditemukan menu makanan mingguan yang memenuhi starat ambang batas jumlah makanan yang sama, maka
@@ -470,62 +472,31 @@ maks_longgar = 3
 
 sukses = False
 
+# Indeks nama makanan dibuat satu kali : nama makanan -> kode nama makanan, kode nama makanan -> jenis makanan
+# Kode nama makanan dari setiap calon menu harian dicari dengan indeks tersebut, tanpa memindai data makanan
+_, jenis_nama, indeks_nama = buat_indeks_nama(katalog_makanan)
+kode_harian = [indeks_nama.get_indexer(calon["Sarapan"] + calon["Snack Pagi"] + calon["Makan Siang"] + calon["Snack Sore"] + calon["Makan Malam"])
+               for calon in menu_valid.to_dict('records')]
+
 # Jika pelonggaran belum mencapai 3 kali, makan
 while jumlah_longgar <= maks_longgar :
 
-    menu_mingguan = []  # deklarasi variabel yang menyimpan menu mingguan
-    coba = 0    # Mengitung jumlah pelonggaran batas ambang
-    hitung_lauk = Counter()    # Menghitung jumlah lauk-pauk yang sama
-    hitung_snack = Counter()   # Menghitung jumlah snack yang sama
-    hitung_pokok = Counter()   # Menghitung jumlah makanan pokok yang sama
-
-    # Algoritma akan mencoba mengkombinasikan 7 menu makanan harian untuk membentuk menu makanan mingguan
-    # Percobaan kombinasi akan dilakukan sebanyak maksimal 5000 kali
-    while len(menu_mingguan) < 7 and coba < 5000:
-        coba += 1
-        # Memilih menu makanansecara acak
-        calon = menu_valid.sample(1).iloc[0] 
-
-        # Menggabungkan semua menu per waktu makan menjadi menu harian
-        makanan_harian = (calon["Sarapan"]
-                          + calon["Snack Pagi"]
-                          + calon["Makan Siang"]
-                          + calon["Snack Sore"]
-                          + calon["Makan Malam"])
-
-        # Cek jumlah makanan yang sama dalam satu menu minggaun
-        valid = True
-        for makanan in makanan_harian:
-            jenis = data_makanan.loc[data_makanan["Nama Makanan"] == makanan, "Jenis"].values[0] # Memilih satu nama makanan
-
-            # Cek jumlah lauk-pauk yang sama
-            if jenis == "Lauk-pauk" and hitung_lauk[makanan] >= maks_jumlah["Lauk-pauk"]:
-                valid = False
-                break   # Jika melanggar ambang batas maka akan dihentikan
-            
-            # Cek jumlah snack yang sama
-            if jenis == "Snack" and hitung_snack[makanan] >= maks_jumlah["Snack"]:
-                valid = False
-                break   # Jika melanggar ambang batas maka akan dihentikan
-            
-            # Cek jumlah makanan pokok yang sama
-            if jenis == "Makanan Pokok" and hitung_pokok[makanan] >= maks_jumlah["Makanan Pokok"]:
-                valid = False
-                break   # Jika melanggar ambang batas maka akan dihentikan
-
-        # Kalau belum melanggar makan menu harian akan ditambahkan ke menu mingguan
-        if valid:
-            menu_mingguan.append(calon)
-
-            for makanan in makanan_harian:
-                jenis = data_makanan.loc[data_makanan["Nama Makanan"] == makanan, "Jenis"].values[0]
-
-                if jenis == "Lauk-pauk":    # Menambahkan jumlah lauk-pauk yang sama ke dalam counter lauk-pauk
-                    hitung_lauk[makanan] += 1
-                elif jenis == "Snack":  # Menambahkan jumlah snack yang sama ke dalam counter snack
-                    hitung_snack[makanan] += 1
-                elif jenis == "Makanan Pokok":  # Menambahkan jumlah makanan pokok yang sama ke dalam counter makanan pokok
-                    hitung_pokok[makanan] += 1
+    terpilih = []  # deklarasi variabel yang menyimpan posisi menu harian pada menu mingguan
+    terbukti = False    # Menyatakan menu mingguan terbukti tidak ada dengan ambang batas ini
+
+    if MODE_SUSUN_MINGGUAN == "tepat":
+        # Seluruh kombinasi menu harian diperiksa dengan backtracking
+        # Menu harian yang sama hanya boleh dipilih lagi jika menu harian yang valid kurang dari 7
+        terpilih, terbukti = cari_tepat(kode_harian, batas_per_nama(jenis_nama, maks_jumlah),
+                                        urutan=np.random.permutation(len(kode_harian)), boleh_ulang=len(kode_harian) < 7)
+    else:
+        hitung = np.zeros(len(jenis_nama), dtype=np.int64)    # Menghitung jumlah makanan yang sama per kode nama makanan
+
+        # Algoritma akan mencoba mengkombinasikan 7 menu makanan harian untuk membentuk menu makanan mingguan
+        # Percobaan kombinasi akan dilakukan sebanyak maksimal 5000 kali
+        # Menu harian hanya ditambahkan jika jumlah lauk-pauk, snack, dan makanan pokok yang sama belum melebihi ambang batas
+        pilih_acak(kode_harian, batas_per_nama(jenis_nama, maks_jumlah), hitung, terpilih, maks_coba=5000)
+    menu_mingguan = [menu_valid.iloc[i] for i in terpilih]
 
     # Jika berhasil ditemukan 7 menu mingguan, maka pencarian akan berhenti
     if len(menu_mingguan) == 7:
@@ -534,6 +505,9 @@ while jumlah_longgar <= maks_longgar :
 
     # Jika gagal, maka ambang batas makanan akan dilonggarkan
     jumlah_longgar += 1
+    # Jika menu mingguan terbukti tidak ada, maka percobaan ulang dengan ambang batas yang sama dilewati
+    if terbukti:
+        jumlah_longgar = max(jumlah_longgar, maks_longgar)
     if jumlah_longgar >= maks_longgar :
         maks_jumlah["Lauk-pauk"] += 1
         maks_jumlah["Snack"] += 1
@@ -547,21 +521,17 @@ while jumlah_longgar <= maks_longgar :
 # Cek jumlah menu makanan
 if len(menu_mingguan) < 7:  # Jika kurang dari 7, maka akan ditambahkan menu makanan secara acak
     print(len(menu_mingguan))
-    # Ambil index menu harian yang sudah terpakai
-    used_idx = {m["index"] for m in menu_mingguan if "index" in m}
-
     # Buang menu yang sudah dipakai
-    # Simpan sisanya ke dalam dataset pool
-    pool = menu_valid.reset_index().loc[~menu_valid.reset_index()["index"].isin(used_idx)]
+    # Simpan sisanya ke dalam pool
+    pool = np.setdiff1d(np.arange(len(menu_valid)), terpilih)
 
     #Menambahkan menu makanan sisanya
-    if not pool.empty:
+    if len(pool) > 0:
         needed = 7 - len(menu_mingguan) # Menghitung jumlah menu makanan yang masih kurang
-        tambahan_df = pool.sample(min(len(pool), needed), replace=False)   # Mengambil menu makanan tambahan sesuai jumlah yang masih kurang
+        tambahan = np.random.choice(pool, min(len(pool), needed), replace=False)   # Mengambil menu makanan tambahan sesuai jumlah yang masih kurang
         # Menambahkan menu makanan tambahan
-        for i in range(len(tambahan_df)):
-            series_baru = tambahan_df.iloc[i]
-            menu_mingguan.append(series_baru)
+        for i in tambahan:
+            menu_mingguan.append(menu_valid.iloc[i])
     
     # Berhasil menyusun 7 menu mingguan
     print("berhasil menambahkan menu")
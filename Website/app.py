@@ -30,39 +30,184 @@
 # Algoritma :
 
 # Import library yang akan digunakan
-from flask import Flask, render_template, request   # flask untuk menghubungkan algoritma dengan website
+from flask import Flask, render_template, request, make_response, redirect, url_for, jsonify   # flask untuk menghubungkan algoritma dengan website
 import numpy as np  # Library untuk fungsi matematika
 import pandas as pd # Library untuk mengolah dataset
 import random, secrets  # Library untuk membuat nilai random
-from collections import Counter # Import library untuk menghitung
+import threading    # Library untuk mengunci pembuatan pool worker
+import click    # Library untuk membuat perintah flask (bangun-bank-solusi)
+import os, time    # Library untuk membaca environment variable dan menghitung waktu
 
 # Import library yang akan digunakan untuk Optimasi MaOO
 # Library yang akan digunakna adalah pymoo
 # Solver yang digunakan adalah C-TAEA
 from pymoo.algorithms.moo.ctaea import CTAEA    # Import solver C-TAEA
 from pymoo.optimize import minimize # Import minimize untuk optimasi dengan fungsi untuk mencari nilai terkecil
-from pymoo.util.ref_dirs import get_reference_directions    # Import reference direction untuk optimasi
 from pymoo.core.problem import ElementwiseProblem   # Import Element Wise Problem untuk mendefinisikan penyusunan menu makanan sebagai masalah optimisasi
 from pymoo.operators.crossover.sbx import SBX   # Import crossover yang digunakan dalam optimasi
 from pymoo.operators.mutation.pm import PM  # Import mutasi yang digunakan dalam optimasi
+from planner import Meal_Planning_Batch, Meal_Planning_Slot, EliminasiDuplikatMultiset, CacheHasil, KOLOM_NUTRISI_5  # Import masalah optimasi yang dievaluasi per populasi, eliminasi duplikat, dan cache hasil optimasi
+from planner.paralel import PoolEvaluasi  # Import pool worker untuk evaluasi paralel
+from planner.operator_genetik import operator_diskrit  # Import operator genetik diskrit
+from planner.benih import BankBenih, SamplingBenih, siapkan_benih, normalisasi_alergi  # Import warm-start optimasi dari solusi sebelumnya
+from planner.bank_solusi import muat_bank, simpan_bank, sidik_data, ambil_solusi_bank  # Import bank solusi optimasi yang dibangun offline
+from planner.antrian import AntrianPekerjaan, jumlah_proses_website  # Import antrian pekerjaan penyusunan menu di latar belakang dan jumlah proses website
+from planner.progres import CallbackProgres  # Import callback progres optimasi
+from planner.pemanasan import PoolOptimasi, ref_dirs_objektif  # Import pool proses worker optimasi dan reference direction
+from planner.dataset import baca_dataset  # Import pembacaan dataset melalui snapshot biner
+from planner.memori_bersama import tabel_makanan  # Import tabel numerik makanan pada memori bersama
+from planner.fitness import KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK, KODE_SUSU  # Import kode jenis makanan
+from planner.katalog import KatalogMakanan  # Import katalog makanan berbasis array
+from planner.alergi import IndeksAlergi  # Import indeks alergi makanan
+from planner.target_akg import bangun_tabel_akg, cari_profil_akg  # Import tabel target AKG per tahun, usia, dan ketersediaan susu
+from planner.mingguan import WAKTU_MAKAN, buat_indeks_nama, batas_per_nama, id_harian, pilih_acak, cari_tepat, beri_label  # Import indeks makanan untuk penyusunan menu mingguan
+from planner.terminasi import TerminasiKonvergensi, TerminasiAnggaran, ringkasan_terminasi, berhenti_karena_anggaran  # Import penghentian optimasi berdasarkan konvergensi dan anggaran
+from planner.metrik import MetrikMenu, PenghitungSumber, ukur_tahap, catat_penghitung, siapkan_logger, TINGKAT_FALLBACK  # Import metrik waktu tahap dan penghitung penyusunan menu
+from planner.telemetri import CallbackTelemetri, CallbackGabungan, EvaluatorTerukur, lokasi_telemetri  # Import telemetri optimasi per generasi
 
 # Deklarasi app
 app = Flask(__name__)
 
+# Mode evaluasi calon solusi pada optimasi
+#   1. "batch" : seluruh populasi dievaluasi sekaligus dengan numpy (Meal_Planning_Batch)
+#   2. "jit" : seluruh populasi dievaluasi sekaligus dengan kernel Numba (Meal_Planning_Batch), numpy jika Numba tidak terpasang
+#   3. "elementwise" : calon solusi dievaluasi satu per satu dengan pandas (Meal_Planning)
+MODE_EVALUASI = "batch"
+
+# Evaluasi paralel (hanya untuk mode "batch" dan "jit")
+# Jumlah worker yang digunakan untuk mengevaluasi populasi, 1 berarti evaluasi tidak dilakukan secara paralel
+N_WORKER = 1
+# Jenis pool worker : "proses" atau "thread"
+MODE_PARALEL = "proses"
+
+# Cache hasil evaluasi (hanya untuk mode "batch" dan "jit")
+# Jumlah maksimal calon solusi yang disimpan pada cache, 0 berarti cache tidak digunakan
+UKURAN_CACHE_EVALUASI = 50000
+# Eliminasi calon solusi dengan kumpulan makanan yang sama (tanpa melihat urutan) dari populasi
+ELIMINASI_DUPLIKAT = True
+
+# Enkode genom calon solusi (hanya untuk mode "batch" dan "jit")
+#   1. "indeks" : setiap gen memilih makanan mana saja pada dataset makanan
+#   2. "slot" : setiap gen terikat pada satu jenis makanan dan hanya memilih makanan dari jenis tersebut (Meal_Planning_Slot)
+ENKODE_GENOM = "indeks"
+
+# Operator genetik pada C-TAEA (hanya untuk mode "batch" dan "jit")
+#   1. "sbx" : crossover SBX dan mutasi PM pada bilangan real, calon solusi dibulatkan ke bawah saat evaluasi
+#   2. "diskrit" : sampling, crossover, mutasi, dan repair pada genom integer berdasarkan jenis makanan (planner.operator_genetik)
+OPERATOR_GENETIK = "sbx"
+
+# Jumlah maksimal generasi optimasi
+N_GENERASI = 500
+
+# Seed bilangan acak untuk optimasi (C-TAEA) dan penyusunan menu mingguan, kosong berarti acak pada setiap request
+# Jika diisi, maka hasil penyusunan menu dengan profil dan anggaran yang sama dapat diulang (misalnya untuk benchmark.py)
+SEED_OPTIMASI = int(os.environ["SEED_OPTIMASI"]) if os.environ.get("SEED_OPTIMASI") else None
+
+# Tampilan progres optimasi ke stdout server
+# Progres setiap generasi selalu disimpan untuk halaman status pekerjaan, sehingga stdout tidak diperlukan pada deployment
+#   1. VERBOSE_OPTIMASI = True : pymoo menampilkan satu baris untuk setiap generasi (untuk pengembangan)
+#   2. CETAK_PROGRES_SETIAP : progres ringkas ditampilkan setiap sekian generasi, 0 berarti tidak ditampilkan
+VERBOSE_OPTIMASI = os.environ.get("VERBOSE_OPTIMASI", "0") == "1"
+CETAK_PROGRES_SETIAP = int(os.environ.get("CETAK_PROGRES_SETIAP", 0))
+
+# Telemetri optimasi per generasi (planner.telemetri), untuk memilih op_size, reference direction, dan jumlah generasi
+# Jika diisi dengan folder, maka setiap optimasi menulis satu file .npz ke folder tersebut (waktu evaluasi dan seleksi, rasio feasible,
+# ukuran archive, dan titik ideal setiap generasi), kosong berarti telemetri tidak dicatat
+FOLDER_TELEMETRI = os.environ.get("FOLDER_TELEMETRI", "")
+SIMPAN_TELEMETRI_SETIAP = 50    # File telemetri ditulis ulang setiap sekian generasi, sehingga optimasi yang terhenti tetap tercatat
+
+# Penghentian optimasi
+#   1. "n_gen" : optimasi selalu berjalan sampai generasi ke-N_GENERASI
+#   2. "konvergen" : optimasi berhenti lebih awal jika front solusi feasible tidak bergerak lagi (TerminasiKonvergensi),
+#      dengan N_GENERASI sebagai batas maksimal generasi
+MODE_TERMINASI = "n_gen"
+TOLERANSI_KONVERGENSI = 0.02    # Toleransi pergerakan front yang dinormalisasi terhadap front satu jendela sebelumnya
+JENDELA_KONVERGENSI = 30    # Jumlah generasi berturut-turut dengan pergerakan front di bawah toleransi
+RASIO_FEASIBLE_MIN = 0.9    # Rasio calon solusi feasible minimal pada populasi sebelum optimasi dapat berhenti
+
+# Warm-start optimasi (hanya untuk mode "batch" dan "jit")
+# Jika True, maka populasi awal diisi dengan solusi optimasi sebelumnya dari profil (umur, tahun, alergi) yang sama atau mirip
+WARM_START = False
+PORSI_BENIH = 0.5   # Porsi maksimal populasi awal yang diisi dengan solusi optimasi sebelumnya
+KEMIRIPAN_BENIH_MIN = 0.5   # Kemiripan alergi (Jaccard) minimal profil mirip, di bawahnya optimasi dimulai dari populasi acak
+
+# Cache hasil optimasi per profil (umur, tahun, alergi)
+# Jumlah maksimal profil yang disimpan, 0 berarti cache tidak digunakan
+UKURAN_CACHE_HASIL = 32
+# Umur maksimal hasil optimasi pada cache (detik), 0 berarti tidak kedaluwarsa
+TTL_CACHE_HASIL = 3600
+
+# Anggaran optimasi pada /generate, dapat diatur per deployment melalui environment variable
+# Jika anggaran habis, maka optimasi dihentikan dan solusi pada generasi terakhir digunakan untuk menyusun menu mingguan
+# Anggaran juga dapat dikirim per request melalui form (batas_waktu dan batas_evaluasi), tetapi tidak dapat melebihi anggaran deployment
+# 0 berarti tidak dibatasi
+BATAS_WAKTU_OPTIMASI = float(os.environ.get("BATAS_WAKTU_OPTIMASI", 0))    # Anggaran waktu (detik) sejak request mulai diproses
+BATAS_EVALUASI_OPTIMASI = int(os.environ.get("BATAS_EVALUASI_OPTIMASI", 0))    # Anggaran jumlah evaluasi calon solusi
+
+# Jendela valid menu harian : persentase selisih maksimal (lebih banyak atau kurang) terhadap target AKG
+# Menu harian di luar jendela valid hanya digunakan jika menu harian yang valid kurang dari 7
+JENDELA_VALID = {"Kalori (kkal)": 20, "Protein (g)": 40, "Lemak (g)": 40, "Karbohidrat (g)": 40, "Serat (g)": 50}
+
+# Bank solusi optimasi yang dibangun offline dengan perintah : flask --app app bangun-bank-solusi
+# Jika file bank tidak ada, maka seluruh request dioptimasi secara langsung
+LOKASI_BANK_SOLUSI = "bank_solusi.npz"
+MIN_SOLUSI_BANK = 30    # Jumlah minimal solusi yang tersisa setelah filter alergi agar bank solusi digunakan
+
+# Mode antrian pekerjaan pada /generate
+# Jika True, maka request /generate hanya memasukkan pekerjaan ke antrian dan langsung diarahkan ke halaman status pekerjaan,
+# penyusunan menu dijalankan oleh thread worker di latar belakang
+# Jika False, maka request /generate menunggu sampai menu selesai disusun
+# Pekerjaan disimpan pada memori proses website, sehingga antrian hanya dapat digunakan jika website berjalan pada satu proses
+# Jika website berjalan pada lebih dari satu proses (misalnya gunicorn -w 4), maka antrian dimatikan (lihat jumlah_proses_website)
+MODE_ANTRIAN = os.environ.get("MODE_ANTRIAN", "1") != "0"
+N_WORKER_ANTRIAN = int(os.environ.get("N_WORKER_ANTRIAN", 1))  # Jumlah maksimal optimasi yang berjalan bersamaan
+MAKS_ANTRIAN = int(os.environ.get("MAKS_ANTRIAN", 16))  # Jumlah maksimal pekerjaan yang belum selesai, pekerjaan baru ditolak jika penuh
+TTL_PEKERJAAN = 3600    # Umur maksimal hasil pekerjaan yang sudah selesai (detik)
+N_PROSES_WEBSITE = jumlah_proses_website()  # Jumlah proses website yang melayani request
+if MODE_ANTRIAN and N_PROSES_WEBSITE > 1:
+    print(f"⚠️ Website berjalan pada {N_PROSES_WEBSITE} proses, antrian pekerjaan hanya dapat digunakan pada satu proses, "
+          "sehingga /generate menunggu sampai menu selesai disusun")
+    MODE_ANTRIAN = False
+
+# Tempat optimasi dijalankan
+#   1. "thread" : optimasi dijalankan pada thread yang memproses request atau pekerjaan
+#   2. "proses" : optimasi dijalankan pada N_WORKER_ANTRIAN proses worker yang hidup selama website berjalan (PoolOptimasi),
+#      setiap proses worker memiliki bank benih warm-start masing-masing
+MODE_WORKER_OPTIMASI = os.environ.get("MODE_WORKER_OPTIMASI", "thread")
+# Jika True, maka optimasi dipanaskan saat website mulai melayani request (import pymoo, kompilasi kernel, dan optimasi singkat),
+# sehingga penyusunan menu pertama tidak menanggung waktu pemanasan
+# Pemanasan tidak dijalankan saat modul diimport (perintah flask, benchmark.py, dan script lain)
+PANASKAN_SAAT_MULAI = os.environ.get("PANASKAN_SAAT_MULAI", "1") != "0"
+N_GENERASI_PEMANASAN = 2    # Jumlah generasi optimasi singkat saat pemanasan
+
+# Cara memilih 7 menu harian untuk menu mingguan
+#   1. "tepat" : backtracking (planner.mingguan.cari_tepat), menu mingguan pasti ditemukan jika ada,
+#      ambang batas hanya dilonggarkan jika menu mingguan terbukti tidak ada
+#   2. "acak" : menu harian dipilih secara acak sebanyak maksimal 5000 percobaan untuk setiap pelonggaran
+MODE_SUSUN_MINGGUAN = os.environ.get("MODE_SUSUN_MINGGUAN", "tepat")
+
+# Metrik penyusunan menu (planner.metrik) : waktu setiap tahap dan penghitung setiap request
+# Metrik seluruh request ditampilkan dalam format teks Prometheus pada /metrics
+# Jika LOG_TERSTRUKTUR True, maka setiap penyusunan menu juga ditulis sebagai satu baris log JSON ke stderr
+LOG_TERSTRUKTUR = os.environ.get("LOG_TERSTRUKTUR", "1") != "0"
+
 # Membaca Dataset yang digunakan
 # Digunakan dua dataset pada optimasi
 #   1. Dataset AKG yang akan menyimpan data AKG berdasarkan usia anak dan tahun standar AKG yang digunakan
 #   2. Dataset makanan yang menyimpan data makanan dan informasi-informasi seperti kandungan nutrisi, porsi, dan tipe makanan
+# Dataset dibaca dari snapshot biner di samping file Excel (planner.dataset), snapshot dibangun ulang jika file Excel berubah
+# Nama kolom sudah dibersihkan (spasi di awal/akhir nama kolom dihapus) saat snapshot dibangun
 try:
-    data_AKG = pd.read_excel("AKG.xlsx")    # Membaca dataset AKG target
-    data_makanan = pd.read_excel("Dataset_Makanan.xlsx")    # Membaca dataset makanan
-    
-    # Membersihkan nama kolom (Hapus spasi di awal/akhir nama kolom)
-    data_AKG.columns = data_AKG.columns.str.strip()
-    data_makanan.columns = data_makanan.columns.str.strip()
+    waktu_baca = time.perf_counter()
+    data_AKG = baca_dataset("AKG.xlsx")    # Membaca dataset AKG target
+    data_makanan = baca_dataset("Dataset_Makanan.xlsx")    # Membaca dataset makanan
+
+    # Memberikan id untuk setiap makanan sesuai dengan urutannya pada dataset makanan
+    # Id digunakan untuk mengenali makanan setelah dataset makanan difilter
+    data_makanan["id_makanan"] = np.arange(len(data_makanan))
     
     # Jika berhasil maka, print
-    print("✅ Dataset berhasil dimuat!")
+    print(f"✅ Dataset berhasil dimuat dalam {(time.perf_counter() - waktu_baca) * 1000:.1f} ms!")
 
 # Jika dataset tidak ditemukan maka, beri peringatan
 except FileNotFoundError:
@@ -70,79 +215,10 @@ except FileNotFoundError:
 
 # Mendeklarasikan fungsi-fungsi yang akan digunakan dalam kode utama
 
-# Membuat fungsi format porsi makanan untuk menampilkan porsi tiap makanan pada menu
-def format_nama_urt(row):
-    # Menggabungkan Nama Makanan dengan Porsi (URT) dan Berat (Gram).
-    # Output: "Nasi Putih (1 Piring, 100 gram)"
-
-    # Ambil nama makanan
-    nama = row['Nama Makanan']
-    
-    # Ambil data URT
-    urt_text = ""
-    try:
-        urt_val = row.get('URT_nominal')    # Ambil data nominal URT
-        urt_unit = row.get('URT_ukuran')    # Ambil data ukuran URT yang digunakan
-        # Gabungkan menjadi satu besaran URT
-        # Contoh : 1 piring
-        if pd.notna(urt_val) and pd.notna(urt_unit):
-            urt_text = f"{urt_val} {urt_unit}"       
-    except:
-        pass
-
-    # Ambil data berat
-    berat_text = ""
-    try:
-        berat_val = row.get('gram')  # Ambil data berat makanan 
-        # Tambahkan kata gram dibelakang
-        # Contoh : 100 gram
-        if pd.notna(berat_val):
-            berat_text = f"{round(berat_val, 2)} gram"
-    except:
-        pass
-
-    # Gabungkan besar URT dengan berat makanan
-    besaran_list = []    # deklarasi besaran list untuk menyimpan data URT dan berat
-    if urt_text: 
-        besaran_list.append(urt_text)   # tambahkan data URT makanan
-    if berat_text: 
-        besaran_list.append(berat_text)  #tambahkan berat makanan
-    
-    # Menmbentuk kalimat yang menyatakan nama makanan dan besarannya
-    if besaran_list:
-        # Menggabungkan URT dengan berat makanan, dan memisahkannya dengan "koma"
-        gabungan = ", ".join(besaran_list) # Hasil: "1 Piring, 100 gram"
-        # Membentuk kalimat dengan nama makanan yang diikuti dengan besarannya
-        return f"{nama} ({gabungan})"   # Hasil : "Nasi Putih (1 Piring, 100 gram)"
-    else:
-        return nama # Jika tidak ada besaran, maka kembalikan nama makanan saja
-    
-# Membuat fungsi untuk mencari nilai AKG target
-# Pencarian AKG target terdiri ata dua tahap
-#   1. Mencari AKG targer berdasarkan usia, terdapat 5 pilihan yaitu 1, 2, 3, 4, dan 5 tahun
-#   2. Mencari AKG target berdasarkan tahun standar yang digunakan, terdapat 2 pilihan yaitu tahun 2014 dan 2019
-# Membuat fungsi untuk mencari nilai AKG target berdasarkan tahun
-# Fungsi akan mencari nilai target AKG sesuai dengan tahun standar yang diinput oleh user
-def cari_Tahun_AKG(tahun_AKG, df_AKG):
-    row_data = df_AKG[df_AKG["Tahun"] == tahun_AKG] # Mencari tahun pada kolom "tahun" di dataset yang sama dengan tahun standar yang diinput
-    if row_data.empty:
-        return None # Jika tidak ditemukan, maka mengembalikan none
-    # Jika usia ditemukan, maka akan dikembalikan data AKG yang sesuai dengan usia input
-    return row_data.drop(columns=["Tahun"]).reset_index(drop=True) # AKG dengan tahun yang tidak sesuai akan didrop
-
-# Membuat fungsi untuk mencari nilai AKG target berdasarkan usia
-# Fungsi akan mencari nilai target AKG sesuai dengan usia yang diinput oleh user
-def cari_Target_AKG(umur_user, df_AKG):
-    row_data = df_AKG[df_AKG["umur"] == umur_user] # Mencari usia pada kolom "umur" di dataset yang sama dengan usia user
-    if row_data.empty:
-        return None # Jika tidak ditemukan, maka mengembalikan none
-    # jika usia ditemukan, maka akan dikembalikan data AKG yang sesuai dengan usia input
-    return row_data.drop(columns=["umur"]).reset_index(drop=True)   # AKG untuk usia yang tidak sesuai akan didrop
-
 # Beberapa fungsi tambahan yang akan digunakan untuk menyusun menu mingguan
-# Membuat fungsi untuk reindex dataframe menjadi 6 index
-def pad_df_to_six(df):
-    return df.reindex(range(6))
+# Membuat fungsi untuk membuat daftar id makanan menjadi 6 index, index yang kosong bernilai None
+def pad_id_to_six(x):
+    return list(x[:6]) + [None] * (6 - len(x))
 
 # Membuat fungsi untuk drop index yang kosong
 def drop_empty(x):
@@ -233,96 +309,144 @@ class Meal_Planning(ElementwiseProblem):
         out["G"] = [c1]
 
 
-# Fungsi untuk menyusuk menu makanan mingguan
-def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
-    # Mengkopi data makanan ke lokal
-    local_data_makanan = data_makanan.copy()
-    
-    # Mencari AKG yang sesuai dengan tahun standar input
-    Tahun_AKG = cari_Tahun_AKG(input_tahun, data_AKG)
-    # Mencari AKG yang sesuai dengan usia input
-    Target_AKG = cari_Target_AKG(input_umur, Tahun_AKG)
-    # Memilih hanya 5 target AKG sebagai objektif (kalori, protein, lemak, karbohidrat, dan serat)
-    Target_AKG_obj = Target_AKG[["Kalori (kkal)", "Protein (g)", "Lemak (g)", "Karbohidrat (g)", "Serat (g)"]].reset_index(drop=True)
-
-    # Menghilangkan data makanan alergi user data dataset makanan
-    if input_alergi_str and input_alergi_str.lower() != 'none':
-        alergi_list = [a.strip().lower() for a in input_alergi_str.split(",")] # Membuat input data makanan menjadi list
-
-        # Memfilter makanan alergi dari dataset
-        # Mencari data makanan alergi di dataset makanan
-        # Pencarian makanan dilakukan berdasarkan kolom "Nama makanan" dan "Tipe"
-
-        # Mendeklarasi kondisi nama dan kondisi tipe yang mendefinisikan alergi makanan
-        kondisi_nama = local_data_makanan["Nama Makanan"].str.lower().str.contains("|".join(alergi_list))
-        kondisi_tipe = local_data_makanan["Tipe"].str.lower().str.contains("|".join(alergi_list))
-
-        # Menyimpan kondisi alergi makanan jika ia terdapat di kolom "Nama Makanan" atau "Tipe" sebagai kondisi gabungan
-        kondisi_gabungan = kondisi_nama | kondisi_tipe
-
-        # Drop alergi makanan dari dataset berdasarkan kondisi gabungan
-        local_data_makanan = local_data_makanan[~kondisi_gabungan].reset_index(drop=True)
-
-    # Anak dibawah 1 tahun gak boleh makan kacang karena ukurannya yang kecil dapat mengakibatkan anak tersedak
-    # Jika anak di bawah 1 tahun, maka makanan kacang akan didrop dari dataset
-    # Makanan kacang terdapat pada dataset sebagai jenis makanan "snack" dengan tipe makanan "kacang"
-    if input_umur == 1:
-        # Mencari kacang pada dataset makanan
-
-        # Mendeklarasi kondisi suatu makanan sebagai mendefinisikan kacang
-        kondisi_snack_kacang = (local_data_makanan["Jenis"].str.lower() == "snack") & \
-                                (local_data_makanan["Tipe"].str.lower() == "kacang")
+# Memuat bank solusi optimasi (None jika belum dibangun atau dibangun dari data makanan yang berbeda)
+sidik_data_makanan = sidik_data(data_makanan, KOLOM_NUTRISI_5)
+bank_solusi = muat_bank(LOKASI_BANK_SOLUSI, sidik_data_makanan)
+
+# Cache hasil optimasi, digunakan bersama oleh seluruh request
+cache_hasil = CacheHasil(UKURAN_CACHE_HASIL, TTL_CACHE_HASIL) if UKURAN_CACHE_HASIL > 0 else None
+
+# Metrik penyusunan menu, digunakan bersama oleh seluruh request
+metrik_menu = MetrikMenu()
+siapkan_logger(LOG_TERSTRUKTUR)
+
+# Jumlah hasil optimasi yang dihapus dari cache hasil (kedaluwarsa atau dibuang karena cache penuh) dibaca dari cache saat /metrics diminta
+if cache_hasil is not None:
+    metrik_menu.metrik.append(PenghitungSumber("menu_cache_hasil_dihapus_total", "Jumlah hasil optimasi yang dihapus dari cache hasil", ("alasan",),
+                                               lambda: {(alasan,): cache_hasil.statistik()[alasan] for alasan in ("kedaluwarsa", "dibuang")}))
+
+# Bank solusi optimasi untuk warm-start, digunakan bersama oleh seluruh request
+bank_benih = BankBenih(kemiripan_min=KEMIRIPAN_BENIH_MIN)
+
+# Katalog makanan (id, kode jenis, kode tipe, matriks nutrisi, dan label porsi makanan) dibangun satu kali dari data makanan
+# Katalog digunakan untuk optimasi, penguraian solusi, dan tampilan menu, data makanan lokal setiap request adalah saringan katalog
+katalog_makanan = KatalogMakanan.dari_dataframe(data_makanan)
+
+# Indeks makanan untuk penyusunan menu mingguan (id makanan -> kode nama makanan, kode nama makanan -> jenis makanan)
+# Label porsi makanan untuk setiap id makanan (katalog_makanan.label) ditambahkan ke menu mingguan saat halaman hasil ditampilkan
+id_ke_nama, jenis_nama, _ = buat_indeks_nama(katalog_makanan)
+
+# Indeks alergi (kata pada nama dan tipe makanan -> bitmask makanan) untuk memfilter makanan alergi setiap request
+indeks_alergi = IndeksAlergi(katalog_makanan)
+
+# Tabel target AKG (target, bobot, jumlah makanan harian, dan ambang batas menu mingguan) per (tahun, umur, ada_susu)
+tabel_akg = bangun_tabel_akg(data_AKG)
+
+# Antrian pekerjaan penyusunan menu, digunakan bersama oleh seluruh request
+antrian_pekerjaan = AntrianPekerjaan(N_WORKER_ANTRIAN, MAKS_ANTRIAN, TTL_PEKERJAAN) if MODE_ANTRIAN else None
+
+# Tabel numerik makanan (matriks nutrisi, kode jenis, dan id makanan) pada memori bersama
+# Tabel dibuat satu kali oleh proses utama dan dilampirkan secara read-only oleh seluruh proses worker
+tabel_bersama = None
+kunci_tabel = threading.Lock()
+
+# Membuat fungsi untuk mengambil tabel makanan pada memori bersama
+# Proses worker optimasi (mode "proses") mewarisi tabel yang sudah dibuat oleh proses utama
+def ambil_tabel_bersama():
+    global tabel_bersama
+    with kunci_tabel:
+        if tabel_bersama is None:
+            tabel_bersama = tabel_makanan(katalog_makanan)
+            print(f"✅ Tabel makanan disimpan pada memori bersama ({tabel_bersama.nbytes / 1024:.1f} KB)")
+    return tabel_bersama
+
+# Pool worker untuk evaluasi paralel
+# Pool dibuat satu kali saat pertama kali dibutuhkan dan digunakan bersama oleh seluruh request
+pool_evaluasi = None
+kunci_pool = threading.Lock()
+
+# Membuat fungsi untuk mengambil pool worker evaluasi paralel
+def ambil_pool_evaluasi():
+    global pool_evaluasi
+    # Jika jumlah worker hanya 1, maka evaluasi tidak dilakukan secara paralel
+    if N_WORKER <= 1 or MODE_EVALUASI == "elementwise":
+        return None
+    with kunci_pool:
+        if pool_evaluasi is None:
+            # Data makanan lengkap diberikan satu kali ke setiap worker saat pool dibuat
+            # Pada mode "proses", setiap worker melampirkan tabel makanan pada memori bersama
+            tabel = ambil_tabel_bersama().deskripsi if MODE_PARALEL == "proses" else None
+            pool_evaluasi = PoolEvaluasi(katalog_makanan, n_worker=N_WORKER, mode=MODE_PARALEL, tabel=tabel)
+    return pool_evaluasi
+
+# Pool proses worker untuk optimasi, dibuat satu kali dan digunakan bersama oleh seluruh request
+# Pool menggunakan kunci tersendiri, karena proses worker dibuat (fork) saat pool dimulai
+# dan kunci yang sedang dipegang saat fork akan tetap terkunci pada proses worker
+pool_optimasi = None
+kunci_pool_optimasi = threading.Lock()
+
+# Membuat fungsi untuk mengambil pool proses worker optimasi
+def ambil_pool_optimasi():
+    global pool_optimasi
+    if MODE_WORKER_OPTIMASI != "proses":
+        return None
+    with kunci_pool_optimasi:
+        if pool_optimasi is None:
+            # Tabel makanan pada memori bersama dibuat sebelum proses worker dibuat,
+            # sehingga proses worker dan pool evaluasinya melampirkan tabel yang sama
+            if N_WORKER > 1 and MODE_PARALEL == "proses":
+                ambil_tabel_bersama()
+            # Setiap proses worker dipanaskan satu kali saat dibuat
+            pool_optimasi = PoolOptimasi(N_WORKER_ANTRIAN, panaskan_optimasi if PANASKAN_SAAT_MULAI else None)
+            pool_optimasi.mulai()
+    return pool_optimasi
 
-        # Menghapus kacang dari dataset makanan
-        local_data_makanan = local_data_makanan[~kondisi_snack_kacang].reset_index(drop=True)
+# Fungsi untuk menyusuk menu makanan mingguan
+# Fungsi untuk menyiapkan data makanan, target AKG, dan jumlah makanan harian sesuai dengan profil user
+# Output dari fungsi adalah data makanan lokal (saringan katalog makanan) dan entri tabel target AKG (ProfilAKG)
+# Jika tanpa_susu bernilai True, maka susu dikeluarkan dari data makanan (digunakan untuk membangun bank solusi)
+def siapkan_profil(input_umur, input_tahun, input_alergi_str, tanpa_susu=False, info=None):
+    with ukur_tahap(info, "filter_alergi"):
+        # Data makanan lokal adalah saringan katalog makanan
+        # Makanan yang dikeluarkan ditandai pada array boolean, kemudian katalog disaring satu kali
+        lolos = np.ones(len(katalog_makanan), dtype=bool)
+
+        # Bank solusi tanpa susu dibangun dari data makanan tanpa susu
+        if tanpa_susu:
+            lolos &= katalog_makanan.kode_jenis != KODE_SUSU
+
+        # Menghilangkan data makanan alergi user data dataset makanan
+        # Makanan alergi dicari pada indeks alergi (kata pada kolom "Nama Makanan" dan "Tipe") sebagai teks biasa, bukan regex
+        # Anak dibawah 1 tahun gak boleh makan kacang karena ukurannya yang kecil dapat mengakibatkan anak tersedak
+        # Jika anak di bawah 1 tahun, maka snack kacang (jenis makanan "snack" dengan tipe makanan "kacang") juga dihapus
+        lolos &= indeks_alergi.diizinkan(input_alergi_str, input_umur)
+
+        local_data_makanan = katalog_makanan.saring(lolos)
 
     # Susu akan selalu hadir pada menu makanan harian sesuai dengan rekomendari Pedoman Makanan bergizi
     # Kecuali anak alergi terhadap susu
-    # Jika tidak alergi, maka nilai nutrisi susu akan dikurangi dari nilai target AKG
-    kolom_nutrisi = [kol for kol in Target_AKG.columns if kol in local_data_makanan.columns]  # Memilih kolom nutrisi
-    susu_df = local_data_makanan[local_data_makanan["Jenis"] == "Susu"] # Memastikan susu ada dalam dataset (tidak alergi)
-    ada_susu = False  # Mendeklarasi keadaan ada susu atau tidak
-
-    # Jika ada susu (tidak alergi), maka
-    if not susu_df.empty:
-        ada_susu = True # keadaan dideklarasikan menjadi ada susu
-        total_nutrisi_susu = susu_df[kolom_nutrisi].sum()   # Memilih kolom nutrisi susu
-        Target_nutrisi = Target_AKG.iloc[0][kolom_nutrisi].astype(float) # Memilih kolom nutrisi pada AKG
-        # Kurangi nutrisi susu dari target dan clip minimal 0
-        Target_AKG.iloc[0][kolom_nutrisi] = (Target_nutrisi - total_nutrisi_susu).clip(lower=0)
-
-    # Jumlah makanan untuk setiap usia, dengan usia termuda memiliki jumlah makanan terkecil dan usia tertua dnegan jumlah terbanyak
-    # Hal ini dilakukan mengingat semakin tinggi usia, semakin tinggi juga AKG yang perlu dicapai
-
-    # Berdasarkan standar AKG 2014, berikut adalah jumlah makanan untuk setiap usia
-    if input_tahun == 2014 :
-        # Menjumlahkan makanan yang dipilih per hari
-        if input_umur== 1 :
-            jumlah_n = 11
-        elif input_umur == 2 or input_umur == 3 :
-            jumlah_n = 12
-        else  : # input_umur == 4 and input_umur == 5 
-            jumlah_n = 14
-
-    # Bedasarkan standar AKG 2019, berikut adalah jumlah makanan untuk setiap usia
-    else :
-        if input_umur == 4 or input_umur == 5:
-            jumlah_n = 15
-        else : # input_umur == 1 or input_umur == 2 or input_umur == 3 
-            jumlah_n = 14
-
-    # Mendeklarasi jumlah maksimal snack dalam menu harian
-    if input_umur == 4 or input_umur == 5:
-        n5 = 3
-    else : # input_umur == 1 or input_umur == 2 or input_umur == 3 
-        n5 = 2
-
-    # Jika anak alergi dengan susu, maka
-    #   1. Jumlah makanan akan ditambah 1, mengingat susu tidak akan ditambahkan ke menu makanan
-    #   2. Batas maksimal snack pada menu makanan ditambah 1
-    if ada_susu == False :
-        jumlah_n += 1
-        n5 += 1
+    # Jika tidak alergi, maka susu ditambahkan ke snack sore, jika alergi maka jumlah makanan dan batas snack ditambah 1
+    ada_susu = len(local_data_makanan.posisi_jenis(KODE_SUSU)) > 0  # Memastikan susu ada dalam dataset (tidak alergi)
+
+    # Target AKG, jumlah makanan harian (jumlah_n), dan jumlah maksimal snack (n5) diambil dari tabel target AKG
+    # Target AKG tidak dikurangi nutrisi susu, karena total nutrisi menu harian pada uraikan_solusi sudah termasuk susu
+    with ukur_tahap(info, "target_akg"):
+        profil_akg = cari_profil_akg(tabel_akg, input_tahun, input_umur, ada_susu)
+
+    catat_penghitung(info, n_makanan=len(local_data_makanan))
+    return local_data_makanan, profil_akg
+
+# Fungsi untuk menjalankan optimasi menu makanan harian dengan solver C-TAEA
+# Output dari fungsi adalah indeks makanan solusi optimasi pada data makanan lokal dan nilai objektifnya
+# Tenggat anggaran waktu dihitung dari waktu_mulai
+def jalankan_optimasi(input_umur, input_tahun, input_alergi_str, local_data_makanan, Target_AKG_obj, jumlah_n, n5, ada_susu,
+                      batas_waktu=None, batas_evaluasi=None, waktu_mulai=None, info=None, n_gen=None, simpan_benih=True, seed=None):
+    if waktu_mulai is None:
+        waktu_mulai = time.time()
+    if n_gen is None:
+        n_gen = N_GENERASI
+    if seed is None:
+        seed = SEED_OPTIMASI
 
     # Mendefinisikan algoritma solving optimasi
     # Optimasi dilakukan dengan solver C-TAEA
@@ -330,38 +454,182 @@ def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
     # Mendefinisikan reference direction yang digunakna dalam optimasi
     # Reference direction dibangkitkan dengan "das-dennis" dan 5 partisi
     # Jumlah reference direction adalah 126
-    ref_dirs = get_reference_directions("das-dennis", 5, n_partitions=5)
+    # Reference direction hanya dibangkitkan satu kali dan digunakan kembali oleh optimasi berikutnya
+    ref_dirs = ref_dirs_objektif(len(Target_AKG_obj.columns))
+
+    # Mendeklarasi masalah optimasi rekomendasi menu makanan sesuai dengan mode evaluasi dan enkode genom
+    if MODE_EVALUASI == "elementwise":
+        # Meal_Planning membaca data makanan dengan pandas, sehingga katalog makanan diubah menjadi dataframe
+        problem = Meal_Planning(Target_AKG_obj, jumlah_n, n5, input_umur, local_data_makanan.ke_dataframe())
+    else:
+        kernel = "jit" if MODE_EVALUASI == "jit" else "numpy"  # Kernel fitness sesuai mode evaluasi
+        # Vektor target dan bobot objektif diambil dari tabel target AKG
+        target, bobot = cari_profil_akg(tabel_akg, input_tahun, input_umur, ada_susu).target_bobot(Target_AKG_obj.columns)
+        if ENKODE_GENOM == "slot":
+            problem = Meal_Planning_Slot(Target_AKG_obj, jumlah_n, n5, local_data_makanan, ada_susu=ada_susu, kernel=kernel, pool=ambil_pool_evaluasi(), ukuran_cache=UKURAN_CACHE_EVALUASI,
+                                         target=target, bobot=bobot)
+        else:
+            problem = Meal_Planning_Batch(Target_AKG_obj, jumlah_n, n5, local_data_makanan, kernel=kernel, pool=ambil_pool_evaluasi(), ukuran_cache=UKURAN_CACHE_EVALUASI,
+                                          target=target, bobot=bobot)
+
+    # Operator genetik sesuai dengan pilihan operator
+    if OPERATOR_GENETIK == "diskrit" and MODE_EVALUASI != "elementwise":
+        operator = operator_diskrit()  # Sampling, crossover, mutasi, dan repair pada genom integer
+    else:
+        operator = dict(crossover=SBX(prob=0.9, eta=20), # Mengatur kondisi crossover
+                        mutation=PM(prob=0.5, eta=15)) # Mengatur kondisi mutasi
+
+    # Warm-start populasi awal dari solusi optimasi sebelumnya dengan profil yang sama atau mirip
+    profil = (input_tahun, input_umur, normalisasi_alergi(input_alergi_str))
+    if WARM_START and hasattr(problem, "dari_indeks"):
+        id_benih, kemiripan = bank_benih.ambil(profil, problem.n_var)
+        benih = siapkan_benih(id_benih, problem, katalog_makanan.kode_jenis) if id_benih is not None else None
+        if benih is not None:
+            operator["sampling"] = SamplingBenih(benih, operator.get("sampling"), PORSI_BENIH)
+            print(f"Warm-start : {min(len(benih), int(len(ref_dirs) * PORSI_BENIH))} benih dari profil dengan kemiripan alergi {kemiripan:.0%}")
 
     # Algoritma CTAEA
     # Definisikan algoritma C-TAEA
     algorithm = CTAEA(op_size=126,  # besar populasi dibuat sesuai dengan nilai reference directionnnya
                         ref_dirs=ref_dirs, # Mendeklarasi reference direction
-                        crossover=SBX(prob=0.9, eta=20), # Mengatur kondisi crossover
-                        mutation=PM(prob=0.5, eta=15)) # Mengatur kondisi mutasi
-        
+                        eliminate_duplicates=EliminasiDuplikatMultiset(getattr(problem, "ke_indeks", None)) if ELIMINASI_DUPLIKAT else True, # Mengatur eliminasi duplikat
+                        evaluator=EvaluatorTerukur() if FOLDER_TELEMETRI else None, # Evaluator yang mengukur waktu evaluasi untuk telemetri
+                        **operator) # Mengatur operator genetik
+
+    # Kriteria penghentian optimasi sesuai dengan mode terminasi
+    if MODE_TERMINASI == "konvergen":
+        terminasi = TerminasiKonvergensi(n_gen, TOLERANSI_KONVERGENSI, JENDELA_KONVERGENSI, RASIO_FEASIBLE_MIN)
+    else:
+        terminasi = ('n_gen', n_gen)
+
+    # Membatasi optimasi dengan anggaran waktu dan jumlah evaluasi
+    if batas_waktu or batas_evaluasi:
+        terminasi = TerminasiAnggaran(terminasi,
+                                      tenggat=waktu_mulai + batas_waktu if batas_waktu else None,
+                                      batas_evaluasi=batas_evaluasi or None)
+
+    # Progres optimasi setiap generasi disimpan pada info["progres"]
+    callback = CallbackProgres(info if info is not None else {}, list(Target_AKG_obj.columns), n_gen, CETAK_PROGRES_SETIAP)
+
+    # Telemetri optimasi setiap generasi (opsional), satu file per optimasi
+    telemetri = None
+    if FOLDER_TELEMETRI:
+        telemetri = CallbackTelemetri(lokasi_telemetri(FOLDER_TELEMETRI, input_tahun, input_umur, len(ref_dirs[0])), list(Target_AKG_obj.columns),
+                                      keterangan={"tahun": input_tahun, "umur": input_umur, "alergi": normalisasi_alergi(input_alergi_str),
+                                                  "n_ref_dirs": len(ref_dirs), "pop_size": algorithm.pop_size,
+                                                  "n_offsprings": algorithm.n_offsprings, "n_gen_maks": n_gen, "seed": seed,
+                                                  "mode_evaluasi": MODE_EVALUASI, "enkode_genom": ENKODE_GENOM,
+                                                  "operator_genetik": OPERATOR_GENETIK, "mode_terminasi": MODE_TERMINASI},
+                                      n_gen_maks=n_gen, simpan_setiap=SIMPAN_TELEMETRI_SETIAP)
+        callback = CallbackGabungan(callback, telemetri)
+
     # Melakukan optimasi
     # Optimasi dilakukan dengan mencari nilai objektif terkecil, dengan demikian digunakan minimize
     # Mendeklarasi optimasi
     Hasil = minimize(
-            problem = Meal_Planning(Target_AKG_obj, jumlah_n, n5, input_umur, local_data_makanan), # Mendeklarasi masalah optimasi rekomendasi menu makanan sebagai mana yang telah didefinisikan
+            problem = problem, # Mendeklarasi masalah optimasi rekomendasi menu makanan sebagai mana yang telah didefinisikan
             algorithm = algorithm, # Mendeklarasi algoritma solver
-            termination=('n_gen', 500), # Mendeklarasi bahwa optimasi dihentikan pada iterasi ke 500
-            verbose=True,
+            termination=terminasi, # Mendeklarasi kriteria penghentian optimasi (maksimal N_GENERASI generasi)
+            callback=callback, # Menyimpan progres optimasi setiap generasi
+            seed=seed, # Seed bilangan acak C-TAEA (None berarti acak)
+            verbose=VERBOSE_OPTIMASI,
             copy_algorithm=False
         )
     # Hasil optimasi akan disimpan ke dalam variabel Hasil
 
-    # Menyimpan solusi optimasi
-    # Mendeklarasi variabel untuk menyimpan solusi optimasi
-    list_solusi = []
-
+    # Generasi dan alasan optimasi berhenti disimpan ke info untuk halaman hasil
+    # dan hanya ditampilkan jika keluaran optimasi diaktifkan (VERBOSE_OPTIMASI atau CETAK_PROGRES_SETIAP)
+    keterangan_terminasi = ringkasan_terminasi(Hasil)
+    if VERBOSE_OPTIMASI or CETAK_PROGRES_SETIAP:
+        print(keterangan_terminasi)
+
+    # Menulis file telemetri optimasi beserta alasan optimasi berhenti
+    if telemetri is not None:
+        telemetri.keterangan["terminasi"] = keterangan_terminasi
+        print(f"Telemetri optimasi disimpan ke {telemetri.simpan()}")
+
+    # Menyimpan solusi optimasi (front dan populasi akhir) ke bank benih untuk warm-start optimasi berikutnya
+    if WARM_START and simpan_benih and hasattr(problem, "dari_indeks") and Hasil.X is not None:
+        X_simpan = np.vstack([Hasil.X, Hasil.pop.get("X")])
+        bank_benih.simpan(profil, problem.id_makanan[problem.ke_indeks(X_simpan)])
+
+    # Menyimpan keterangan penghentian optimasi untuk ditampilkan pada halaman hasil
+    if info is not None:
+        info["berhenti_awal"] = berhenti_karena_anggaran(Hasil)
+        info["keterangan"] = keterangan_terminasi
+
+    # Menyimpan statistik cache evaluasi ke info (dicatat pada metrik menu_cache_evaluasi_total)
+    # Pada mode "proses", info adalah dict bersama yang disalin ke info request
+    if getattr(problem, "cache", None) is not None and info is not None:
+        stat = problem.cache.statistik()
+        info["cache_evaluasi"] = {"hit": stat["hit"], "miss": stat["miss"]}
+
+    # Mengubah genom solusi optimasi menjadi indeks makanan pada dataset makanan
+    # Pada enkode slot, makanan sudah tersusun berurutan sesuai jenisnya
+    # Jika tidak ada solusi feasible, maka Hasil.X adalah None
+    X_solusi = problem.ke_indeks(Hasil.X) if hasattr(problem, "ke_indeks") and Hasil.X is not None else Hasil.X
+    return X_solusi, Hasil.F
+
+# Fungsi untuk menjalankan optimasi sesuai dengan MODE_WORKER_OPTIMASI
+# Pada mode "proses", optimasi dijalankan pada proses worker dan progres optimasi disalin ke info
+def jalankan_optimasi_worker(*args, info=None):
+    pool = ambil_pool_optimasi()
+    if pool is None:
+        return jalankan_optimasi(*args, info=info)
+    return pool.jalankan(jalankan_optimasi, *args, info=info)
+
+# Fungsi untuk memanaskan optimasi
+# Optimasi singkat dijalankan sekali, sehingga import, kompilasi kernel, dan pemanggilan pertama pymoo
+# tidak terjadi pada request pertama
+# Solusi optimasi singkat tidak disimpan ke bank benih
+def panaskan_optimasi():
+    waktu = time.time()
+    umur, tahun = int(data_AKG["umur"].min()), int(data_AKG["Tahun"].min())
+    local_data_makanan, profil_akg = siapkan_profil(umur, tahun, "")
+    jalankan_optimasi(umur, tahun, "", local_data_makanan, profil_akg.Target_AKG_obj, profil_akg.jumlah_n, profil_akg.n5, profil_akg.ada_susu,
+                      batas_waktu=0, batas_evaluasi=0, n_gen=N_GENERASI_PEMANASAN, simpan_benih=False)
+    print(f"✅ Optimasi dipanaskan dalam {time.time() - waktu:.2f} detik (proses {os.getpid()})")
+
+# Fungsi untuk mengubah indeks makanan solusi optimasi menjadi tabel solusi menu harian (data_solusi)
+# Total nutrisi dan persentase selisih seluruh solusi dihitung sekaligus dengan numpy,
+# kemudian menu harian hanya disusun untuk solusi yang lolos jendela valid
+# Jika optimasi tidak menghasilkan solusi (X_solusi None), maka tabel solusi kosong
+def uraikan_solusi(X_solusi, local_data_makanan, profil_akg):
+    ada_susu = profil_akg.ada_susu
     # Mendeklarasi kolom nutrisi
-    kolom_nutrisi_lengkap = ["Kalori (kkal)", "Protein (g)", "Lemak (g)", "Karbohidrat (g)", "Serat (g)"]
+    kolom_nutrisi_lengkap = list(JENDELA_VALID)
+    kolom_tabel = list(WAKTU_MAKAN) + ["total_kalori", "total_protein", "total_lemak", "total_karbo", "total_serat"] + \
+                  [f"Selisih % {nut}" for nut in kolom_nutrisi_lengkap]
+
+    # Jika optimasi tidak menghasilkan solusi, maka tabel solusi kosong
+    if X_solusi is None or len(X_solusi) == 0:
+        return pd.DataFrame(columns=kolom_tabel)
+
+    # Indeks makanan pada data makanan untuk setiap solusi (jumlah solusi x jumlah makanan)
+    X = np.asarray(X_solusi).astype(np.int64)
+    matriks = local_data_makanan.nutrisi(kolom_nutrisi_lengkap)
+    id_makanan = local_data_makanan.id_makanan
+    kode_jenis = local_data_makanan.kode_jenis[X]
+
+    # Menghitung total nutrisi seluruh solusi sekaligus, termasuk susu_item
+    #   1. Jika user tidak alergi susu, maka susu_item adalah susu terakhir pada dataset makanan
+    #   2. Jika user alergi susu, maka susu_item adalah buah terakhir pada solusi (buah tersebut dipindah ke snack sore)
+    total = matriks[X].sum(axis=1)
+    if ada_susu == True :
+        posisi_susu = local_data_makanan.posisi_jenis(KODE_SUSU)[-1]
+        total += matriks[posisi_susu]
+    else :
+        ada_buah = (kode_jenis == KODE_BUAH).any(axis=1)
+        buah_terakhir = X.shape[1] - 1 - np.argmax((kode_jenis == KODE_BUAH)[:, ::-1], axis=1)
+        total += np.where(ada_buah[:, None], matriks[X[np.arange(len(X)), buah_terakhir]], 0.0)
 
-    # Mendeklarasi target AKG
-    target = Target_AKG.iloc[0]
-    # Mendeklarasi target AKG sebagai data AKG dengan kolom nutrisi
-    target_values = target[kolom_nutrisi].values
+    # Menghitung persentase selisih kandungan nutrisi pada solusi optimasi dengan target AKG
+    target_values = profil_akg.target_kolom(kolom_nutrisi_lengkap)
+    persen = (total - target_values) / target_values * 100
+
+    # Menyaring solusi dengan jendela valid sebelum menu harian disusun
+    # sehingga hanya solusi yang dapat dipilih sebagai menu mingguan yang disusun menjadi menu harian
+    lolos, _ = indeks_menu_valid(persen)
 
     # Memisahkan solusi menu makanan harian optimasi ke dalam 5 waktu makan yang berbeda
     #   1. Sarapan : terdiri atas makanan pokok, lauk-pauk, dan sayur-mayur
@@ -369,106 +637,115 @@ def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
     #   3. Makan siang : terdiri atas makanan pokok, lauk-pauk, dan sayur-mayur
     #   4. Snack sore : terdiri atas snack dan buah
     #   5. Makan malam : terdiri atas makanan pokok, lauk-pauk, dan sayur-mayur
-    for idx, solusi in enumerate(Hasil.X):
-        # Indeks menyimpan data indeks-indeks makanan solusi optimasi
-        indeks = [int(i) for i in solusi] 
-
-        # Memisahkan makanan pada solusi berdasarkan jenis (makanan pokok, lauk-pauk, sayur-mayur, buah, dan snack)
-        # Makanan terpilih merupakan dataset dari makanan-makanan yang ada dalam menu harian solusi optimasi
-        makanan_terpilih = local_data_makanan.iloc[indeks].reset_index(drop=True)
-
-        # Memisahkan makanan-makanan ke dalam dataset-dataset yang menyimpan makanan solusi optimasi berdasarkan jenisnya
-        pokok = makanan_terpilih[makanan_terpilih["Jenis"] == "Makanan Pokok"].reset_index(drop=True) # membuat dataset makanan pokok
-        lauk = makanan_terpilih[makanan_terpilih["Jenis"] == "Lauk-pauk"].reset_index(drop=True)    # membuat dataset lauk-pauk
-        sayur = makanan_terpilih[makanan_terpilih["Jenis"] == "Sayur-mayur"].reset_index(drop=True) # membuat dataset sayur-mayur
-        buah = makanan_terpilih[makanan_terpilih["Jenis"] == "Buah"].reset_index(drop=True) # membuat dataset buah
-        snack = makanan_terpilih[makanan_terpilih["Jenis"] == "Snack"].reset_index(drop=True)   # membuat dataset snack
-
-        # Membuat dataset susu yang disimpan dalam susu_item
-        # Hal ini dilakukan jika user tidak alergi susu
-        if ada_susu == True : # Jika user tidak alergi susu
-            index_susu = local_data_makanan.index[local_data_makanan["Jenis"] == "Susu"][-1] # Mengambil susu dari dataset makanan
-            susu_item = local_data_makanan.iloc[index_susu]   # Menyimpan susu ke dalam susu_item
-        else : # Jika user alergi susu
-            susu_item = buah.iloc[-1] # susu_item akan menyimpan buah pada index terakhir
-            buah = buah.drop(buah.index[-1]).reset_index(drop=True) # Mendrop buah dari dataset buah
-
-        # Membuat masing-masing dataset menjadi dataset dengan jumlah indeks 6.
-        pokok = pad_df_to_six(pokok)
-        lauk = pad_df_to_six(lauk)
-        sayur = pad_df_to_six(sayur)
-        buah = pad_df_to_six(buah)
-        snack = pad_df_to_six(snack)
+    list_solusi = []
+    for i in lolos:
+        # Memisahkan id makanan pada solusi berdasarkan jenis (makanan pokok, lauk-pauk, sayur-mayur, buah, dan snack)
+        ids = id_makanan[X[i]]
+        pokok, lauk, sayur, buah, snack = (ids[kode_jenis[i] == kode].tolist() for kode in (KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK))
+
+        # Menyimpan id susu ke dalam susu_item
+        # Jika user alergi susu, maka susu_item adalah buah terakhir dan buah tersebut didrop dari daftar buah
+        if ada_susu == True :
+            susu_item = int(id_makanan[posisi_susu])
+        else :
+            susu_item = buah.pop() if buah else None
+
+        # Membuat masing-masing daftar menjadi daftar dengan jumlah indeks 6, indeks yang kosong bernilai None
+        pokok, lauk, sayur, buah, snack = (pad_id_to_six(x) for x in (pokok, lauk, sayur, buah, snack))
 
         # Menyusun menu harian
-        # Memisahkan makanan-makanan dari solusi optimasi ke dalam 5 waktu makan yang berbeda
-        # Untuk setiap makanan pada menu makanan yang terpilih, diterapkan format porsi makanan
-        sarapan = [
-            format_nama_urt(pokok.iloc[0]), format_nama_urt(pokok.iloc[3]), 
-            format_nama_urt(lauk.iloc[2]), format_nama_urt(lauk.iloc[5]), 
-            format_nama_urt(sayur.iloc[1]), format_nama_urt(sayur.iloc[4]), 
-            format_nama_urt(buah.iloc[4])
-        ]
-        snack_pagi = [
-            format_nama_urt(snack.iloc[0]), format_nama_urt(snack.iloc[2]), 
-            format_nama_urt(snack.iloc[4]), format_nama_urt(buah.iloc[0])
-        ]
-        makan_siang = [
-            format_nama_urt(pokok.iloc[1]), format_nama_urt(pokok.iloc[4]), 
-            format_nama_urt(lauk.iloc[0]), format_nama_urt(lauk.iloc[3]), 
-            format_nama_urt(sayur.iloc[2]), format_nama_urt(sayur.iloc[5]), 
-            format_nama_urt(buah.iloc[1])
-        ]
-        snack_sore = [
-            format_nama_urt(susu_item), 
-            format_nama_urt(snack.iloc[1]), format_nama_urt(snack.iloc[3]), format_nama_urt(snack.iloc[5]), 
-            format_nama_urt(buah.iloc[3]), format_nama_urt(buah.iloc[5])
-        ]
-        makan_malam = [
-            format_nama_urt(pokok.iloc[2]), format_nama_urt(pokok.iloc[5]),  
-            format_nama_urt(lauk.iloc[1]), format_nama_urt(lauk.iloc[4]), 
-            format_nama_urt(buah.iloc[2]), 
-            format_nama_urt(sayur.iloc[0]), format_nama_urt(sayur.iloc[3])
-        ]
-
-        # Mendeklarasi data untuk setiap kolom dari dataset
-    # deklarasi data pada kolom data menu per waktu makan
+        # Menu harian menyimpan id makanan, label porsi makanan ditambahkan saat halaman hasil ditampilkan
         row = {
-            "Sarapan": drop_empty(sarapan),
-            "Snack Pagi": drop_empty(snack_pagi),
-            "Makan Siang": drop_empty(makan_siang),
-            "Snack Sore": drop_empty(snack_sore),
-            "Makan Malam": drop_empty(makan_malam),
+            "Sarapan": drop_empty([pokok[0], pokok[3], lauk[2], lauk[5], sayur[1], sayur[4], buah[4]]),
+            "Snack Pagi": drop_empty([snack[0], snack[2], snack[4], buah[0]]),
+            "Makan Siang": drop_empty([pokok[1], pokok[4], lauk[0], lauk[3], sayur[2], sayur[5], buah[1]]),
+            "Snack Sore": drop_empty([susu_item, snack[1], snack[3], snack[5], buah[3], buah[5]]),
+            "Makan Malam": drop_empty([pokok[2], pokok[5], lauk[1], lauk[4], buah[2], sayur[0], sayur[3]]),
         }
 
-        # Menghitung total nutrisi pada menu harian solusi optimasi
-        total_nutrisi = makanan_terpilih[kolom_nutrisi_lengkap].sum() + susu_item[kolom_nutrisi_lengkap]
-        
         # Membulatkan data kalori, protein, lemak, karbohidrat, dan serat menjadi 2 angka dibelakang desimal
-        row["total_kalori"] = round(total_nutrisi["Kalori (kkal)"], 2)
-        row["total_protein"] = round(total_nutrisi["Protein (g)"], 2)
-        row["total_lemak"] = round(total_nutrisi["Lemak (g)"], 2)
-        row["total_karbo"] = round(total_nutrisi["Karbohidrat (g)"], 2)
-        row["total_serat"] = round(total_nutrisi["Serat (g)"], 2)
-        # ---------------------------
-
-        # Menghitung selisih kandungan nutrisi pada solusi optimasi dnegan target AKG
-        target_values = Target_AKG.iloc[0][kolom_nutrisi_lengkap].values
-        total_val = total_nutrisi.values
-        bukan_persen = total_val - target_values
-        persen = (bukan_persen / target_values) * 100   # Membuat nilai selisih ke dalam persentase
-        
+        row["total_kalori"], row["total_protein"], row["total_lemak"], row["total_karbo"], row["total_serat"] = \
+            (round(float(t), 2) for t in total[i])
         # deklarasi data pada kolom data selisih nutrisi
-        for i, nut in enumerate(kolom_nutrisi_lengkap):
-            row[f"Selisih % {nut}"] = persen[i]
+        for j, nut in enumerate(kolom_nutrisi_lengkap):
+            row[f"Selisih % {nut}"] = float(persen[i, j])
         
         # Menyimpan data ke dalam baris
         list_solusi.append(row)
 
-    data_solusi = pd.DataFrame(list_solusi) # Mengubah list_solusi menjadi dataframe pandas
-    
+    data_solusi = pd.DataFrame(list_solusi, columns=kolom_tabel) # Mengubah list_solusi menjadi dataframe pandas
+    return data_solusi
+
+# Fungsi untuk mencari solusi menu makanan harian
+# Output dari fungsi adalah tabel solusi menu harian (data_solusi) dan data makanan setelah filter alergi
+# Solusi diambil dari bank solusi (dibangun offline) jika solusi yang tidak mengandung makanan alergi masih cukup,
+# jika tidak, maka solusi dicari dengan optimasi
+# Anggaran waktu (detik) dan jumlah evaluasi bernilai None berarti mengikuti anggaran deployment
+# Jika info diberikan (dict), maka keterangan penghentian optimasi disimpan ke dalam info
+def optimasi_menu_harian(input_umur, input_tahun, input_alergi_str, batas_waktu=None, batas_evaluasi=None, info=None):
+    waktu_mulai = time.time()   # Waktu mulai penyusunan menu untuk menghitung tenggat anggaran waktu
+    if batas_waktu is None:
+        batas_waktu = BATAS_WAKTU_OPTIMASI
+    if batas_evaluasi is None:
+        batas_evaluasi = BATAS_EVALUASI_OPTIMASI
+
+    local_data_makanan, profil_akg = siapkan_profil(input_umur, input_tahun, input_alergi_str, info=info)
+    Target_AKG_obj, ada_susu, jumlah_n, n5 = profil_akg.Target_AKG_obj, profil_akg.ada_susu, profil_akg.jumlah_n, profil_akg.n5
+
+    # Mengambil solusi dari bank solusi
+    # Solusi yang mengandung makanan yang sudah dikeluarkan dari data makanan (alergi) dibuang
+    X_solusi = None
+    if bank_solusi is not None:
+        with ukur_tahap(info, "bank_solusi"):
+            X_solusi = ambil_solusi_bank(bank_solusi, (input_tahun, input_umur, ada_susu), local_data_makanan.id_makanan, MIN_SOLUSI_BANK)
+        if X_solusi is not None:
+            catat_penghitung(info, sumber="bank")
+            print(f"Bank solusi : {len(X_solusi)} solusi digunakan tanpa optimasi")
+            if info is not None:
+                info["berhenti_awal"] = False
+                info["keterangan"] = "Solusi diambil dari bank solusi"
+        else:
+            print("Bank solusi : solusi yang tersisa tidak cukup, optimasi dijalankan")
+
+    # Jika bank solusi tidak tersedia atau solusi yang tersisa tidak cukup, maka optimasi dijalankan
+    # Jumlah evaluasi dan generasi optimasi diambil dari progres optimasi terakhir
+    if X_solusi is None:
+        with ukur_tahap(info, "optimasi"):
+            X_solusi, _ = jalankan_optimasi_worker(input_umur, input_tahun, input_alergi_str, local_data_makanan, Target_AKG_obj, jumlah_n, n5, ada_susu,
+                                                   batas_waktu, batas_evaluasi, waktu_mulai, info=info)
+        progres = (info or {}).get("progres") or {}
+        catat_penghitung(info, sumber="optimasi", n_evaluasi=progres.get("n_evaluasi", 0), n_generasi=progres.get("generasi", 0))
+        cache_evaluasi = (info or {}).get("cache_evaluasi")
+        if cache_evaluasi:
+            catat_penghitung(info, cache_evaluasi_hit=cache_evaluasi["hit"], cache_evaluasi_miss=cache_evaluasi["miss"])
+
+    with ukur_tahap(info, "uraikan"):
+        data_solusi = uraikan_solusi(X_solusi, local_data_makanan, profil_akg)
+    catat_penghitung(info, n_solusi=0 if X_solusi is None else len(X_solusi), n_menu_harian=len(data_solusi))
+    return data_solusi, local_data_makanan
+
+# Fungsi untuk menyusun menu makanan mingguan dari tabel solusi menu harian
+# Tabel solusi menu harian tidak diubah, sehingga dapat digunakan kembali dari cache hasil optimasi
+# Jika info diberikan (dict), maka waktu tahap dan penghitung penyusunan menu mingguan disimpan ke dalam info
+def susun_menu_mingguan(data_solusi, local_data_makanan, input_umur, input_tahun, info=None):
     # Membentuk solusi menu mingguan
-
+    # Jika optimasi tidak menghasilkan solusi, maka menu mingguan tidak dapat disusun
+    if len(data_solusi) == 0:
+        return None
+
+    with ukur_tahap(info, "menu_valid"):
+        menu_valid, tingkat_fallback = saring_menu_valid(data_solusi)
+    catat_penghitung(info, n_menu_valid=len(menu_valid), tingkat_fallback=TINGKAT_FALLBACK[tingkat_fallback])
+
+    with ukur_tahap(info, "susun_mingguan"):
+        return pilih_menu_mingguan(menu_valid, input_umur, input_tahun, info)
+
+# Fungsi untuk mencari indeks solusi menu harian yang valid
+# Input dari fungsi adalah persentase selisih nutrisi setiap solusi (jumlah solusi x kolom JENDELA_VALID)
+# Output dari fungsi adalah indeks solusi yang valid dan tingkat pelonggaran (0, 1, atau 2) yang digunakan
+# Digunakan oleh uraikan_solusi (sebelum menu harian disusun) dan saring_menu_valid (tabel solusi dari cache atau bank),
+# menyaring ulang tabel yang sudah disaring menghasilkan tabel yang sama
+def indeks_menu_valid(persen):
     # Memfilter solusi yang valid
     # Solusi dianggap valid jika
     #   1. Persentase selisih kalori dibawah 20% (lebih banyak atau kurang dari Target AKG)
@@ -476,59 +753,52 @@ def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
     #   3. Persentase selisih lemak dibawah 40% (lebih banyak atau kurang dari Target AKG)
     #   4. Persentase selisih Karbohidrat dibawah 40% (lebih banyak atau kurang dari Target AKG)
     #   5. Persentase selisih serat dibawah 50% (lebih banyak atau kurang dari Target AKG)
-    menu_valid = data_solusi[(data_solusi["Selisih % Kalori (kkal)"] >= -20) & (data_solusi["Selisih % Kalori (kkal)"] <= 20) & 
-                            (data_solusi["Selisih % Protein (g)"] >= -40) & (data_solusi["Selisih % Protein (g)"] <= 40) & 
-                            (data_solusi["Selisih % Lemak (g)"] >= -40) & (data_solusi["Selisih % Lemak (g)"] <= 40) & 
-                            (data_solusi["Selisih % Karbohidrat (g)"] >= -40) & (data_solusi["Selisih % Karbohidrat (g)"] <= 40) & 
-                            (data_solusi["Selisih % Serat (g)"] >= -50) & (data_solusi["Selisih % Serat (g)"] <= 50) 
-    ].reset_index(drop=True)
+    persen = np.abs(np.asarray(persen, dtype=np.float64))
+    batas_persen = np.array(list(JENDELA_VALID.values()), dtype=np.float64)
+    lolos = np.flatnonzero(np.all(persen <= batas_persen, axis=1))
+    tingkat_fallback = 0
 
     # Jika solusi menu yang valid kurang dari 7, dan tidak bisa membentuk menu mingguan maka
     # Maka kriteria valid dilonggarkan sebagai persentase selisih kalori dibawah 20% (lebih banyak atau kurang dari Target AKG) saja
-    if len(menu_valid) < 7 :
-        menu_valid = data_solusi[(data_solusi["Selisih % Kalori (kkal)"] >= -20) & (data_solusi["Selisih % Kalori (kkal)"] <= 20)
-        ].reset_index(drop=True)
-        print("menu yang valid_1 kurang dari 7")
+    if len(lolos) < 7 :
+        lolos = np.flatnonzero(persen[:, 0] <= batas_persen[0])
+        tingkat_fallback = 1
         # Jika menu yang valid masih kurang dari 7, dan tidak bisa membentuk menu mingguan maka
         # Maka seluruh data solusi dianggap sebagai menu yang valid
-        if len(menu_valid) < 7 :
-            menu_valid = data_solusi
-            print("menu yang valid_2 kurang dari 7")
+        if len(lolos) < 7 :
+            lolos = np.arange(len(persen))
+            tingkat_fallback = 2
+    return lolos, tingkat_fallback
+
+# Fungsi untuk memfilter solusi menu harian yang valid
+# Output dari fungsi adalah tabel menu harian yang valid dan tingkat pelonggaran (0, 1, atau 2) yang digunakan
+def saring_menu_valid(data_solusi):
+    persen = data_solusi[[f"Selisih % {nut}" for nut in JENDELA_VALID]].to_numpy(dtype=np.float64)
+    lolos, tingkat_fallback = indeks_menu_valid(persen)
+    if tingkat_fallback >= 1:
+        print("menu yang valid_1 kurang dari 7")
+    if tingkat_fallback == 2:
+        print("menu yang valid_2 kurang dari 7")
+        return data_solusi, tingkat_fallback
+    return data_solusi.iloc[lolos].reset_index(drop=True), tingkat_fallback
 
+# Fungsi untuk memilih 7 menu harian dari tabel menu harian yang valid sebagai menu mingguan
+def pilih_menu_mingguan(menu_valid, input_umur, input_tahun, info=None):
     # Dalam pembentukan menu mingguan, 7 menu harian dipilih secara acak, kemudian diperiksa
     # Pemeriksaan dilakukan untuk memastikan bahwa dalam menu mingguan tidak terdapat terllau banyak makanan yang berulang
     # Untuk itu dilakukan pemeriksaan berupa
     #   1. Memastikan jumlah makanan pokok tidak lebih dari ambang batas
     #   2. Memastikan jumlah lauk-pauk tidak lebih dari ambang batas 
     #   3. Memastikan jumlah snack tidak lebih dari ambang batas 
-    # Berikut adalah ambang batas yang ditetapkan untuk tidak jenis makanan
-    if input_tahun == 2014 : # Jika standar yang digunakan adalah standar AKG tahun 2014
-        if input_umur == 1 or input_umur == 2 :
-            n2 = 5
-        else :
-            n2 = 6
-        if input_umur == 1 or input_umur == 2 :
-            n3 = 3
-        else :
-            n3 = 4
-
-    else : # Jika standar yang digunakan adalah standar AKG tahun 2014
-        if input_umur == 1 or input_umur == 2 :
-            n2 = 12
-        else :
-            n2 = 12
-        if input_umur == 1 or input_umur == 2 :
-            n3 = 4
-        else :
-            n3 = 4
-    # Ambang batas jumlah makanan yang sama untuk tiap jenis makanan
-    Batas_maks_jumlah = {
-        "Lauk-pauk": n3,    # Ambang batas jumlah lauk-pauk yang sama dalam menu mingguan
-        "Snack": n3 + 1,    # Ambang batas jumlah snack yang sama dalam menu mingguan
-        "Makanan Pokok" : n2    # Ambang batas jumlah makanan yang sama dalam menu mingguan
-    }
+    # Ambang batas jumlah makanan yang sama untuk tiap jenis makanan diambil dari tabel target AKG
+    #   1. Standar AKG 2014 : makanan pokok 5 (usia 1 dan 2) atau 6, lauk-pauk 3 (usia 1 dan 2) atau 4, snack lauk-pauk + 1
+    #   2. Standar AKG 2019 : makanan pokok 12, lauk-pauk 4, snack 5
+    Batas_maks_jumlah = cari_profil_akg(tabel_akg, input_tahun, input_umur).batas_jenis
     maks_jumlah = Batas_maks_jumlah.copy()
 
+    # Kode nama makanan dari setiap calon menu harian, makanan dengan nama yang sama dihitung sebagai makanan yang sama
+    kode_harian = [id_ke_nama[id_harian(menu)] for menu in menu_valid.to_dict('records')]
+
     # Jika tidak ditemukan menu makanan mingguan yang memenuhi starat ambang batas jumlah makanan yang sama, maka
     # Ambang batas makanan dilonggarkan dan ditambah 1
     # Batas maksimum pelonggaran adalah sebanyak 3 kali
@@ -537,96 +807,62 @@ def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
 
     sukses = False
 
-    menu_mingguan = []  # deklarasi variabel yang menyimpan menu mingguan
+    terpilih = []  # deklarasi variabel yang menyimpan posisi menu harian pada menu mingguan
+    rng = np.random.default_rng(SEED_OPTIMASI)  # Bilangan acak untuk memilih menu harian
+    statistik = {"coba": 0}  # Jumlah percobaan acak atau langkah backtracking
     
     # Loop Relaksasi: Mencoba menyusun 7 menu unik
     while jumlah_longgar <= maks_longgar :
-        coba = 0    # Mengitung jumlah pelonggaran batas ambang
-        hitung_lauk = Counter()    # Menghitung jumlah lauk-pauk yang sama
-        hitung_snack = Counter()   # Menghitung jumlah snack yang sama
-        hitung_pokok = Counter()   # Menghitung jumlah makanan pokok yang sama
-        
-        # Algoritma akan mencoba mengkombinasikan 7 menu makanan harian untuk membentuk menu makanan mingguan
-        # Percobaan kombinasi akan dilakukan sebanyak maksimal 5000 kali
-        while len(menu_mingguan) < 7 and coba < 5000:
-            coba += 1
-            # Memilih menu makanansecara acak
-            calon = menu_valid.sample(1).iloc[0]
+        batas = batas_per_nama(jenis_nama, maks_jumlah)
+        terbukti = False
+
+        if MODE_SUSUN_MINGGUAN == "tepat":
+            # Seluruh kombinasi menu harian diperiksa dengan backtracking
+            # Urutan calon menu harian diacak, sehingga menu mingguan tetap bervariasi antar request
+            # Menu harian yang sama hanya boleh dipilih lagi jika menu harian yang valid kurang dari 7
+            hasil, terbukti = cari_tepat(kode_harian, batas, urutan=rng.permutation(len(kode_harian)),
+                                         boleh_ulang=len(kode_harian) < 7, statistik=statistik)
+            if len(hasil) > len(terpilih):
+                terpilih = hasil
+            if not terbukti and len(terpilih) < 7:
+                print("Backtracking menu mingguan berhenti karena batas langkah")
+        else:
+            # Menghitung jumlah makanan yang sama (lauk-pauk, snack, dan makanan pokok) per kode nama makanan
+            hitung = np.zeros(len(jenis_nama), dtype=np.int64)
             
-            # Menggabungkan semua menu per waktu makan menjadi menu harian
-            makanan_harian = (calon["Sarapan"]
-                            + calon["Snack Pagi"]
-                            + calon["Makan Siang"]
-                            + calon["Snack Sore"]
-                            + calon["Makan Malam"])
-
-            # Cek jumlah makanan yang sama dalam satu menu minggaun
-            valid = True
-
-            for m_full in makanan_harian:
-                # Mengambil nama makanan saja tanpa data URT maupun berat makanan untuk mengecek jumlah
-                nama_only = m_full.split('(')[0].strip() if '(' in m_full else m_full
-                
-                jenis = local_data_makanan.loc[local_data_makanan["Nama Makanan"] == nama_only, "Jenis"].values
-                if len(jenis) > 0:
-                    j = jenis[0]
-                    # Cek counter
-                    current_count = 0
-                    # Cek jumlah lauk-pauk yang sama
-                    if j=="Lauk-pauk": 
-                        current_count = hitung_lauk[nama_only]
-                    # Cek jumlah snack yang sama
-                    elif j=="Snack": 
-                        current_count = hitung_snack[nama_only]
-                    # Cek jumlah makanan pokok yang sama
-                    elif j=="Makanan Pokok": 
-                        current_count = hitung_pokok[nama_only]
-                    
-                    if j in maks_jumlah and current_count >= maks_jumlah[j]:
-                        valid = False; 
-                        break
-            
-             # Kalau belum melanggar makan menu harian akan ditambahkan ke menu mingguan
-            if valid:
-                menu_mingguan.append(calon)
-                for m_full in makanan_harian:
-                    nama_only = m_full.split('(')[0].strip() if '(' in m_full else m_full
-                    jenis = local_data_makanan.loc[local_data_makanan["Nama Makanan"] == nama_only, "Jenis"].values
-                    if len(jenis) > 0:
-                        if jenis[0] == "Lauk-pauk": 
-                            hitung_lauk[nama_only] += 1    # Menambahkan jumlah lauk-pauk yang sama ke dalam counter lauk-pauk
-                        elif jenis[0] == "Snack": 
-                            hitung_snack[nama_only] += 1   # Menambahkan jumlah snack yang sama ke dalam counter snack
-                        elif jenis[0] == "Makanan Pokok": 
-                            hitung_pokok[nama_only] += 1
+            # Algoritma akan mencoba mengkombinasikan 7 menu makanan harian untuk membentuk menu makanan mingguan
+            # Percobaan kombinasi akan dilakukan sebanyak maksimal 5000 kali
+            pilih_acak(kode_harian, batas, hitung, terpilih, maks_coba=5000, rng=rng, statistik=statistik)
         
         # Jika berhasil ditemukan 7 menu mingguan, maka pencarian akan berhenti
-        if len(menu_mingguan) == 7:
+        if len(terpilih) == 7:
             sukses = True
             break 
         
         # Jika gagal, maka ambang batas makanan akan dilonggarkan
         jumlah_longgar += 1
+        # Jika menu mingguan terbukti tidak ada, maka percobaan ulang dengan ambang batas yang sama dilewati
+        if terbukti:
+            jumlah_longgar = max(jumlah_longgar, maks_longgar)
         if jumlah_longgar >= maks_longgar :
             maks_jumlah["Lauk-pauk"] += 1
             maks_jumlah["Snack"] += 1
             maks_jumlah["Makanan Pokok"] += 1
 
+    catat_penghitung(info, coba=statistik["coba"], jumlah_longgar=jumlah_longgar, tambahan_acak=max(0, 7 - len(terpilih)))
+
     # Jika menu mingguan kurang dari 7, maka
     # menu makanan akan ditambahkan secara acak hingga tercapai 7 menu makanan
-    if len(menu_mingguan) < 7:
-        # Ambil index menu harian yang sudah terpakai
-        used_idx = {m["index"] for m in menu_mingguan if "index" in m}
-
+    if len(terpilih) < 7:
         # Buang menu yang sudah dipakai
-        # Simpan sisanya ke dalam dataset pool
-        pool = menu_valid.reset_index().loc[~menu_valid.reset_index()["index"].isin(used_idx)]
+        # Simpan sisanya ke dalam pool
+        pool = np.setdiff1d(np.arange(len(menu_valid)), terpilih)
 
         #Menambahkan menu makanan sisanya
-        if not pool.empty:
-            needed = 7 - len(menu_mingguan) # Menghitung jumlah menu makanan yang masih kurang
-            tambahan = pool.sample(min(len(pool), needed), replace=False).to_dict('records')    # Mengambil menu makanan tambahan sesuai jumlah yang masih kurang
-            menu_mingguan.extend(tambahan)  # Menambahkan menu makanan tambahan
+        if len(pool) > 0:
+            needed = 7 - len(terpilih) # Menghitung jumlah menu makanan yang masih kurang
+            tambahan = rng.choice(pool, min(len(pool), needed), replace=False)    # Mengambil menu makanan tambahan sesuai jumlah yang masih kurang
+            terpilih.extend(int(i) for i in tambahan)  # Menambahkan menu makanan tambahan
         sukses = True
 
     # Output menu mingguan
@@ -634,7 +870,48 @@ def generate_menu_logic(input_umur, input_tahun, input_alergi_str):
         return None  # Kembalikan None jika gagal mendapatkan 7 hari
     
     # Output menu mingguan
-    return menu_mingguan[:7]
+    return [menu_valid.iloc[i].to_dict() for i in terpilih[:7]]
+
+# Fungsi untuk menyusuk menu makanan mingguan
+# Hasil optimasi disimpan pada cache per profil (umur, tahun, alergi), sehingga request dengan profil yang sama
+# tidak menjalankan optimasi lagi dan hanya menyusun ulang menu mingguan dari tabel solusi menu harian
+# Waktu setiap tahap dan penghitung penyusunan menu dicatat pada info, kemudian ditambahkan ke metrik (/metrics) dan log
+def generate_menu_logic(input_umur, input_tahun, input_alergi_str, batas_waktu=None, batas_evaluasi=None, info=None):
+    # Info langsung diisi selama optimasi berjalan (termasuk progres optimasi), sehingga dapat dibaca oleh halaman status pekerjaan
+    if info is None:
+        info = {}
+
+    waktu_mulai = time.perf_counter()
+    status = "error"
+    try:
+        menu_hasil = susun_menu_request(input_umur, input_tahun, input_alergi_str, batas_waktu, batas_evaluasi, info)
+        status = "sukses" if menu_hasil is not None else "gagal"
+        return menu_hasil
+    finally:
+        metrik_menu.catat(info, time.perf_counter() - waktu_mulai, status, umur=input_umur, tahun=input_tahun,
+                          jumlah_alergi=len(normalisasi_alergi(input_alergi_str)), berhenti_awal=bool(info.get("berhenti_awal")))
+
+# Fungsi untuk menyusun menu makanan mingguan satu request, dari cache hasil optimasi atau dari optimasi
+def susun_menu_request(input_umur, input_tahun, input_alergi_str, batas_waktu, batas_evaluasi, info):
+    kunci = (input_umur, input_tahun, normalisasi_alergi(input_alergi_str))
+    with ukur_tahap(info, "cache"):
+        hasil = cache_hasil.ambil(kunci) if cache_hasil is not None else None
+    # Hit dan miss cache hasil optimasi dicatat pada metrik (menu_cache_hasil_total)
+    if cache_hasil is not None:
+        catat_penghitung(info, cache_hasil="hit" if hasil is not None else "miss")
+
+    if hasil is None:
+        hasil = optimasi_menu_harian(input_umur, input_tahun, input_alergi_str, batas_waktu, batas_evaluasi, info=info)
+        # Hasil optimasi yang dihentikan karena anggaran tidak disimpan, karena kualitasnya belum tentu sama
+        # Hasil optimasi tanpa solusi juga tidak disimpan
+        if cache_hasil is not None and not info.get("berhenti_awal") and len(hasil[0]) > 0:
+            cache_hasil.simpan(kunci, hasil)
+    else:
+        info.update({"berhenti_awal": False, "keterangan": "Hasil optimasi diambil dari cache"})
+        catat_penghitung(info, sumber="cache", n_makanan=len(hasil[1]), n_menu_harian=len(hasil[0]))
+
+    data_solusi, local_data_makanan = hasil
+    return susun_menu_mingguan(data_solusi, local_data_makanan, input_umur, input_tahun, info=info)
 
     
 # Routing Flask
@@ -658,9 +935,8 @@ def cek_akg():
         tahun = int(request.form['tahun'])  # Mengambil data tahun standar AKG
         alergi = request.form['alergi'] # Mengambil data alergi
 
-        # Mencari data AKG
-        Tahun_AKG = cari_Tahun_AKG(tahun, data_AKG) # Berdasarkan tahun
-        Target_AKG_row = cari_Target_AKG(umur, Tahun_AKG)   # Berdasarkan usia
+        # Mencari data AKG berdasarkan tahun dan usia pada tabel target AKG
+        Target_AKG_row = cari_profil_akg(tabel_akg, tahun, umur).Target_AKG
         
         # Menyiapkan data AKG yang akan ditampilkan
         # Membulatkannya ke dua angka dibelakang desimal
@@ -682,6 +958,30 @@ def cek_akg():
     except Exception as e:
         return f"<h3>Terjadi Kesalahan Data:</h3><p>{str(e)}</p><a href='/'>Kembali</a>"
 
+# Membuat fungsi untuk menentukan anggaran optimasi dari request
+# Anggaran request yang kosong atau tidak valid mengikuti anggaran deployment,
+# dan anggaran request tidak dapat melebihi anggaran deployment
+def anggaran_request(nilai, batas_deployment):
+    if nilai is None or nilai <= 0:
+        return None
+    if batas_deployment:
+        return min(nilai, batas_deployment)
+    return nilai
+
+# Membuat fungsi untuk menampilkan Halaman Output Menu Makanan dari hasil penyusunan menu
+def tampilkan_hasil(menu_hasil, info):
+    # Jika aloritma gagal menghasilkan menu mingguan dan menu_hasil adalah None
+    if menu_hasil is None:
+        # Menampilkan halaman error
+        return render_template('error.html')
+    
+    # Jika algoritma berhasil menghasilkan menumingguan
+    # Jika optimasi dihentikan karena anggaran, maka hal ini ditandai pada halaman hasil dan header response
+    # Label porsi makanan ditambahkan pada menu mingguan yang berisi id makanan
+    respon = make_response(render_template('result.html', menu=beri_label(menu_hasil, katalog_makanan.label), info=info))
+    respon.headers["X-Optimasi-Berhenti-Awal"] = "1" if info.get("berhenti_awal") else "0"
+    return respon
+
 # Menghasilkan menu makan mingguan untuk user
 @app.route('/generate', methods=['POST'])
 def generate():
@@ -689,19 +989,117 @@ def generate():
     umur = int(request.form['umur'])
     tahun = int(request.form['tahun'])
     alergi = request.form['alergi']
+
+    # Mengambil anggaran optimasi per request (opsional)
+    batas_waktu = anggaran_request(request.form.get('batas_waktu', type=float), BATAS_WAKTU_OPTIMASI)
+    batas_evaluasi = anggaran_request(request.form.get('batas_evaluasi', type=int), BATAS_EVALUASI_OPTIMASI)
+
+    # Mode antrian : pekerjaan dimasukkan ke antrian dan user diarahkan ke halaman status pekerjaan
+    if antrian_pekerjaan is not None:
+        id_pekerjaan = antrian_pekerjaan.kirim(generate_menu_logic, umur, tahun, alergi, batas_waktu, batas_evaluasi,
+                                               keterangan={'umur': umur, 'tahun': tahun, 'alergi': alergi})
+        # Jika antrian penuh, maka user diminta mencoba lagi nanti
+        if id_pekerjaan is None:
+            return render_template('error.html', pesan="Antrian penyusunan menu sedang penuh. Silakan coba beberapa saat lagi."), 503
+        respon = redirect(url_for('status_pekerjaan', id_pekerjaan=id_pekerjaan), code=303)
+        respon.headers["X-Id-Pekerjaan"] = id_pekerjaan
+        return respon
     
     # Menyusun menu makan mingguan
-    menu_hasil = generate_menu_logic(umur, tahun, alergi)
-    
-    # Jika aloritma gagal menghasilkan menu mingguan dan menu_hasil adalah None
-    if menu_hasil is None:
-        # Menampilkan halaman error
-        return render_template('error.html')
-    
-    # Jika algoritma berhasil menghasilkan menumingguan
-    return render_template('result.html', menu=menu_hasil)
+    info = {}
+    menu_hasil = generate_menu_logic(umur, tahun, alergi, batas_waktu, batas_evaluasi, info=info)
+    return tampilkan_hasil(menu_hasil, info)
+
+# Menampilkan metrik penyusunan menu dalam format teks Prometheus
+@app.route('/metrics')
+def metrics():
+    return metrik_menu.teks(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+# Menampilkan halaman pekerjaan penyusunan menu
+# Jika pekerjaan belum selesai, maka ditampilkan halaman penunggu yang mengecek status pekerjaan secara berkala
+# Jika pekerjaan sudah selesai, maka ditampilkan Halaman Output Menu Makanan
+@app.route('/pekerjaan/<id_pekerjaan>')
+def status_pekerjaan(id_pekerjaan):
+    pekerjaan = antrian_pekerjaan.ambil(id_pekerjaan) if antrian_pekerjaan is not None else None
+    if pekerjaan is None:
+        return render_template('error.html', pesan="Pekerjaan penyusunan menu tidak ditemukan atau sudah kedaluwarsa."), 404
+    if not pekerjaan.selesai:
+        return render_template('pekerjaan.html', pekerjaan=antrian_pekerjaan.status(id_pekerjaan), user=pekerjaan.keterangan)
+    return tampilkan_hasil(pekerjaan.hasil, pekerjaan.info)
+
+# Menampilkan status pekerjaan penyusunan menu dalam bentuk JSON
+@app.route('/pekerjaan/<id_pekerjaan>/status')
+def status_pekerjaan_json(id_pekerjaan):
+    status = antrian_pekerjaan.status(id_pekerjaan) if antrian_pekerjaan is not None else None
+    if status is None:
+        return jsonify({"error": "Pekerjaan tidak ditemukan"}), 404
+    status["url_hasil"] = url_for('status_pekerjaan', id_pekerjaan=id_pekerjaan)
+    return jsonify(status)
+
+# Perintah offline untuk membangun bank solusi optimasi : flask --app app bangun-bank-solusi
+# Optimasi dijalankan untuk setiap kombinasi (tahun, umur, ada susu) tanpa alergi dan tanpa anggaran
+# Jika ulang lebih dari 1, maka optimasi diulang dan solusinya digabungkan
+@app.cli.command("bangun-bank-solusi")
+@click.option("--ulang", default=1, show_default=True, help="Jumlah pengulangan optimasi untuk setiap kombinasi")
+def bangun_bank_solusi(ulang):
+    global bank_solusi
+    entri = {}
+    for tahun in sorted(data_AKG["Tahun"].unique()):
+        for umur in sorted(data_AKG["umur"].unique()):
+            for ada_susu in (True, False):
+                tahun, umur = int(tahun), int(umur)
+                local_data_makanan, profil_akg = siapkan_profil(umur, tahun, "", tanpa_susu=not ada_susu)
+                Target_AKG_obj, ada, jumlah_n, n5 = profil_akg.Target_AKG_obj, profil_akg.ada_susu, profil_akg.jumlah_n, profil_akg.n5
+                daftar_id, daftar_F = [], []
+                for _ in range(ulang):
+                    X_solusi, F = jalankan_optimasi(umur, tahun, "", local_data_makanan, Target_AKG_obj, jumlah_n, n5, ada, batas_waktu=0, batas_evaluasi=0)
+                    if X_solusi is not None:
+                        daftar_id.append(local_data_makanan.id_makanan[np.asarray(X_solusi).astype(np.int64)])
+                        daftar_F.append(F)
+                if daftar_id:
+                    entri[(tahun, umur, ada)] = (np.vstack(daftar_id), np.vstack(daftar_F))
+                    print(f"Bank solusi {tahun} usia {umur} {'dengan' if ada else 'tanpa'} susu : {len(entri[(tahun, umur, ada)][0])} solusi")
+                else:
+                    print(f"Bank solusi {tahun} usia {umur} {'dengan' if ada else 'tanpa'} susu : tidak ada solusi")
+    simpan_bank(LOKASI_BANK_SOLUSI, entri, sidik_data_makanan)
+    bank_solusi = entri
+    print(f"✅ Bank solusi disimpan ke {LOKASI_BANK_SOLUSI}")
+
+# Pemanasan optimasi dijalankan satu kali per proses website
+pemanasan_dimulai = False
+kunci_pemanasan = threading.Lock()
+
+# Fungsi untuk memulai pemanasan optimasi
+#   1. Mode "proses" : pool proses worker dibuat dan setiap proses worker dipanaskan
+#   2. Mode "thread" : optimasi dipanaskan pada thread latar belakang (latar=True) atau langsung (latar=False)
+# Jika latar bernilai False, maka fungsi menunggu sampai pemanasan selesai
+def mulai_pemanasan(latar=True):
+    global pemanasan_dimulai
+    with kunci_pemanasan:
+        if pemanasan_dimulai or not PANASKAN_SAAT_MULAI:
+            return
+        pemanasan_dimulai = True
+    if MODE_WORKER_OPTIMASI == "proses":
+        pool = ambil_pool_optimasi()
+        if not latar:
+            for siap in pool.mulai():
+                siap.result()
+    elif latar:
+        threading.Thread(target=panaskan_optimasi, name="pemanasan-optimasi", daemon=True).start()
+    else:
+        panaskan_optimasi()
+
+# Pada server selain app.run (flask run, gunicorn), pemanasan dimulai oleh request pertama
+@app.before_request
+def pemanasan_request_pertama():
+    if not pemanasan_dimulai:
+        mulai_pemanasan()
 
 # Menjalankan website
 if __name__ == '__main__':
-
-    app.run(debug=True)
+    DEBUG = True
+    # Dengan debug, app.run menjalankan proses reloader dan proses anak yang melayani request (WERKZEUG_RUN_MAIN),
+    # sehingga pemanasan hanya dijalankan pada proses anak
+    if not DEBUG or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        mulai_pemanasan()
+    app.run(debug=DEBUG)
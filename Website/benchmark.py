@@ -0,0 +1,259 @@
+# BENCHMARK PIPELINE PENYUSUNAN MENU
+
+# Mengukur waktu setiap tahap penyusunan menu dengan seed tetap dan dataset bawaan (AKG.xlsx dan Dataset_Makanan.xlsx)
+#   1. profil : penyiapan data makanan dan target AKG (siapkan_profil)
+#   2. evaluasi_elementwise : evaluasi satu populasi dengan Meal_Planning (satu per satu dengan pandas, hanya 5 objektif)
+#   3. evaluasi_batch dan evaluasi_jit : evaluasi satu populasi dengan Meal_Planning_Batch (kernel numpy dan Numba)
+#   4. optimasi : satu optimasi C-TAEA lengkap (minimize)
+#   5. uraikan : penguraian solusi optimasi menjadi tabel solusi menu harian (uraikan_solusi)
+#   6. mingguan : penyusunan menu mingguan dari tabel solusi menu harian (susun_menu_mingguan)
+#   7. generate : request /generate lengkap melalui Flask test client (hanya 5 objektif, sesuai website)
+# Setiap tahap diukur untuk 5 dan 17 objektif dan setiap pasangan (tahun, umur) pada dataset AKG
+# Optimasi, populasi evaluasi, dan penyusunan menu mingguan menggunakan seed yang sama pada setiap pengukuran,
+# sidik hasil (hash solusi dan menu mingguan) disimpan untuk memastikan hasil antar commit sama
+# Cache hasil, bank solusi, dan warm-start tidak digunakan, sehingga setiap pengukuran menjalankan tahap secara lengkap
+#
+# Hasil disimpan sebagai JSON pada folder hasil_benchmark dan dapat dibandingkan dengan hasil sebelumnya
+# Perbandingan menggunakan waktu minimal dari beberapa pengukuran (min-of-N), tahap ditandai lebih lambat jika
+# perlambatan melebihi toleransi relatif dan batas absolut (tahap yang sangat cepat mudah terpengaruh noise)
+# Contoh (dari folder Website) :
+#   python benchmark.py
+#   python benchmark.py --generasi 50 --tahap evaluasi_batch optimasi --banding hasil_benchmark/hasil_20260101-120000_abc1234.json
+
+import argparse # Library untuk membaca argumen perintah
+import contextlib   # Library untuk menyembunyikan output selama pengukuran
+import hashlib  # Library untuk menghitung sidik hasil
+import io
+import json # Library untuk menyimpan hasil benchmark
+import os   # Library untuk environment variable dan folder hasil
+import platform # Library untuk mencatat keterangan mesin
+import subprocess   # Library untuk membaca commit git
+import sys
+import time # Library untuk mengukur waktu
+
+# /generate menunggu sampai menu selesai disusun (tanpa antrian), sehingga waktu /generate adalah waktu penyusunan menu sebenarnya
+os.environ.setdefault("MODE_ANTRIAN", "0")
+
+import numpy as np  # Library untuk fungsi matematika
+import pandas as pd # Library untuk mengolah dataset
+import pymoo
+
+import app as web   # Website (app.py) beserta dataset yang sudah dimuat
+from planner import Meal_Planning_Batch, ADA_NUMBA
+from planner.pemanasan import ref_dirs_objektif
+from planner.metrik import siapkan_logger
+
+TAHAP = ["profil", "evaluasi_elementwise", "evaluasi_batch", "evaluasi_jit", "optimasi", "uraikan", "mingguan", "generate"]
+FOLDER_HASIL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hasil_benchmark")
+TOLERANSI = 0.2 # Batas perlambatan relatif sebelum tahap ditandai lebih lambat (0.2 = 20%)
+BATAS_ABSOLUT_MS = 1.0  # Batas perlambatan absolut (milidetik) sebelum tahap ditandai lebih lambat
+ULANG_MIN_BANDING = 3   # Jumlah pengukuran minimal agar waktu minimal cukup stabil untuk dibandingkan
+
+
+# Membuat fungsi untuk menyembunyikan output website selama pengukuran
+def diam():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+# Membuat fungsi untuk mengukur waktu fungsi (milidetik)
+# Fungsi dijalankan satu kali sebelum pengukuran (pemanasan), kecuali pemanasan bernilai False
+def ukur(fungsi, ulang, pemanasan=True):
+    if pemanasan:
+        with diam():
+            hasil = fungsi()
+    waktu = []
+    for _ in range(ulang):
+        with diam():
+            mulai = time.perf_counter()
+            hasil = fungsi()
+            waktu.append((time.perf_counter() - mulai) * 1000)
+    return hasil, {"ulang": ulang, "ms_median": float(np.median(waktu)), "ms_min": float(np.min(waktu)),
+                   "ms_rata": float(np.mean(waktu))}
+
+
+# Membuat fungsi untuk menghitung sidik (hash pendek) dari hasil
+def sidik(nilai):
+    if nilai is None:
+        return None
+    if isinstance(nilai, np.ndarray):
+        data = np.ascontiguousarray(nilai).tobytes()
+    else:
+        data = json.dumps(nilai, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()[:12]
+
+
+# Membuat fungsi untuk membaca commit git saat ini (ditambah "-dirty" jika ada perubahan yang belum di-commit)
+def commit_git():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        berubah = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if berubah else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "tidak-diketahui"
+
+
+# Membuat fungsi untuk menjalankan benchmark satu pasangan (tahun, umur) dan jumlah objektif
+def benchmark_profil(tahun, umur, n_obj, args, catat):
+    kunci = {"n_obj": n_obj, "tahun": tahun, "umur": umur}
+
+    # Profil tanpa alergi
+    (local_data_makanan, profil_akg), stat = ukur(lambda: web.siapkan_profil(umur, tahun, ""), args.ulang)
+    if "profil" in args.tahap:
+        catat("profil", kunci, stat)
+    target = profil_akg.Target_AKG_obj if n_obj == 5 else profil_akg.Target_AKG
+
+    # Populasi acak dengan seed tetap, besar populasi sama dengan jumlah reference direction
+    rng = np.random.default_rng(args.seed)
+    X = rng.integers(0, len(local_data_makanan), size=(len(ref_dirs_objektif(n_obj)), profil_akg.jumlah_n))
+
+    if "evaluasi_elementwise" in args.tahap and n_obj == 5:
+        problem = web.Meal_Planning(target, profil_akg.jumlah_n, profil_akg.n5, umur, local_data_makanan.ke_dataframe())
+        hasil, stat = ukur(lambda: problem.evaluate(X, return_as_dictionary=True), args.ulang_elementwise)
+        catat("evaluasi_elementwise", kunci, stat, sidik=sidik(np.asarray(hasil["F"], dtype=np.float64)))
+
+    for kernel, tahap in (("numpy", "evaluasi_batch"), ("jit", "evaluasi_jit")):
+        if tahap not in args.tahap:
+            continue
+        problem = Meal_Planning_Batch(target, profil_akg.jumlah_n, profil_akg.n5, local_data_makanan, kernel=kernel,
+                                      **dict(zip(("target", "bobot"), profil_akg.target_bobot(target.columns))))
+        hasil, stat = ukur(lambda: problem.evaluate(X, return_as_dictionary=True), args.ulang)
+        catat(tahap, kunci, stat, sidik=sidik(np.asarray(hasil["F"], dtype=np.float64)))
+
+    if not {"optimasi", "uraikan", "mingguan"} & set(args.tahap):
+        return
+
+    # Optimasi lengkap dengan seed tetap (tanpa pemanasan, karena setiap optimasi dimulai dari awal)
+    jalankan = lambda: web.jalankan_optimasi(umur, tahun, "", local_data_makanan, target, profil_akg.jumlah_n, profil_akg.n5,
+                                             profil_akg.ada_susu, batas_waktu=0, batas_evaluasi=0, n_gen=args.generasi,
+                                             simpan_benih=False, seed=args.seed)
+    (X_solusi, F), stat = ukur(jalankan, args.ulang_optimasi, pemanasan=False)
+    if "optimasi" in args.tahap:
+        catat("optimasi", kunci, stat, sidik=sidik(X_solusi), jumlah_solusi=0 if X_solusi is None else len(X_solusi),
+              F_min=None if F is None else np.asarray(F).min(axis=0).round(4).tolist())
+
+    data_solusi, stat = ukur(lambda: web.uraikan_solusi(X_solusi, local_data_makanan, profil_akg), args.ulang)
+    if "uraikan" in args.tahap:
+        catat("uraikan", kunci, stat, jumlah_menu_harian=len(data_solusi))
+
+    # Optimasi singkat (misalnya --generasi kecil) dapat tidak menemukan solusi feasible,
+    # waktu penyusunan menu mingguan dari tabel solusi kosong tidak dicatat karena tidak sebanding
+    if "mingguan" in args.tahap and len(data_solusi) == 0:
+        print(f"⚠️ mingguan {n_obj:>3} obj {tahun} usia {umur} tidak diukur : optimasi tidak menemukan solusi feasible "
+              f"(coba tambah --generasi)")
+    elif "mingguan" in args.tahap:
+        menu, stat = ukur(lambda: web.susun_menu_mingguan(data_solusi, local_data_makanan, umur, tahun), args.ulang)
+        catat("mingguan", kunci, stat, sidik=sidik(menu))
+
+
+# Membuat fungsi untuk mengukur request /generate lengkap melalui Flask test client
+def benchmark_generate(tahun, umur, args, catat):
+    klien = web.app.test_client()
+    form = {"umur": str(umur), "tahun": str(tahun), "alergi": ""}
+    respon, stat = ukur(lambda: klien.post("/generate", data=form), args.ulang_optimasi, pemanasan=False)
+    catat("generate", {"n_obj": 5, "tahun": tahun, "umur": umur}, stat, status=respon.status_code,
+          menu_ada=b"Sarapan" in respon.data)
+
+
+# Membuat fungsi untuk membandingkan hasil benchmark dengan hasil sebelumnya
+# Waktu minimal (min-of-N) dibandingkan, karena waktu minimal paling sedikit terpengaruh noise dari proses lain
+# Output dari fungsi adalah jumlah tahap yang lebih lambat dari toleransi relatif dan batas absolut
+def banding(hasil, lokasi_lama, toleransi=TOLERANSI, batas_absolut=BATAS_ABSOLUT_MS):
+    with open(lokasi_lama, encoding="utf-8") as berkas:
+        lama = json.load(berkas)
+    kunci = lambda b: (b["tahap"], b["n_obj"], b["tahun"], b["umur"])
+    baris_lama = {kunci(b): b for b in lama["hasil"]}
+
+    print(f"\nPerbandingan dengan {os.path.basename(lokasi_lama)} (commit {lama['meta'].get('commit')})")
+    lambat = 0
+    for b in hasil["hasil"]:
+        l = baris_lama.get(kunci(b))
+        if l is None:
+            continue
+        rasio = b["ms_min"] / l["ms_min"] if l["ms_min"] > 0 else float("inf")
+        tanda = []
+        if rasio > 1 + toleransi and b["ms_min"] - l["ms_min"] > batas_absolut:
+            tanda.append("LEBIH LAMBAT")
+            lambat += 1
+        if min(b["ulang"], l["ulang"]) < ULANG_MIN_BANDING:
+            tanda.append(f"({min(b['ulang'], l['ulang'])}x, kurang stabil)")
+        if b.get("sidik") != l.get("sidik"):
+            tanda.append("HASIL BERBEDA")
+        print(f"{b['tahap']:<22}{b['n_obj']:>3} obj {b['tahun']} usia {b['umur']} : "
+              f"min {l['ms_min']:10.2f} ms -> {b['ms_min']:10.2f} ms ({rasio:5.2f}x) {' '.join(tanda)}")
+    return lambat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline penyusunan menu")
+    parser.add_argument("--tahap", nargs="+", choices=TAHAP, default=TAHAP, help="Tahap yang diukur")
+    parser.add_argument("--objektif", nargs="+", type=int, choices=[5, 17], default=[5, 17], help="Jumlah objektif")
+    parser.add_argument("--tahun", nargs="+", type=int, help="Tahun standar AKG (default seluruh tahun pada dataset AKG)")
+    parser.add_argument("--umur", nargs="+", type=int, help="Usia anak (default seluruh usia pada dataset AKG)")
+    parser.add_argument("--generasi", type=int, default=100, help="Jumlah generasi optimasi")
+    parser.add_argument("--seed", type=int, default=1, help="Seed optimasi, populasi evaluasi, dan menu mingguan")
+    parser.add_argument("--ulang", type=int, default=20, help="Jumlah pengukuran tahap cepat")
+    parser.add_argument("--ulang-elementwise", type=int, default=ULANG_MIN_BANDING, help="Jumlah pengukuran evaluasi elementwise")
+    parser.add_argument("--ulang-optimasi", type=int, default=ULANG_MIN_BANDING, help="Jumlah pengukuran optimasi dan /generate")
+    parser.add_argument("--banding", help="File hasil benchmark sebelumnya untuk dibandingkan")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI, help="Batas perlambatan relatif sebelum ditandai (0.2 = 20%%)")
+    parser.add_argument("--batas-absolut", type=float, default=BATAS_ABSOLUT_MS,
+                        help="Batas perlambatan absolut (milidetik) sebelum ditandai")
+    parser.add_argument("--keluaran", default=FOLDER_HASIL, help="Folder hasil benchmark")
+    args = parser.parse_args(argv)
+
+    # Seluruh tahap menggunakan seed yang sama, tanpa cache hasil, bank solusi, warm-start, dan anggaran waktu optimasi
+    web.SEED_OPTIMASI = args.seed
+    web.N_GENERASI = args.generasi
+    web.cache_hasil = None
+    web.bank_solusi = None
+    web.WARM_START = False
+    web.BATAS_WAKTU_OPTIMASI = 0
+    web.BATAS_EVALUASI_OPTIMASI = 0
+    siapkan_logger(False)   # Log metrik setiap request /generate tidak ditampilkan
+
+    pasangan = sorted({(int(t), int(u)) for t, u in zip(web.data_AKG["Tahun"], web.data_AKG["umur"])})
+    pasangan = [(t, u) for t, u in pasangan if (not args.tahun or t in args.tahun) and (not args.umur or u in args.umur)]
+
+    hasil = {"meta": {"commit": commit_git(), "waktu": time.strftime("%Y-%m-%d %H:%M:%S"),
+                      "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+                      "pymoo": pymoo.__version__, "numba": ADA_NUMBA, "mesin": platform.platform(),
+                      "jumlah_cpu": os.cpu_count(), "argumen": {k: v for k, v in vars(args).items() if k != "keluaran"}},
+             "hasil": []}
+
+    def catat(tahap, kunci, stat, **keterangan):
+        baris = {"tahap": tahap, **kunci, **stat, **keterangan}
+        hasil["hasil"].append(baris)
+        print(f"{tahap:<22}{kunci['n_obj']:>3} obj {kunci['tahun']} usia {kunci['umur']} : "
+              f"median {stat['ms_median']:10.2f} ms, min {stat['ms_min']:10.2f} ms ({stat['ulang']}x)"
+              + (f" sidik {keterangan['sidik']}" if keterangan.get("sidik") else ""))
+
+    # Pemanasan sekali (import pymoo, kompilasi kernel, dan pemanggilan pertama pymoo) sebelum pengukuran
+    with diam():
+        web.mulai_pemanasan(latar=False)
+
+    waktu_mulai = time.perf_counter()
+    for n_obj in args.objektif:
+        for tahun, umur in pasangan:
+            benchmark_profil(tahun, umur, n_obj, args, catat)
+    if "generate" in args.tahap and 5 in args.objektif:
+        for tahun, umur in pasangan:
+            benchmark_generate(tahun, umur, args, catat)
+    print(f"Benchmark selesai dalam {time.perf_counter() - waktu_mulai:.1f} detik")
+
+    # Menyimpan hasil benchmark
+    os.makedirs(args.keluaran, exist_ok=True)
+    lokasi = os.path.join(args.keluaran, f"hasil_{time.strftime('%Y%m%d-%H%M%S')}_{hasil['meta']['commit']}.json")
+    with open(lokasi, "w", encoding="utf-8") as berkas:
+        json.dump(hasil, berkas, indent=1)
+    print(f"✅ Hasil benchmark disimpan ke {lokasi}")
+
+    # Membandingkan dengan hasil sebelumnya, exit code 1 jika ada tahap yang lebih lambat dari toleransi
+    if args.banding:
+        lambat = banding(hasil, args.banding, args.toleransi, args.batas_absolut)
+        print(f"{lambat} tahap lebih lambat dari toleransi {args.toleransi:.0%} dan {args.batas_absolut:g} ms")
+        return 1 if lambat else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+# Paket planner menyimpan komponen optimasi menu makanan yang digunakan bersama oleh
+# website (Website/app.py) dan kode optimasi (Kode_Obj5.py dan Kode_Obj17.py)
+
+from .fitness import (
+    KOLOM_NUTRISI_5, KOLOM_NUTRISI_17, BOBOT_NUTRISI, JENIS_MAKANAN, ADA_NUMBA,
+    hitung_fitness, hitung_fitness_jit, buat_bobot, pilih_kernel,
+)
+from .katalog import KatalogMakanan
+from .problem import Meal_Planning_Batch
+from .slot import Meal_Planning_Slot, susun_slot
+from .cache import CacheFitness, EliminasiDuplikatMultiset, CacheHasil
@@ -0,0 +1,84 @@
+# MODUL INDEKS ALERGI MAKANAN
+
+# Sebelumnya, setiap request menggabungkan input alergi menjadi satu regex dan mencarinya pada kolom "Nama Makanan" dan "Tipe"
+# seluruh data makanan (str.lower().str.contains), kemudian menyalin baris makanan yang tersisa
+# Input alergi tidak di-escape, sehingga karakter seperti "(" membuat regex error dan input kosong ("udang, ") cocok dengan seluruh makanan
+# Modul ini membangun indeks terbalik kata -> makanan satu kali saat data makanan dimuat
+#   1. Nama dan tipe makanan dipecah menjadi kata (huruf kecil), setiap kata menyimpan bitmask makanan yang mengandung kata tersebut
+#   2. Alergi yang berupa satu kata dicocokkan sebagai teks biasa (bukan regex) dengan daftar kata pada indeks,
+#      bitmask seluruh kata yang mengandung alergi tersebut digabungkan (OR)
+#   3. Alergi yang terdiri dari beberapa kata dicocokkan sebagai teks biasa dengan nama dan tipe makanan tanpa duplikat
+#   4. Makanan yang diizinkan adalah bitmask seluruh makanan dikurangi bitmask alergi (AND NOT),
+#      termasuk aturan snack kacang untuk anak usia 1 tahun yang juga disiapkan satu kali
+# Hasil pencocokan alergi yang sering digunakan disimpan pada cache LRU (UKURAN_CACHE_ALERGI alergi), sehingga alergi yang sama tidak dicocokkan ulang
+# Ukuran cache dibatasi, karena alergi berasal dari input form /generate
+
+import re   # Library untuk memecah nama makanan menjadi kata
+from functools import lru_cache # Library untuk cache hasil pencocokan alergi
+
+import numpy as np  # Library untuk fungsi matematika
+
+from .fitness import KODE_SNACK
+from .benih import normalisasi_alergi
+
+POLA_KATA = re.compile(r"\w+")  # Kata adalah rangkaian huruf, angka, atau garis bawah
+UKURAN_CACHE_ALERGI = 256   # Jumlah maksimal alergi yang hasil pencocokannya disimpan
+
+
+# Indeks terbalik alergi makanan dari katalog makanan (KatalogMakanan)
+# Bitmask disimpan sebagai array uint8 hasil np.packbits (1 bit per makanan sesuai urutan katalog)
+class IndeksAlergi:
+    def __init__(self, katalog):
+        self.n = len(katalog)
+        nama = [str(t).lower() for t in katalog.nama]
+        tipe = [str(t).lower() for t in list(katalog.daftar_tipe) + [""]]
+        tipe_makanan = [tipe[k] for k in katalog.kode_tipe]
+
+        # Indeks terbalik kata -> posisi makanan, dari kata pada nama dan tipe makanan
+        posisi_kata = {}
+        for i, teks in enumerate(zip(nama, tipe_makanan)):
+            for kata in set(POLA_KATA.findall(teks[0])) | set(POLA_KATA.findall(teks[1])):
+                posisi_kata.setdefault(kata, []).append(i)
+        self.kata = {kata: self._bitmask(posisi) for kata, posisi in posisi_kata.items()}
+
+        # Nama dan tipe makanan tanpa duplikat untuk alergi yang terdiri dari beberapa kata
+        self.teks = {}
+        for i, teks in enumerate(nama + tipe_makanan):
+            self.teks.setdefault(teks, []).append(i % self.n)
+        self.teks = {teks: self._bitmask(posisi) for teks, posisi in self.teks.items()}
+
+        # Bitmask seluruh makanan dan bitmask snack kacang (jenis "Snack" dengan tipe "kacang")
+        self.semua = np.packbits(np.ones(self.n, dtype=bool))
+        kacang = np.array([t == "kacang" for t in tipe], dtype=bool)[katalog.kode_tipe]
+        self.snack_kacang = np.packbits((katalog.kode_jenis == KODE_SNACK) & kacang)
+
+        # Cache LRU per indeks (thread-safe), alergi yang paling lama tidak digunakan dibuang saat cache penuh
+        self.cocok = lru_cache(maxsize=UKURAN_CACHE_ALERGI)(self._cocok)
+
+    # Membuat fungsi untuk membuat bitmask dari posisi makanan
+    def _bitmask(self, posisi):
+        tanda = np.zeros(self.n, dtype=bool)
+        tanda[posisi] = True
+        return np.packbits(tanda)
+
+    # Membuat fungsi untuk mencari bitmask makanan yang mengandung satu alergi (huruf kecil, tanpa spasi di awal/akhir)
+    # Fungsi dipanggil melalui self.cocok (dengan cache)
+    def _cocok(self, alergi):
+        if POLA_KATA.fullmatch(alergi):
+            daftar = [mask for kata, mask in self.kata.items() if alergi in kata]
+        else:
+            daftar = [mask for teks, mask in self.teks.items() if alergi in teks]
+        hasil = np.bitwise_or.reduce(daftar) if daftar else np.zeros_like(self.semua)
+        hasil.setflags(write=False)  # Bitmask pada cache digunakan bersama oleh seluruh request
+        return hasil
+
+    # Membuat fungsi untuk menentukan makanan yang diizinkan sesuai input alergi dan usia anak
+    # Output dari fungsi adalah array boolean (jumlah makanan), True jika makanan diizinkan
+    def diizinkan(self, input_alergi_str, umur=None):
+        izin = self.semua
+        for alergi in normalisasi_alergi(input_alergi_str):
+            izin = izin & ~self.cocok(alergi)
+        # Anak usia 1 tahun tidak boleh makan snack kacang
+        if umur == 1:
+            izin = izin & ~self.snack_kacang
+        return np.unpackbits(izin, count=self.n).astype(bool)
@@ -0,0 +1,173 @@
+# MODUL ANTRIAN PEKERJAAN PENYUSUNAN MENU
+
+# Penyusunan menu mingguan memakan waktu lama, sehingga request /generate yang menunggu optimasi selesai
+# menahan worker Flask dan dapat terputus karena timeout browser atau proxy
+# AntrianPekerjaan menjalankan penyusunan menu di latar belakang
+#   1. Request hanya memasukkan pekerjaan ke antrian dan langsung mendapatkan id pekerjaan
+#   2. Pekerjaan dijalankan oleh sejumlah thread worker yang terbatas, sehingga jumlah optimasi yang berjalan bersamaan dibatasi
+#   3. Status dan hasil pekerjaan dapat dicek dengan id pekerjaan
+#   4. Pekerjaan yang sudah selesai dihapus setelah melewati umur maksimal (TTL)
+# Pekerjaan disimpan pada memori proses website, sehingga antrian hanya dapat digunakan jika website berjalan pada satu proses
+# Pada server dengan beberapa proses (misalnya gunicorn -w 4), request status dan hasil pekerjaan dapat diterima proses lain
+# yang tidak menyimpan pekerjaan tersebut (404), jumlah_proses_website digunakan untuk mendeteksinya
+
+import os   # Library untuk membaca environment variable
+import secrets  # Library untuk membuat id pekerjaan
+import shlex    # Library untuk memecah argumen GUNICORN_CMD_ARGS
+import sys  # Library untuk membaca argumen perintah server
+import threading    # Library untuk mengunci data pekerjaan yang digunakan bersama oleh beberapa request
+import time # Library untuk menghitung waktu pekerjaan
+import traceback    # Library untuk menampilkan error pada pekerjaan
+from concurrent.futures import ThreadPoolExecutor   # Library untuk membuat thread worker
+
+# Status pekerjaan
+MENUNGGU = "menunggu"
+BERJALAN = "berjalan"
+SELESAI = "selesai"
+GAGAL = "gagal"
+
+
+# Membuat fungsi untuk menghitung jumlah proses website yang melayani request
+#   1. N_PROSES_WEBSITE (environment variable) digunakan jika diberikan, misalnya untuk server selain gunicorn
+#   2. Pada gunicorn, jumlah worker dibaca dari argumen -w/--workers pada perintah atau GUNICORN_CMD_ARGS,
+#      kemudian dari WEB_CONCURRENCY (default jumlah worker gunicorn)
+#   3. Selain itu, website dianggap berjalan pada satu proses (app.run, flask run)
+# Jumlah worker yang diatur pada file konfigurasi gunicorn tidak terbaca, sehingga perlu diberikan melalui N_PROSES_WEBSITE
+def jumlah_proses_website(argv=None, environ=None, gunicorn=None):
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    gunicorn = "gunicorn" in sys.modules if gunicorn is None else gunicorn
+    if environ.get("N_PROSES_WEBSITE"):
+        return int(environ["N_PROSES_WEBSITE"])
+    if not gunicorn:
+        return 1
+
+    jumlah = None
+    for args in (shlex.split(environ.get("GUNICORN_CMD_ARGS", "")), list(argv[1:])):
+        for i, arg in enumerate(args):
+            if arg in ("-w", "--workers") and i + 1 < len(args):
+                nilai = args[i + 1]
+            elif arg.startswith("--workers="):
+                nilai = arg.split("=", 1)[1]
+            elif arg.startswith("-w") and not arg.startswith("--"):
+                nilai = arg[2:]
+            else:
+                continue
+            try:
+                jumlah = int(nilai)  # Argumen terakhir yang digunakan, argumen perintah menimpa GUNICORN_CMD_ARGS
+            except ValueError:
+                pass
+    if jumlah is None:
+        jumlah = int(environ.get("WEB_CONCURRENCY", 1))
+    return jumlah
+
+
+# Data satu pekerjaan pada antrian
+class Pekerjaan:
+    def __init__(self, id_pekerjaan, keterangan=None):
+        self.id = id_pekerjaan
+        self.keterangan = keterangan if keterangan is not None else {}   # Keterangan request (umur, tahun, alergi)
+        self.status = MENUNGGU
+        self.hasil = None   # Output fungsi pekerjaan
+        self.error = None   # Pesan error jika pekerjaan gagal
+        self.info = {}  # Keterangan tambahan yang diisi oleh fungsi pekerjaan
+        self.waktu_masuk = time.time()
+        self.waktu_mulai = None
+        self.waktu_selesai = None
+
+    @property
+    def selesai(self):
+        return self.status in (SELESAI, GAGAL)
+
+
+# Antrian pekerjaan dengan thread worker yang terbatas
+class AntrianPekerjaan:
+    # Input dari fungsi adalah jumlah thread worker, jumlah maksimal pekerjaan yang belum selesai,
+    # dan umur maksimal pekerjaan yang sudah selesai (detik)
+    # Jika jumlah pekerjaan yang belum selesai sudah mencapai batas, maka pekerjaan baru ditolak
+    def __init__(self, n_worker=1, maks_antrian=16, ttl=3600):
+        self.n_worker = n_worker
+        self.maks_antrian = maks_antrian
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=n_worker, thread_name_prefix="pekerjaan-menu")
+        self.data = {}  # id pekerjaan -> Pekerjaan
+        self.urutan = []    # Id pekerjaan yang belum selesai sesuai urutan masuk
+        self.kunci = threading.Lock()
+
+    # Membuat fungsi untuk memasukkan pekerjaan ke antrian
+    # Fungsi pekerjaan dipanggil dengan argumen yang diberikan dan argumen info (dict keterangan tambahan)
+    # Output dari fungsi adalah id pekerjaan, atau None jika antrian penuh
+    def kirim(self, fungsi, *args, keterangan=None, **kwargs):
+        with self.kunci:
+            self._bersihkan()
+            if len(self.urutan) >= self.maks_antrian:
+                return None
+            pekerjaan = Pekerjaan(secrets.token_urlsafe(12), keterangan)
+            self.data[pekerjaan.id] = pekerjaan
+            self.urutan.append(pekerjaan.id)
+        self.executor.submit(self._jalankan, pekerjaan, fungsi, args, kwargs)
+        return pekerjaan.id
+
+    # Membuat fungsi untuk menjalankan pekerjaan pada thread worker
+    def _jalankan(self, pekerjaan, fungsi, args, kwargs):
+        with self.kunci:
+            pekerjaan.status = BERJALAN
+            pekerjaan.waktu_mulai = time.time()
+        try:
+            hasil = fungsi(*args, info=pekerjaan.info, **kwargs)
+            status, error = SELESAI, None
+        except Exception as e:
+            traceback.print_exc()
+            hasil, status, error = None, GAGAL, str(e)
+        with self.kunci:
+            pekerjaan.hasil, pekerjaan.status, pekerjaan.error = hasil, status, error
+            pekerjaan.waktu_selesai = time.time()
+            self.urutan.remove(pekerjaan.id)
+
+    # Membuat fungsi untuk mengambil pekerjaan berdasarkan id, None jika tidak ada atau sudah dihapus
+    def ambil(self, id_pekerjaan):
+        with self.kunci:
+            self._bersihkan()
+            return self.data.get(id_pekerjaan)
+
+    # Membuat fungsi untuk menampilkan status pekerjaan
+    # Posisi adalah jumlah pekerjaan yang masuk lebih dahulu dan belum mulai berjalan
+    def status(self, id_pekerjaan):
+        with self.kunci:
+            self._bersihkan()
+            pekerjaan = self.data.get(id_pekerjaan)
+            if pekerjaan is None:
+                return None
+            sekarang = pekerjaan.waktu_selesai or time.time()
+            posisi = 0
+            if pekerjaan.status == MENUNGGU:
+                posisi = sum(self.data[i].status == MENUNGGU for i in self.urutan[:self.urutan.index(pekerjaan.id)])
+            return {
+                "id": pekerjaan.id,
+                "status": pekerjaan.status,
+                "posisi": posisi,
+                "waktu_tunggu": round((pekerjaan.waktu_mulai or sekarang) - pekerjaan.waktu_masuk, 2),
+                "waktu_proses": round(sekarang - pekerjaan.waktu_mulai, 2) if pekerjaan.waktu_mulai else 0.0,
+                "error": pekerjaan.error,
+                "progres": pekerjaan.info.get("progres"),  # Progres optimasi yang diisi oleh fungsi pekerjaan (jika ada)
+            }
+
+    # Membuat fungsi untuk menghapus pekerjaan yang sudah selesai dan melewati umur maksimal
+    # Fungsi dipanggil saat kunci sudah dipegang
+    def _bersihkan(self):
+        if not self.ttl:
+            return
+        batas = time.time() - self.ttl
+        for id_pekerjaan in [i for i, p in self.data.items() if p.selesai and p.waktu_selesai < batas]:
+            del self.data[id_pekerjaan]
+
+    # Membuat fungsi untuk menampilkan statistik antrian
+    def statistik(self):
+        with self.kunci:
+            jumlah = {MENUNGGU: 0, BERJALAN: 0, SELESAI: 0, GAGAL: 0}
+            for pekerjaan in self.data.values():
+                jumlah[pekerjaan.status] += 1
+            return jumlah
+
+    def __len__(self):
+        return len(self.urutan)
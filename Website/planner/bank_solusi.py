@@ -0,0 +1,82 @@
+# MODUL BANK SOLUSI OPTIMASI
+
+# Tabel AKG hanya terdiri atas 2 tahun standar (2014 dan 2019) dan 5 usia (1 - 5 tahun)
+# Dengan demikian, solusi optimasi dapat dibangun sekali secara offline untuk setiap kombinasi (tahun, umur, ada susu)
+# dan disimpan ke dalam satu file .npz
+#   1. Genom solusi disimpan sebagai id makanan pada data makanan lengkap, beserta nilai objektifnya
+#   2. Sidik data makanan ikut disimpan, sehingga bank yang dibangun dari data makanan lain tidak digunakan
+#   3. Saat request, solusi yang mengandung makanan yang dikeluarkan (alergi) dibuang
+#      dan bank hanya digunakan jika solusi yang tersisa masih cukup
+
+import hashlib  # Library untuk membuat sidik data makanan
+import json # Library untuk menyimpan keterangan bank
+import os   # Library untuk mengecek file bank
+
+import numpy as np  # Library untuk fungsi matematika
+
+
+# Membuat fungsi untuk membuat nama kunci bank dari tahun, umur, dan keadaan ada susu
+def kunci_bank(tahun, umur, ada_susu):
+    return f"{tahun}_{umur}_{'susu' if ada_susu else 'tanpa_susu'}"
+
+
+# Membuat fungsi untuk membuat sidik data makanan
+# Sidik berubah jika nama, jenis, tipe, atau nilai nutrisi makanan pada data makanan berubah
+def sidik_data(data_makanan, kolom_nutrisi):
+    h = hashlib.sha1()
+    for kolom in ("Nama Makanan", "Jenis", "Tipe"):
+        h.update("\x1f".join(data_makanan[kolom].astype(str)).encode("utf-8"))
+    h.update(np.ascontiguousarray(data_makanan[kolom_nutrisi].to_numpy(dtype=np.float64)).tobytes())
+    return h.hexdigest()
+
+
+# Membuat fungsi untuk menyimpan bank solusi ke file .npz
+# Input dari fungsi adalah lokasi file, dict {(tahun, umur, ada_susu): (id_genom, F)}, dan sidik data makanan
+def simpan_bank(lokasi, entri, sidik):
+    array = {}
+    for (tahun, umur, ada_susu), (id_genom, F) in entri.items():
+        k = kunci_bank(tahun, umur, ada_susu)
+        array[k + "_X"] = np.asarray(id_genom, dtype=np.int32)
+        array[k + "_F"] = np.asarray(F, dtype=np.float32)
+    keterangan = {"sidik": sidik, "kunci": [list(k) for k in entri]}
+    array["keterangan"] = np.array(json.dumps(keterangan))
+    np.savez_compressed(lokasi, **array)
+
+
+# Membuat fungsi untuk memuat bank solusi dari file .npz
+# Output dari fungsi adalah dict {(tahun, umur, ada_susu): (id_genom, F)}
+# Jika file tidak ada atau sidik data makanan berbeda, maka output adalah None
+def muat_bank(lokasi, sidik):
+    if not os.path.exists(lokasi):
+        return None
+    with np.load(lokasi) as berkas:
+        keterangan = json.loads(str(berkas["keterangan"]))
+        if keterangan["sidik"] != sidik:
+            print(f"Bank solusi {lokasi} dibangun dari data makanan yang berbeda, bank tidak digunakan")
+            return None
+        bank = {}
+        for tahun, umur, ada_susu in keterangan["kunci"]:
+            k = kunci_bank(tahun, umur, ada_susu)
+            bank[(tahun, umur, bool(ada_susu))] = (berkas[k + "_X"].astype(np.int64), berkas[k + "_F"])
+    return bank
+
+
+# Membuat fungsi untuk mengambil solusi dari bank untuk suatu profil
+# Input dari fungsi adalah bank, kunci (tahun, umur, ada_susu), id makanan pada data makanan lokal, dan jumlah solusi minimal
+# Output dari fungsi adalah indeks makanan solusi pada data makanan lokal,
+# atau None jika profil tidak ada pada bank atau solusi yang tersisa kurang dari jumlah minimal
+def ambil_solusi_bank(bank, kunci, id_lokal, minimal=1):
+    if kunci not in bank:
+        return None
+    id_genom, _ = bank[kunci]
+
+    # Memetakan id makanan ke indeks makanan lokal (-1 jika makanan sudah dikeluarkan)
+    peta = np.full(max(int(id_genom.max()), int(id_lokal.max())) + 1, -1, dtype=np.int64)
+    peta[id_lokal] = np.arange(len(id_lokal))
+    indeks = peta[id_genom]
+
+    # Solusi yang mengandung makanan yang sudah dikeluarkan dibuang
+    indeks = indeks[(indeks >= 0).all(axis=1)]
+    if len(indeks) < minimal:
+        return None
+    return indeks
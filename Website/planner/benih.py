@@ -0,0 +1,118 @@
+# MODUL WARM-START OPTIMASI DARI SOLUSI SEBELUMNYA
+
+# Setiap optimasi dimulai dari populasi acak, walaupun profil (umur, tahun, alergi) yang sama baru saja dioptimasi
+# Modul ini menyimpan genom solusi optimasi sebelumnya dan menggunakannya sebagai benih populasi awal
+#   1. BankBenih menyimpan genom solusi per profil dalam bentuk id makanan pada data makanan lengkap
+#   2. siapkan_benih mengubah genom tersimpan menjadi genom masalah optimasi saat ini,
+#      makanan yang sekarang dikeluarkan (misalnya karena alergi) diganti dengan makanan acak dari jenis yang sama
+#   3. SamplingBenih menggunakan benih sebagai sebagian populasi awal dan sisanya dibangkitkan secara acak
+
+import threading    # Library untuk mengunci bank benih yang digunakan bersama oleh beberapa request
+from collections import OrderedDict # Library untuk menyimpan profil sesuai urutan penggunaan
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.sampling import Sampling    # Import kelas dasar sampling pymoo
+from pymoo.operators.sampling.rnd import FloatRandomSampling    # Import sampling acak bawaan C-TAEA
+
+from .cache import kunci_multiset
+
+KEMIRIPAN_MIN = 0.5 # Kemiripan alergi (Jaccard) minimal agar genom profil lain digunakan sebagai benih
+
+
+# Membuat fungsi untuk mengubah input alergi menjadi tuple alergi yang terurut
+# Input alergi yang kosong atau "none" berarti tidak ada alergi
+def normalisasi_alergi(input_alergi_str):
+    if not input_alergi_str or input_alergi_str.lower() == "none":
+        return ()
+    return tuple(sorted({a.strip().lower() for a in input_alergi_str.split(",") if a.strip()}))
+
+
+# Bank genom solusi optimasi per profil
+# Profil adalah tuple (tahun, umur, alergi) dengan alergi hasil normalisasi_alergi
+class BankBenih:
+    # Input dari fungsi adalah jumlah maksimal profil, jumlah maksimal genom per profil, dan kemiripan alergi minimal profil mirip
+    # Jika bank penuh, maka profil yang paling lama tidak digunakan akan dihapus
+    def __init__(self, maks_profil=64, maks_genom=200, kemiripan_min=KEMIRIPAN_MIN):
+        self.maks_profil = maks_profil
+        self.maks_genom = maks_genom
+        self.kemiripan_min = kemiripan_min
+        self.data = OrderedDict()
+        self.kunci = threading.Lock()
+
+    # Membuat fungsi untuk menyimpan genom solusi (id makanan) suatu profil
+    # Genom dengan kumpulan makanan yang sama hanya disimpan satu kali
+    def simpan(self, profil, id_genom):
+        id_genom = np.asarray(id_genom, dtype=np.int64)
+        _, unik = np.unique(kunci_multiset(id_genom), return_index=True)
+        id_genom = id_genom[np.sort(unik)][:self.maks_genom]
+        with self.kunci:
+            self.data[profil] = id_genom
+            self.data.move_to_end(profil)
+            while len(self.data) > self.maks_profil:
+                self.data.popitem(last=False)
+
+    # Membuat fungsi untuk mengambil genom dari profil yang sama atau paling mirip
+    # Profil mirip adalah profil dengan tahun dan umur yang sama, jumlah makanan per hari yang sama,
+    # dan kumpulan alergi dengan kemiripan (Jaccard) terbesar
+    # Jika kemiripan terbesar di bawah kemiripan_min, maka tidak ada genom yang diambil (optimasi dimulai dari populasi acak)
+    def ambil(self, profil, n_var):
+        tahun, umur, alergi = profil
+        with self.kunci:
+            if profil in self.data and self.data[profil].shape[1] == n_var:
+                self.data.move_to_end(profil)
+                return self.data[profil], 1.0
+
+            terbaik, skor_terbaik = None, -1.0
+            for (t, u, a), id_genom in reversed(self.data.items()):
+                if t != tahun or u != umur or id_genom.shape[1] != n_var:
+                    continue
+                gabungan = set(a) | set(alergi)
+                skor = len(set(a) & set(alergi)) / len(gabungan) if gabungan else 1.0
+                if skor > skor_terbaik:
+                    terbaik, skor_terbaik = id_genom, skor
+            if skor_terbaik < self.kemiripan_min:
+                return None, skor_terbaik
+            return terbaik, skor_terbaik
+
+    def __len__(self):
+        return len(self.data)
+
+
+# Membuat fungsi untuk mengubah genom tersimpan (id makanan) menjadi genom masalah optimasi saat ini
+# Input dari fungsi adalah genom id makanan, masalah optimasi, dan kode jenis makanan pada data makanan lengkap
+def siapkan_benih(id_genom, problem, kode_jenis_lengkap, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+
+    # Memetakan id makanan ke indeks makanan pada data makanan masalah optimasi (-1 jika makanan dikeluarkan)
+    peta = np.full(len(kode_jenis_lengkap), -1, dtype=np.int64)
+    peta[problem.id_makanan] = np.arange(len(problem.id_makanan))
+    indeks = peta[id_genom]
+
+    # Makanan yang dikeluarkan diganti dengan makanan acak dari jenis yang sama
+    # Jika tidak ada makanan dari jenis tersebut, maka genom dibuang
+    dibuang = np.zeros(len(indeks), dtype=bool)
+    for i, j in zip(*np.nonzero(indeks < 0)):
+        sejenis = np.flatnonzero(problem.kode_jenis == kode_jenis_lengkap[id_genom[i, j]])
+        if len(sejenis) == 0:
+            dibuang[i] = True
+            continue
+        indeks[i, j] = sejenis[rng.integers(0, len(sejenis))]
+
+    if dibuang.all():
+        return None
+    return problem.dari_indeks(indeks[~dibuang], rng)
+
+
+# Sampling populasi awal dengan benih dari solusi optimasi sebelumnya
+# Benih digunakan maksimal sebanyak porsi dari populasi, sisanya dibangkitkan dengan sampling dasar
+class SamplingBenih(Sampling):
+    def __init__(self, benih, sampling_dasar=None, porsi=0.5):
+        super().__init__()
+        self.benih = benih
+        self.sampling_dasar = sampling_dasar if sampling_dasar is not None else FloatRandomSampling()
+        self.porsi = porsi
+
+    def _do(self, problem, n_samples, *args, random_state=None, **kwargs):
+        benih = self.benih[:int(n_samples * self.porsi)]
+        X_acak = self.sampling_dasar.do(problem, n_samples - len(benih), random_state=random_state).get("X")
+        return np.vstack([benih.astype(X_acak.dtype), X_acak])
@@ -0,0 +1,166 @@
+# MODUL CACHE FITNESS DAN ELIMINASI DUPLIKAT
+
+# Nilai objektif dan constraint pada Meal_Planning hanya bergantung pada kumpulan makanan yang dipilih
+# Urutan makanan di dalam calon solusi tidak mempengaruhi hasil evaluasi
+# Dengan demikian, calon solusi dapat dikenali dengan genom integer yang sudah diurutkan
+#   1. CacheFitness menyimpan hasil evaluasi berdasarkan genom terurut, dengan batas ukuran (LRU)
+#   2. EliminasiDuplikatMultiset membuang calon solusi dengan kumpulan makanan yang sama dari populasi
+# Selain itu, CacheHasil menyimpan hasil optimasi (tabel solusi menu harian) per profil request dengan batas ukuran dan umur (TTL)
+
+import threading    # Library untuk mengunci cache yang digunakan bersama oleh beberapa request
+import time # Library untuk menghitung umur data pada cache
+from collections import OrderedDict # Library untuk menyimpan cache sesuai urutan penggunaan
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.duplicate import DuplicateElimination   # Import eliminasi duplikat pymoo
+
+
+# Membuat fungsi untuk mengubah populasi menjadi kunci yang tidak bergantung pada urutan makanan
+# Calon solusi dibulatkan ke bawah menjadi indeks makanan, kemudian diurutkan
+def kunci_multiset(X):
+    indeks = np.sort(np.asarray(X).astype(np.int64), axis=1)
+    return [baris.tobytes() for baris in indeks]
+
+
+# Cache hasil evaluasi calon solusi
+class CacheFitness:
+    # Input dari fungsi adalah jumlah maksimal calon solusi yang disimpan
+    # Jika cache penuh, maka calon solusi yang paling lama tidak digunakan akan dihapus
+    def __init__(self, maks_ukuran=50000):
+        self.maks_ukuran = maks_ukuran
+        self.data = OrderedDict()
+        self.hit = 0    # Jumlah evaluasi yang diambil dari cache
+        self.miss = 0   # Jumlah evaluasi yang benar-benar dihitung
+
+    # Membuat fungsi untuk mengevaluasi populasi dengan memanfaatkan cache
+    # Fungsi hitung menerima matriks indeks makanan dan mengembalikan F dan G
+    def evaluasi(self, indeks, hitung):
+        kunci = kunci_multiset(indeks)
+        hasil = [None] * len(kunci)
+        belum_ada = OrderedDict()   # Calon solusi yang belum ada di cache beserta posisinya pada populasi
+
+        # Mengambil hasil evaluasi yang sudah tersimpan di cache
+        for i, k in enumerate(kunci):
+            nilai = self.data.get(k)
+            if nilai is not None:
+                self.data.move_to_end(k)
+                hasil[i] = nilai
+                self.hit += 1
+            else:
+                belum_ada.setdefault(k, []).append(i)
+
+        # Menghitung calon solusi yang belum ada di cache
+        # Calon solusi yang sama di dalam satu populasi hanya dihitung satu kali
+        if belum_ada:
+            wakil = [posisi[0] for posisi in belum_ada.values()]
+            F, G = hitung(indeks[wakil])
+            for j, (k, posisi) in enumerate(belum_ada.items()):
+                nilai = (F[j], G[j])
+                self.simpan(k, nilai)
+                for i in posisi:
+                    hasil[i] = nilai
+                self.miss += 1
+                self.hit += len(posisi) - 1
+
+        F = np.array([h[0] for h in hasil])
+        G = np.array([h[1] for h in hasil])
+        return F, G
+
+    # Membuat fungsi untuk menyimpan hasil evaluasi ke cache
+    def simpan(self, k, nilai):
+        self.data[k] = nilai
+        self.data.move_to_end(k)
+        # Menghapus calon solusi yang paling lama tidak digunakan jika cache penuh
+        while len(self.data) > self.maks_ukuran:
+            self.data.popitem(last=False)
+
+    # Membuat fungsi untuk menampilkan statistik cache
+    def statistik(self):
+        total = self.hit + self.miss
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "total": total,
+            "rasio_hit": self.hit / total if total else 0.0,
+            "ukuran": len(self.data),
+        }
+
+
+# Eliminasi duplikat berdasarkan kumpulan makanan pada calon solusi
+# Calon solusi dianggap sama jika memiliki kumpulan indeks makanan yang sama, tanpa melihat urutannya
+# Jika genom tidak langsung berisi indeks makanan (misalnya enkode slot), maka fungsi ke_indeks dari masalah optimasi perlu diberikan
+class EliminasiDuplikatMultiset(DuplicateElimination):
+    def __init__(self, ke_indeks=None):
+        super().__init__()
+        self.ke_indeks = ke_indeks
+
+    # Membuat fungsi untuk membentuk kunci dari populasi
+    def _kunci(self, pop):
+        X = pop.get("X")
+        return kunci_multiset(self.ke_indeks(X) if self.ke_indeks is not None else X)
+
+    def _do(self, pop, other, is_duplicate):
+        terlihat = set()
+        # Kumpulan makanan yang sudah ada pada populasi pembanding
+        if other is not None:
+            terlihat.update(self._kunci(other))
+
+        # Menandai calon solusi yang kumpulan makanannya sudah pernah muncul
+        for i, k in enumerate(self._kunci(pop)):
+            if k in terlihat:
+                is_duplicate[i] = True
+            else:
+                terlihat.add(k)
+        return is_duplicate
+
+
+# Cache hasil optimasi per profil request
+# Data yang disimpan lebih lama dari ttl (detik) dianggap kedaluwarsa dan dihapus saat diambil
+# Jika cache penuh, maka data yang paling lama tidak digunakan akan dihapus
+class CacheHasil:
+    def __init__(self, maks_ukuran=32, ttl=3600):
+        self.maks_ukuran = maks_ukuran
+        self.ttl = ttl
+        self.data = OrderedDict()   # kunci -> (waktu simpan, nilai)
+        self.kunci = threading.Lock()
+        self.hit = 0    # Jumlah request yang diambil dari cache
+        self.miss = 0   # Jumlah request yang tidak ada di cache
+        self.kedaluwarsa = 0    # Jumlah data yang dihapus karena kedaluwarsa
+        self.dibuang = 0    # Jumlah data yang dihapus karena cache penuh
+
+    # Membuat fungsi untuk mengambil data dari cache, None jika tidak ada atau kedaluwarsa
+    def ambil(self, k):
+        with self.kunci:
+            isi = self.data.get(k)
+            if isi is not None and self.ttl and time.time() - isi[0] > self.ttl:
+                del self.data[k]
+                self.kedaluwarsa += 1
+                isi = None
+            if isi is None:
+                self.miss += 1
+                return None
+            self.data.move_to_end(k)
+            self.hit += 1
+            return isi[1]
+
+    # Membuat fungsi untuk menyimpan data ke cache
+    def simpan(self, k, nilai):
+        with self.kunci:
+            self.data[k] = (time.time(), nilai)
+            self.data.move_to_end(k)
+            while len(self.data) > self.maks_ukuran:
+                self.data.popitem(last=False)
+                self.dibuang += 1
+
+    # Membuat fungsi untuk menampilkan statistik cache
+    def statistik(self):
+        total = self.hit + self.miss
+        return {
+            "hit": self.hit,
+            "miss": self.miss,
+            "total": total,
+            "rasio_hit": self.hit / total if total else 0.0,
+            "ukuran": len(self.data),
+            "kedaluwarsa": self.kedaluwarsa,
+            "dibuang": self.dibuang,
+        }
@@ -0,0 +1,123 @@
+# MODUL SNAPSHOT DATASET
+
+# Membaca dataset AKG dan dataset makanan dari file Excel (openpyxl) memakan sebagian besar waktu mulai program
+# Modul ini menyimpan dataset yang sudah dibaca ke dalam snapshot biner (.npz) di samping file Excel
+#   1. Setiap kolom disimpan sebagai array numpy (angka atau teks), tanpa pickle
+#   2. Skema (urutan kolom, tipe data kolom, dan keterangan file Excel sumber) disimpan sebagai JSON di dalam snapshot
+#   3. Snapshot dibangun ulang jika file Excel berubah
+#      Perubahan dicek dari waktu modifikasi dan ukuran file, jika berbeda maka dicek dengan hash isi file,
+#      sehingga file yang hanya disentuh (misalnya setelah git checkout) tidak membuat snapshot dibangun ulang
+
+import hashlib  # Library untuk menghitung hash file Excel
+import json # Library untuk menyimpan skema snapshot
+import os   # Library untuk mengecek file
+import time # Library untuk menghitung waktu baca dataset
+
+import numpy as np  # Library untuk fungsi matematika
+import pandas as pd # Library untuk mengolah dataset
+
+VERSI_SNAPSHOT = 1  # Versi format snapshot, snapshot dengan versi berbeda dibangun ulang
+
+
+# Membuat fungsi untuk menentukan lokasi snapshot dari lokasi file Excel
+# Contoh : "AKG.xlsx" -> "AKG.snapshot.npz"
+def lokasi_snapshot(lokasi):
+    return os.path.splitext(lokasi)[0] + ".snapshot.npz"
+
+
+# Membuat fungsi untuk menghitung hash isi file
+def hash_file(lokasi):
+    h = hashlib.sha1()
+    with open(lokasi, "rb") as berkas:
+        for blok in iter(lambda: berkas.read(1 << 20), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+# Membuat fungsi untuk menyimpan dataset ke snapshot
+# Kolom teks yang kosong (NaN) disimpan sebagai teks kosong beserta penanda kosongnya
+def simpan_snapshot(df, lokasi, sumber):
+    array = {}
+    kolom = []
+    for i, nama in enumerate(df.columns):
+        seri = df[nama]
+        if pd.api.types.is_numeric_dtype(seri) or pd.api.types.is_bool_dtype(seri):
+            array[f"k{i}"] = seri.to_numpy()
+            kolom.append({"nama": nama, "tipe": "angka"})
+        else:
+            kosong = seri.isna().to_numpy()
+            array[f"k{i}"] = seri.astype(object).where(~kosong, "").astype(str).to_numpy(dtype=str)
+            if kosong.any():
+                array[f"k{i}_kosong"] = kosong
+            kolom.append({"nama": nama, "tipe": "teks"})
+
+    skema = {"versi": VERSI_SNAPSHOT, "sumber": sumber, "kolom": kolom}
+    array["skema"] = np.array(json.dumps(skema))
+
+    # Snapshot ditulis ke file sementara terlebih dahulu, sehingga proses lain tidak membaca snapshot yang setengah ditulis
+    sementara = f"{lokasi}.{os.getpid()}.tmp"
+    with open(sementara, "wb") as berkas:
+        np.savez(berkas, **array)
+    os.replace(sementara, lokasi)
+
+
+# Membuat fungsi untuk membaca skema snapshot, None jika snapshot tidak ada atau rusak
+def baca_skema(lokasi):
+    if not os.path.exists(lokasi):
+        return None
+    try:
+        with np.load(lokasi) as berkas:
+            return json.loads(str(berkas["skema"]))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# Membuat fungsi untuk memuat dataset dari snapshot
+def muat_snapshot(lokasi, skema):
+    data = {}
+    with np.load(lokasi) as berkas:
+        for i, kol in enumerate(skema["kolom"]):
+            nilai = berkas[f"k{i}"]
+            if kol["tipe"] == "teks":
+                seri = pd.Series(nilai, dtype="str")
+                if f"k{i}_kosong" in berkas:
+                    seri[berkas[f"k{i}_kosong"]] = np.nan
+                nilai = seri
+            data[kol["nama"]] = nilai
+    return pd.DataFrame(data)
+
+
+# Membuat fungsi untuk membaca dataset Excel melalui snapshot
+# Nama kolom dibersihkan dari spasi di awal/akhir sebelum disimpan, sehingga tidak perlu dibersihkan lagi setelah dibaca
+# Jika snapshot tidak dapat ditulis (misalnya folder read-only), maka dataset tetap dibaca dari Excel
+def baca_dataset(lokasi, cetak=True):
+    waktu = time.perf_counter()
+    snapshot = lokasi_snapshot(lokasi)
+    stat = os.stat(lokasi)
+    sumber = {"nama": os.path.basename(lokasi), "mtime_ns": stat.st_mtime_ns, "ukuran": stat.st_size}
+
+    skema = baca_skema(snapshot)
+    if skema is not None and skema.get("versi") == VERSI_SNAPSHOT:
+        lama = skema["sumber"]
+        cocok = lama["mtime_ns"] == sumber["mtime_ns"] and lama["ukuran"] == sumber["ukuran"]
+        # Jika waktu modifikasi atau ukuran berbeda, maka isi file dicek dengan hash
+        if not cocok and lama["ukuran"] == sumber["ukuran"]:
+            cocok = lama.get("sha1") == hash_file(lokasi)
+        if cocok:
+            df = muat_snapshot(snapshot, skema)
+            if cetak:
+                print(f"✅ {sumber['nama']} dimuat dari snapshot dalam {(time.perf_counter() - waktu) * 1000:.1f} ms")
+            return df
+
+    # Snapshot belum ada atau file Excel berubah, dataset dibaca dari Excel dan snapshot dibangun ulang
+    df = pd.read_excel(lokasi)
+    df.columns = df.columns.str.strip()
+    sumber["sha1"] = hash_file(lokasi)
+    try:
+        simpan_snapshot(df, snapshot, sumber)
+        keterangan = f"snapshot disimpan ke {os.path.basename(snapshot)}"
+    except OSError as e:
+        keterangan = f"snapshot tidak dapat disimpan ({e})"
+    if cetak:
+        print(f"✅ {sumber['nama']} dibaca dari Excel dalam {(time.perf_counter() - waktu) * 1000:.1f} ms, {keterangan}")
+    return df
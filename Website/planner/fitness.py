@@ -0,0 +1,154 @@
+# MODUL PERHITUNGAN FITNESS MENU MAKANAN
+
+# Modul ini menyimpan perhitungan nilai objektif (F) dan constraint (G) untuk seluruh populasi sekaligus
+#   1. Data nutrisi makanan diubah sekali menjadi matriks numpy
+#   2. Pembobotan objektif diubah sekali menjadi vektor bobot
+#   3. Jenis makanan diubah sekali menjadi array kode jenis
+# Terdapat dua kernel perhitungan
+#   1. "numpy" : perhitungan dengan operasi array numpy
+#   2. "jit" : perhitungan dengan loop yang dikompilasi oleh Numba (njit), jika Numba terpasang
+# Kedua kernel menerima matriks genom integer (jumlah calon solusi x jumlah makanan per hari)
+# dan dapat digunakan untuk kolom nutrisi 5 objektif maupun 17 objektif
+
+import numpy as np  # Library untuk fungsi matematika
+
+# Numba bersifat opsional
+# Jika Numba tidak terpasang, maka kernel "jit" menggunakan perhitungan numpy sebagai pengganti
+try:
+    from numba import njit
+    ADA_NUMBA = True
+except ImportError:
+    njit = None
+    ADA_NUMBA = False
+
+# Kolom nutrisi untuk optimasi 5 objektif (makronutrisi)
+KOLOM_NUTRISI_5 = ["Kalori (kkal)", "Protein (g)", "Lemak (g)", "Karbohidrat (g)", "Serat (g)"]
+
+# Kolom nutrisi untuk optimasi 17 objektif (makronutrisi, mineral, dan vitamin)
+KOLOM_NUTRISI_17 = KOLOM_NUTRISI_5 + [
+    "Kalsium (mg)", "Fosfor (mg)", "Besi (mg)", "Natrium (mg)", "Kalium (mg)", "Tembaga (mg)", "Seng (mg)",
+    "Vitamin A (mcg)", "Vitamin B1 (mg)", "Vitamin B2 (mg)", "Vitamin B3 (mg)", "Vitamin C (mg)"
+]
+
+# Pembobotan objektif, sama dengan pembobotan pada Meal_Planning
+# Nutrisi yang tidak terdapat pada daftar ini memiliki bobot 1
+BOBOT_NUTRISI = {
+    "Kalori (kkal)": 2.0,
+    "Protein (g)": 5.0,
+    "Lemak (g)": 3.0,
+    "Karbohidrat (g)": 2.0,
+    "Serat (g)": 2.0,
+}
+
+# Jenis makanan pada kolom "Jenis" dataset makanan
+# Urutan list ini menjadi kode jenis makanan (Makanan Pokok = 0, Lauk-pauk = 1, dst.)
+# Jenis makanan yang tidak terdapat pada list diberi kode -1
+JENIS_MAKANAN = ["Makanan Pokok", "Lauk-pauk", "Sayur-mayur", "Buah", "Snack", "Susu"]
+KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK, KODE_SUSU = range(len(JENIS_MAKANAN))
+
+
+# Membuat fungsi untuk membentuk vektor bobot dari daftar kolom nutrisi
+def buat_bobot(kolom_nutrisi):
+    return np.array([BOBOT_NUTRISI.get(kol, 1.0) for kol in kolom_nutrisi], dtype=np.float64)
+
+# Membuat fungsi untuk menghitung nilai objektif dan constraint seluruh populasi sekaligus
+# Input indeks adalah matriks integer (jumlah calon solusi x jumlah makanan per hari)
+def hitung_fitness(indeks, matriks, target, bobot, kode_jenis, n5):
+    # Menotalkan nutrisi setiap calon solusi dengan satu kali gather dan sum
+    total = matriks[indeks].sum(axis=1)
+
+    # Menghitung persentase selisih nutrisi terhadap target dan memberikan pembobotan
+    F = (np.abs(total - target) / target) * 100 * bobot
+
+    # Menghitung jumlah tiap jenis makanan pada setiap calon solusi
+    kategori = kode_jenis[indeks]
+    jumlah_pokok = (kategori == KODE_POKOK).sum(axis=1)
+    jumlah_lauk = (kategori == KODE_LAUK).sum(axis=1)
+    jumlah_sayur = (kategori == KODE_SAYUR).sum(axis=1)
+    jumlah_buah = (kategori == KODE_BUAH).sum(axis=1)
+    jumlah_snack = (kategori == KODE_SNACK).sum(axis=1)
+
+    # Menghitung constraint violation, setiap syarat yang tidak terpenuhi menambah nilai 1
+    c1 = ((jumlah_pokok < 2).astype(np.float64)
+          + (jumlah_lauk < 1)
+          + (jumlah_sayur < 1)
+          + (jumlah_buah < 1)
+          + (jumlah_snack > n5))
+    G = c1[:, None]
+
+    return F, G
+
+
+# Perhitungan fitness dengan loop eksplisit, fungsi ini yang akan dikompilasi oleh Numba
+def _hitung_fitness_loop(indeks, matriks, target, bobot, kode_jenis, n5):
+    n_pop, n_var = indeks.shape
+    n_obj = matriks.shape[1]
+    F = np.empty((n_pop, n_obj))
+    G = np.empty((n_pop, 1))
+    total = np.empty(n_obj)
+
+    for p in range(n_pop):
+        # Menotalkan nutrisi dan menghitung jumlah tiap jenis makanan pada calon solusi
+        total[:] = 0.0
+        jumlah_pokok = 0
+        jumlah_lauk = 0
+        jumlah_sayur = 0
+        jumlah_buah = 0
+        jumlah_snack = 0
+        for v in range(n_var):
+            i = indeks[p, v]
+            for k in range(n_obj):
+                total[k] += matriks[i, k]
+            j = kode_jenis[i]
+            if j == KODE_POKOK:
+                jumlah_pokok += 1
+            elif j == KODE_LAUK:
+                jumlah_lauk += 1
+            elif j == KODE_SAYUR:
+                jumlah_sayur += 1
+            elif j == KODE_BUAH:
+                jumlah_buah += 1
+            elif j == KODE_SNACK:
+                jumlah_snack += 1
+
+        # Menghitung persentase selisih nutrisi terhadap target dan memberikan pembobotan
+        for k in range(n_obj):
+            F[p, k] = (abs(total[k] - target[k]) / target[k]) * 100 * bobot[k]
+
+        # Menghitung constraint violation
+        c1 = 0
+        if jumlah_pokok < 2: c1 += 1
+        if jumlah_lauk < 1: c1 += 1
+        if jumlah_sayur < 1: c1 += 1
+        if jumlah_buah < 1: c1 += 1
+        if jumlah_snack > n5: c1 += 1
+        G[p, 0] = c1
+
+    return F, G
+
+# Mendeklarasi kernel yang digunakan
+# Jika Numba tersedia, kernel dikompilasi saat pemanggilan pertama dan disimpan ke cache
+# Kernel melepas GIL (nogil) sehingga dapat berjalan bersamaan pada pool thread
+if ADA_NUMBA:
+    hitung_fitness_jit = njit(cache=True, nogil=True)(_hitung_fitness_loop)
+else:
+    hitung_fitness_jit = hitung_fitness
+
+
+# Daftar kernel yang dapat dipilih pada Meal_Planning_Batch
+KERNEL_FITNESS = {
+    "numpy": hitung_fitness,
+    "jit": hitung_fitness_jit,
+}
+
+# Penanda bahwa peringatan Numba sudah ditampilkan
+_peringatan_numba = []
+
+# Membuat fungsi untuk memilih kernel berdasarkan nama
+def pilih_kernel(nama):
+    if nama not in KERNEL_FITNESS:
+        raise ValueError(f"Kernel fitness '{nama}' tidak dikenal, pilih salah satu dari {list(KERNEL_FITNESS)}")
+    if nama == "jit" and not ADA_NUMBA and not _peringatan_numba:
+        print("⚠️ Numba tidak terpasang, kernel 'jit' menggunakan perhitungan numpy")
+        _peringatan_numba.append(True)    # Peringatan hanya ditampilkan satu kali
+    return KERNEL_FITNESS[nama]
@@ -0,0 +1,145 @@
+# MODUL KATALOG MAKANAN
+
+# Website (Website/app.py) dan kode optimasi (Kode_Obj5.py dan Kode_Obj17.py) sebelumnya mengolah dataframe data makanan
+# masing-masing : memfilter dengan kolom teks, membaca kolom "Jenis" dan "Tipe" sebagai teks, dan menyusun ulang daftar kolom
+# KatalogMakanan dibangun satu kali dari dataset makanan dan digunakan untuk optimasi, penguraian solusi, dan tampilan menu
+#   1. id makanan (int32), kode jenis (int8), dan kode tipe (int16) makanan
+#   2. Matriks nutrisi yang contiguous (jumlah makanan x jumlah kolom nutrisi)
+#   3. Nama makanan, data URT, berat, dan label porsi makanan untuk ditampilkan
+# Katalog difilter dengan array posisi (saring), sehingga data makanan lokal setiap request tidak menyalin dataframe
+
+import numpy as np  # Library untuk fungsi matematika
+import pandas as pd # Library untuk mengolah dataset
+
+from .fitness import KOLOM_NUTRISI_17, JENIS_MAKANAN
+
+
+# Membuat fungsi format porsi makanan untuk menampilkan porsi tiap makanan pada menu
+def format_nama_urt(nama, urt_val, urt_unit, berat_val):
+    # Menggabungkan Nama Makanan dengan Porsi (URT) dan Berat (Gram).
+    # Output: "Nasi Putih (1 Piring, 100 gram)"
+
+    # Gabungkan data nominal dan ukuran URT menjadi satu besaran URT
+    # Contoh : 1 piring
+    besaran_list = []    # deklarasi besaran list untuk menyimpan data URT dan berat
+    if pd.notna(urt_val) and pd.notna(urt_unit):
+        besaran_list.append(f"{urt_val} {urt_unit}")   # tambahkan data URT makanan
+    # Tambahkan kata gram dibelakang berat makanan
+    # Contoh : 100 gram
+    if pd.notna(berat_val):
+        besaran_list.append(f"{round(berat_val, 2)} gram")  #tambahkan berat makanan
+
+    # Menmbentuk kalimat yang menyatakan nama makanan dan besarannya
+    if besaran_list:
+        # Menggabungkan URT dengan berat makanan, dan memisahkannya dengan "koma"
+        return f"{nama} ({', '.join(besaran_list)})"   # Hasil : "Nasi Putih (1 Piring, 100 gram)"
+    return nama # Jika tidak ada besaran, maka kembalikan nama makanan saja
+
+
+# Katalog makanan berbasis array numpy
+class KatalogMakanan:
+    __slots__ = ("id_makanan", "kode_jenis", "kode_tipe", "daftar_tipe", "kolom_nutrisi", "matriks",
+                 "nama", "urt_nominal", "urt_ukuran", "gram", "label", "_posisi_kolom")
+
+    def __init__(self, id_makanan, kode_jenis, kode_tipe, daftar_tipe, kolom_nutrisi, matriks,
+                 nama, urt_nominal, urt_ukuran, gram, label):
+        self.id_makanan = id_makanan
+        self.kode_jenis = kode_jenis
+        self.kode_tipe = kode_tipe
+        self.daftar_tipe = daftar_tipe
+        self.kolom_nutrisi = kolom_nutrisi
+        self.matriks = matriks
+        self.nama = nama
+        self.urt_nominal = urt_nominal
+        self.urt_ukuran = urt_ukuran
+        self.gram = gram
+        self.label = label
+        self._posisi_kolom = {kol: i for i, kol in enumerate(kolom_nutrisi)}
+
+    # Membuat katalog dari dataframe data makanan
+    # Kolom nutrisi yang disimpan adalah seluruh kolom nutrisi (17 kolom) yang tersedia pada data makanan
+    @classmethod
+    def dari_dataframe(cls, data_makanan, kolom_nutrisi=None, dtype=np.float64):
+        if kolom_nutrisi is None:
+            kolom_nutrisi = [kol for kol in KOLOM_NUTRISI_17 if kol in data_makanan.columns]
+        n = len(data_makanan)
+        id_makanan = data_makanan["id_makanan"].to_numpy() if "id_makanan" in data_makanan.columns else np.arange(n)
+        # Kode jenis makanan sesuai urutan JENIS_MAKANAN, jenis makanan yang tidak terdapat pada JENIS_MAKANAN diberi kode -1
+        kode_jenis = np.array([JENIS_MAKANAN.index(j) if j in JENIS_MAKANAN else -1
+                               for j in data_makanan["Jenis"]], dtype=np.int8)
+        kode_tipe, daftar_tipe = pd.factorize(data_makanan["Tipe"]) if "Tipe" in data_makanan.columns else (np.full(n, -1), [])
+
+        # Data URT dan berat disimpan apa adanya, nilai kosong disimpan sebagai None (teks) atau NaN (berat)
+        def kolom_teks(nama):
+            if nama not in data_makanan.columns:
+                return np.full(n, None, dtype=object)
+            return data_makanan[nama].astype(object).where(data_makanan[nama].notna(), None).to_numpy()
+        urt_nominal, urt_ukuran = kolom_teks("URT_nominal"), kolom_teks("URT_ukuran")
+        gram = data_makanan["gram"].to_numpy(dtype=np.float64) if "gram" in data_makanan.columns else np.full(n, np.nan)
+        nama = data_makanan["Nama Makanan"].astype(object).to_numpy()
+        label = np.array([format_nama_urt(*baris) for baris in zip(nama, urt_nominal, urt_ukuran, gram)], dtype=object)
+
+        return cls(id_makanan=np.asarray(id_makanan, dtype=np.int32),
+                   kode_jenis=kode_jenis,
+                   kode_tipe=np.asarray(kode_tipe, dtype=np.int16),
+                   daftar_tipe=tuple(daftar_tipe),
+                   kolom_nutrisi=list(kolom_nutrisi),
+                   matriks=np.ascontiguousarray(data_makanan[kolom_nutrisi].to_numpy(dtype=dtype)),
+                   nama=nama, urt_nominal=urt_nominal, urt_ukuran=urt_ukuran, gram=gram, label=label)
+
+    def __len__(self):
+        return len(self.id_makanan)
+
+    # Membuat katalog baru yang hanya berisi makanan pada posisi (array posisi atau array boolean)
+    # Urutan makanan mengikuti urutan posisi, id makanan tetap menunjuk ke data makanan lengkap
+    def saring(self, posisi):
+        posisi = np.asarray(posisi)
+        if posisi.dtype == bool:
+            posisi = np.flatnonzero(posisi)
+        return KatalogMakanan(self.id_makanan[posisi], self.kode_jenis[posisi], self.kode_tipe[posisi], self.daftar_tipe,
+                              self.kolom_nutrisi, self.matriks[posisi], self.nama[posisi], self.urt_nominal[posisi],
+                              self.urt_ukuran[posisi], self.gram[posisi], self.label[posisi])
+
+    # Membuat fungsi untuk mengambil matriks nutrisi pada kolom tertentu (jumlah makanan x jumlah kolom)
+    def nutrisi(self, kolom):
+        kolom = list(kolom)
+        if kolom == self.kolom_nutrisi:
+            return self.matriks
+        return np.ascontiguousarray(self.matriks[:, [self._posisi_kolom[kol] for kol in kolom]])
+
+    # Membuat fungsi untuk mencari posisi makanan dengan kode jenis tertentu
+    def posisi_jenis(self, kode):
+        return np.flatnonzero(self.kode_jenis == kode)
+
+    # Teks jenis dan tipe setiap makanan
+    @property
+    def jenis(self):
+        return np.array(JENIS_MAKANAN, dtype=object)[self.kode_jenis]
+
+    @property
+    def tipe(self):
+        daftar = np.array(list(self.daftar_tipe) + [None], dtype=object)
+        return daftar[self.kode_tipe]
+
+    # Ukuran memori array katalog (byte), teks dihitung dari panjang teks
+    @property
+    def nbytes(self):
+        angka = sum(getattr(self, a).nbytes for a in ("id_makanan", "kode_jenis", "kode_tipe", "matriks", "gram"))
+        teks = sum(len(t or "") for kol in (self.nama, self.urt_nominal, self.urt_ukuran, self.label) for t in kol)
+        return angka + teks
+
+    # Membuat dataframe dari katalog untuk mode evaluasi "elementwise" (Meal_Planning) yang membaca data makanan dengan pandas
+    def ke_dataframe(self):
+        data = {"Nama Makanan": self.nama, "Jenis": self.jenis, "Tipe": self.tipe, "gram": self.gram,
+                "URT_nominal": self.urt_nominal, "URT_ukuran": self.urt_ukuran}
+        data.update({kol: self.matriks[:, i] for i, kol in enumerate(self.kolom_nutrisi)})
+        data["id_makanan"] = self.id_makanan
+        return pd.DataFrame(data)
+
+
+# Membuat fungsi untuk mengubah data makanan menjadi katalog makanan
+# Katalog makanan dikembalikan apa adanya, dataframe data makanan diubah menjadi katalog
+def sebagai_katalog(data_makanan):
+    if isinstance(data_makanan, KatalogMakanan):
+        return data_makanan
+    return KatalogMakanan.dari_dataframe(data_makanan)
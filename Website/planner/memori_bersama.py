@@ -0,0 +1,91 @@
+# MODUL TABEL MAKANAN PADA MEMORI BERSAMA
+
+# Jika website dijalankan dengan beberapa proses worker, maka setiap proses worker menyimpan salinan data makanan masing-masing
+# Modul ini menyimpan tabel numerik makanan (matriks nutrisi, kode jenis, dan id makanan) satu kali pada
+# multiprocessing.shared_memory, kemudian setiap proses worker melampirkan blok memori yang sama secara read-only
+#   1. TabelBersama dibuat satu kali oleh proses utama dan menghapus blok memori saat proses utama selesai
+#   2. Deskripsi tabel (nama blok, tipe data, ukuran, dan posisi setiap array) dikirim ke proses worker
+#   3. lampirkan membuat array numpy read-only yang langsung membaca blok memori, tanpa menyalin data
+# Dengan demikian, memori setiap proses worker tidak bertambah dengan bertambahnya jumlah worker
+
+import atexit   # Library untuk menghapus blok memori saat proses utama selesai
+import os   # Library untuk mengenali proses pembuat blok memori
+from multiprocessing import shared_memory    # Library untuk membuat blok memori bersama
+
+import numpy as np  # Library untuk fungsi matematika
+
+from .katalog import sebagai_katalog
+
+RATA_BYTE = 64  # Setiap array dimulai pada kelipatan 64 byte
+
+# Blok memori yang sudah dilampirkan pada proses ini, disimpan agar array tidak kehilangan memorinya
+_TERLAMPIR = {}
+
+
+# Tabel array numpy pada satu blok memori bersama
+class TabelBersama:
+    # Input dari fungsi adalah dict nama -> array numpy dan keterangan tambahan (misalnya daftar kolom nutrisi)
+    def __init__(self, array, keterangan=None):
+        # Menghitung posisi setiap array pada blok memori
+        tata_letak, ukuran = [], 0
+        for nama, nilai in array.items():
+            nilai = np.ascontiguousarray(nilai)
+            ukuran = -(-ukuran // RATA_BYTE) * RATA_BYTE
+            tata_letak.append((nama, nilai.dtype.str, nilai.shape, ukuran))
+            ukuran += nilai.nbytes
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(ukuran, 1))
+        self.pid_pembuat = os.getpid()
+        for (nama, dtype, bentuk, posisi), nilai in zip(tata_letak, array.values()):
+            np.ndarray(bentuk, dtype=dtype, buffer=self.shm.buf, offset=posisi)[...] = nilai
+
+        self.deskripsi = {"nama": self.shm.name, "tata_letak": tata_letak, "keterangan": keterangan or {}}
+        self.array = _buat_array(self.shm, tata_letak)
+        atexit.register(self.tutup)
+
+    # Membuat fungsi untuk menghapus blok memori, hanya dilakukan oleh proses pembuat
+    def tutup(self):
+        if self.shm is None or os.getpid() != self.pid_pembuat:
+            return
+        self.array = None
+        # Blok memori tetap dihapus walaupun masih ada array yang menggunakannya pada proses ini
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        self.shm.unlink()
+        self.shm = None
+
+    @property
+    def nbytes(self):
+        return self.shm.size if self.shm is not None else 0
+
+
+# Membuat fungsi untuk membuat array numpy read-only dari blok memori
+def _buat_array(shm, tata_letak):
+    hasil = {}
+    for nama, dtype, bentuk, posisi in tata_letak:
+        nilai = np.ndarray(bentuk, dtype=dtype, buffer=shm.buf, offset=posisi)
+        nilai.setflags(write=False)
+        hasil[nama] = nilai
+    return hasil
+
+
+# Membuat fungsi untuk melampirkan tabel bersama pada proses worker
+# Output dari fungsi adalah dict nama -> array numpy read-only dan keterangan tabel
+def lampirkan(deskripsi):
+    nama = deskripsi["nama"]
+    if nama not in _TERLAMPIR:
+        # Proses worker multiprocessing menggunakan resource tracker yang sama dengan proses utama,
+        # sehingga blok memori tetap hanya dihapus oleh proses utama
+        shm = shared_memory.SharedMemory(name=nama)
+        _TERLAMPIR[nama] = (shm, _buat_array(shm, deskripsi["tata_letak"]))
+    return _TERLAMPIR[nama][1], deskripsi["keterangan"]
+
+
+# Membuat fungsi untuk membuat tabel numerik makanan pada memori bersama
+# Tabel berisi matriks seluruh kolom nutrisi yang tersedia, kode jenis makanan, dan id makanan dari katalog makanan
+def tabel_makanan(data_makanan):
+    katalog = sebagai_katalog(data_makanan)
+    return TabelBersama({"matriks": katalog.matriks, "kode_jenis": katalog.kode_jenis, "id_makanan": katalog.id_makanan},
+                        {"kolom_nutrisi": katalog.kolom_nutrisi})
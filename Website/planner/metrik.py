@@ -0,0 +1,210 @@
+# MODUL METRIK PENYUSUNAN MENU
+
+# Jika /generate lambat, sebelumnya tidak dapat diketahui tahap mana yang memakan waktu
+# (filter alergi, target AKG, optimasi, penguraian solusi, pelonggaran menu valid, atau penyusunan menu mingguan)
+# Modul ini mencatat waktu setiap tahap dan penghitung setiap request
+#   1. ukur_tahap dan catat_penghitung menyimpan waktu tahap dan penghitung ke dalam dict info request
+#      (dict yang sama dengan keterangan penghentian dan progres optimasi)
+#   2. MetrikMenu mengumpulkan waktu tahap dan penghitung seluruh request sebagai histogram dan counter,
+#      yang ditampilkan dalam format teks Prometheus pada route /metrics
+#   3. Setiap request ditulis sebagai satu baris log JSON (logger "menu.metrik")
+# Metrik disimpan pada memori proses website, sehingga setiap proses website (misalnya worker gunicorn) memiliki metrik masing-masing
+# Format teks Prometheus ditulis langsung, sehingga prometheus_client tidak diperlukan
+
+import bisect   # Library untuk mencari bucket histogram
+import json # Library untuk menulis log terstruktur
+import logging  # Library untuk menulis log
+import math
+import threading    # Library untuk mengunci metrik yang diperbarui oleh beberapa request
+import time # Library untuk mengukur waktu tahap
+from contextlib import contextmanager
+
+logger = logging.getLogger("menu.metrik")
+
+# Batas bucket histogram
+BATAS_DETIK = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+BATAS_EVALUASI = (1000, 5000, 10000, 25000, 50000, 75000, 100000)  # 126 calon solusi x 500 generasi = 63000 evaluasi
+BATAS_COBA = (1, 10, 100, 1000, 5000, 10000, 50000, 100000, 200000)
+BATAS_PELONGGARAN = (0, 1, 2, 3, 4)
+
+# Tingkat pelonggaran menu valid pada susun_menu_mingguan
+#   0 : seluruh jendela valid, 1 : jendela valid kalori saja, 2 : seluruh solusi
+TINGKAT_FALLBACK = ("jendela_valid", "kalori", "seluruh_solusi")
+
+
+# Membuat fungsi untuk mengukur waktu satu tahap penyusunan menu
+# Waktu tahap (detik) ditambahkan ke info["waktu_tahap"][nama], tahap yang sama pada satu request dijumlahkan
+# Jika info None, maka waktu tidak dicatat
+@contextmanager
+def ukur_tahap(info, nama):
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        if info is not None:
+            waktu = info.setdefault("waktu_tahap", {})
+            waktu[nama] = waktu.get(nama, 0.0) + time.perf_counter() - mulai
+
+
+# Membuat fungsi untuk menyimpan penghitung request ke info["penghitung"]
+def catat_penghitung(info, **nilai):
+    if info is not None:
+        info.setdefault("penghitung", {}).update(nilai)
+
+
+# Membuat fungsi untuk menulis label metrik, contoh : {tahap="optimasi",le="0.5"}
+# Karakter \, ", dan baris baru pada nilai label di-escape sesuai format teks Prometheus
+def _teks_label(label):
+    if not label:
+        return ""
+    escape = lambda nilai: str(nilai).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{nama}="{escape(nilai)}"' for nama, nilai in label.items()) + "}"
+
+
+# Membuat fungsi untuk menulis angka metrik
+def _teks_angka(nilai):
+    if nilai == math.inf:
+        return "+Inf"
+    return repr(float(nilai))
+
+
+# Histogram Prometheus dengan label
+class Histogram:
+    def __init__(self, nama, keterangan, batas, nama_label=()):
+        self.nama = nama
+        self.keterangan = keterangan
+        self.batas = tuple(sorted(batas))
+        self.nama_label = tuple(nama_label)
+        self._data = {}  # nilai label -> [jumlah per bucket, total nilai, jumlah pengamatan]
+        self._kunci = threading.Lock()
+        if not self.nama_label:
+            self._data[()] = [[0] * (len(self.batas) + 1), 0.0, 0]  # Histogram tanpa label ditampilkan sejak awal
+
+    def amati(self, nilai, *label):
+        bucket = bisect.bisect_left(self.batas, nilai)  # Bucket pertama dengan batas >= nilai
+        with self._kunci:
+            data = self._data.get(label)
+            if data is None:
+                data = self._data[label] = [[0] * (len(self.batas) + 1), 0.0, 0]
+            data[0][bucket] += 1
+            data[1] += nilai
+            data[2] += 1
+
+    def teks(self):
+        with self._kunci:
+            data = [(label, list(bucket), total, n) for label, (bucket, total, n) in sorted(self._data.items())]
+        baris = [f"# HELP {self.nama} {self.keterangan}", f"# TYPE {self.nama} histogram"]
+        for label, bucket, total, n in data:
+            label = dict(zip(self.nama_label, label))
+            kumulatif = 0
+            for batas, jumlah in zip(self.batas + (math.inf,), bucket):
+                kumulatif += jumlah
+                baris.append(f"{self.nama}_bucket{_teks_label({**label, 'le': _teks_angka(batas)})} {kumulatif}")
+            baris.append(f"{self.nama}_sum{_teks_label(label)} {_teks_angka(total)}")
+            baris.append(f"{self.nama}_count{_teks_label(label)} {n}")
+        return baris
+
+
+# Counter Prometheus dengan label
+class Penghitung:
+    def __init__(self, nama, keterangan, nama_label=()):
+        self.nama = nama
+        self.keterangan = keterangan
+        self.nama_label = tuple(nama_label)
+        self._data = {}  # nilai label -> jumlah
+        self._kunci = threading.Lock()
+        if not self.nama_label:
+            self._data[()] = 0  # Counter tanpa label ditampilkan sejak awal
+
+    def tambah(self, *label, nilai=1):
+        with self._kunci:
+            self._data[label] = self._data.get(label, 0) + nilai
+
+    # Membuat fungsi untuk menyalin nilai counter (nilai label -> jumlah)
+    def _salin(self):
+        with self._kunci:
+            return dict(self._data)
+
+    def teks(self):
+        data = sorted(self._salin().items())
+        baris = [f"# HELP {self.nama} {self.keterangan}", f"# TYPE {self.nama} counter"]
+        baris += [f"{self.nama}{_teks_label(dict(zip(self.nama_label, label)))} {jumlah}" for label, jumlah in data]
+        return baris
+
+
+# Counter Prometheus yang nilainya dibaca dari fungsi sumber saat metrik ditampilkan
+# Digunakan untuk penghitung yang sudah dihitung oleh objek lain (misalnya cache hasil optimasi),
+# fungsi sumber mengembalikan dict nilai label (tuple) -> jumlah
+class PenghitungSumber(Penghitung):
+    def __init__(self, nama, keterangan, nama_label, sumber):
+        super().__init__(nama, keterangan, nama_label)
+        self.sumber = sumber
+
+    def _salin(self):
+        return dict(self.sumber())
+
+
+# Metrik seluruh request penyusunan menu
+class MetrikMenu:
+    def __init__(self):
+        self.waktu_tahap = Histogram("menu_tahap_detik", "Waktu setiap tahap penyusunan menu (detik)", BATAS_DETIK, ("tahap",))
+        self.waktu_request = Histogram("menu_request_detik", "Waktu penyusunan menu per request (detik)", BATAS_DETIK, ("sumber",))
+        self.evaluasi = Histogram("menu_evaluasi_optimasi", "Jumlah evaluasi calon solusi per optimasi", BATAS_EVALUASI)
+        self.coba = Histogram("menu_coba_mingguan", "Jumlah percobaan acak atau langkah backtracking penyusunan menu mingguan per request", BATAS_COBA)
+        self.pelonggaran = Histogram("menu_pelonggaran_mingguan", "Jumlah pelonggaran ambang batas menu mingguan per request", BATAS_PELONGGARAN)
+        self.request = Penghitung("menu_request_total", "Jumlah request penyusunan menu", ("sumber", "status"))
+        self.fallback = Penghitung("menu_fallback_total", "Jumlah request per tingkat pelonggaran menu valid", ("tingkat",))
+        self.tambahan_acak = Penghitung("menu_tambahan_acak_total", "Jumlah menu harian yang ditambahkan secara acak tanpa memenuhi ambang batas")
+        self.cache_hasil = Penghitung("menu_cache_hasil_total", "Jumlah hit dan miss cache hasil optimasi", ("hasil",))
+        self.cache_evaluasi = Penghitung("menu_cache_evaluasi_total", "Jumlah calon solusi yang diambil dari cache evaluasi (hit) atau dihitung (miss)", ("hasil",))
+        self.metrik = [self.waktu_tahap, self.waktu_request, self.evaluasi, self.coba, self.pelonggaran,
+                       self.request, self.fallback, self.tambahan_acak, self.cache_hasil, self.cache_evaluasi]
+
+    # Membuat fungsi untuk mencatat satu request dari dict info request
+    # Input dari fungsi adalah dict info, waktu request (detik), status request, dan keterangan request untuk log
+    def catat(self, info, durasi, status, **keterangan):
+        waktu_tahap = dict(info.get("waktu_tahap", {}))
+        penghitung = dict(info.get("penghitung", {}))
+        sumber = penghitung.get("sumber", "tidak_diketahui")
+
+        for tahap, detik in waktu_tahap.items():
+            self.waktu_tahap.amati(detik, tahap)
+        self.waktu_request.amati(durasi, sumber)
+        self.request.tambah(sumber, status)
+        if "n_evaluasi" in penghitung:
+            self.evaluasi.amati(penghitung["n_evaluasi"])
+        if "coba" in penghitung:
+            self.coba.amati(penghitung["coba"])
+        if "jumlah_longgar" in penghitung:
+            self.pelonggaran.amati(penghitung["jumlah_longgar"])
+        if "tingkat_fallback" in penghitung:
+            self.fallback.tambah(penghitung["tingkat_fallback"])
+        if "cache_hasil" in penghitung:
+            self.cache_hasil.tambah(penghitung["cache_hasil"])
+        for hasil in ("hit", "miss"):
+            if f"cache_evaluasi_{hasil}" in penghitung:
+                self.cache_evaluasi.tambah(hasil, nilai=penghitung[f"cache_evaluasi_{hasil}"])
+        if penghitung.get("tambahan_acak"):
+            self.tambahan_acak.tambah(nilai=penghitung["tambahan_acak"])
+
+        # Satu baris log JSON untuk setiap request
+        logger.info(json.dumps({"peristiwa": "generate", **keterangan, "status": status, "durasi_detik": round(durasi, 4),
+                                "tahap": {tahap: round(detik, 4) for tahap, detik in waktu_tahap.items()}, **penghitung},
+                               ensure_ascii=False, default=str))
+
+    # Membuat fungsi untuk menulis seluruh metrik dalam format teks Prometheus
+    def teks(self):
+        return "\n".join(baris for metrik in self.metrik for baris in metrik.teks()) + "\n"
+
+
+# Membuat fungsi untuk menyiapkan logger metrik
+# Log ditulis ke stderr satu baris JSON per request, tanpa diteruskan ke logger induk
+# Jika aktif False, maka log metrik tidak ditulis (metrik pada /metrics tetap dicatat)
+def siapkan_logger(aktif=True):
+    logger.disabled = not aktif
+    if aktif and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
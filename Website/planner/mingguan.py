@@ -0,0 +1,162 @@
+# MODUL PENYUSUNAN MENU MINGGUAN
+
+# Menu mingguan disusun dengan memilih 7 menu harian secara acak (maksimal 5000 percobaan untuk setiap pelonggaran)
+# dan memastikan jumlah makanan yang sama untuk setiap jenis makanan tidak melebihi ambang batas
+# Sebelumnya, setiap makanan pada setiap calon menu harian dicari jenisnya dengan memindai seluruh data makanan
+# berdasarkan nama makanan, setelah label porsi makanan dipotong kembali menjadi nama makanan
+# Modul ini menyiapkan indeks makanan satu kali
+#   1. id makanan -> kode nama makanan (makanan dengan nama yang sama tetapi porsi berbeda dihitung sebagai makanan yang sama)
+#   2. kode nama makanan -> jenis makanan dan ambang batas jumlahnya
+# Menu harian menyimpan id makanan, sehingga penghitungan jumlah makanan yang sama hanya berupa akses array,
+# dan label porsi makanan (nama, URT, dan berat) baru ditambahkan saat halaman hasil ditampilkan
+#
+# Pemilihan acak dapat gagal menemukan menu mingguan yang sebenarnya ada, sehingga ambang batas dilonggarkan tanpa perlu
+# cari_tepat mencari 7 menu harian dengan backtracking, sehingga menu mingguan pasti ditemukan jika ada,
+# atau terbukti tidak ada sebelum ambang batas dilonggarkan
+
+import numpy as np  # Library untuk fungsi matematika
+import pandas as pd # Library untuk mengolah dataset
+
+from .katalog import sebagai_katalog
+
+WAKTU_MAKAN = ("Sarapan", "Snack Pagi", "Makan Siang", "Snack Sore", "Makan Malam")
+TANPA_BATAS = np.iinfo(np.int32).max    # Ambang batas untuk jenis makanan yang jumlahnya tidak dibatasi
+MAKS_LANGKAH = 50000    # Jumlah maksimal langkah backtracking pada cari_tepat (sekitar 0.5 detik)
+
+
+# Membuat fungsi untuk membuat indeks nama makanan dari data makanan lengkap (katalog makanan atau dataframe)
+# Output dari fungsi adalah
+#   1. id_ke_nama : array id makanan -> kode nama makanan
+#   2. jenis_nama : array kode nama makanan -> jenis makanan (jenis dari baris pertama dengan nama tersebut)
+#   3. nama : daftar nama makanan unik (pd.Index), untuk mencari kode nama makanan dari nama makanan
+def buat_indeks_nama(data_makanan):
+    katalog = sebagai_katalog(data_makanan)
+    kode, nama = pd.factorize(katalog.nama)
+    nama = pd.Index(nama)
+    id_makanan = katalog.id_makanan
+
+    id_ke_nama = np.full(int(id_makanan.max()) + 1, -1, dtype=np.int64)
+    id_ke_nama[id_makanan] = kode
+    _, baris_pertama = np.unique(kode, return_index=True)
+    jenis_nama = katalog.jenis[baris_pertama]
+    return id_ke_nama, jenis_nama, nama
+
+
+# Membuat fungsi untuk membuat array ambang batas per kode nama makanan dari ambang batas per jenis makanan
+def batas_per_nama(jenis_nama, maks_jumlah):
+    batas = np.full(len(jenis_nama), TANPA_BATAS, dtype=np.int64)
+    for jenis, n in maks_jumlah.items():
+        batas[jenis_nama == jenis] = n
+    return batas
+
+
+# Membuat fungsi untuk menggabungkan id makanan dari seluruh waktu makan pada menu harian
+def id_harian(menu):
+    return np.array([i for waktu in WAKTU_MAKAN for i in menu[waktu]], dtype=np.int64)
+
+
+# Membuat fungsi untuk memilih menu harian secara acak sampai terdapat 7 menu harian
+# Input dari fungsi adalah kode nama makanan setiap calon menu harian, ambang batas per kode nama,
+# jumlah setiap kode nama yang sudah dipilih (diperbarui), dan posisi menu harian yang sudah dipilih (diperbarui)
+# Sama seperti sebelumnya, setiap makanan dicek terhadap jumlah sebelum menu harian tersebut ditambahkan
+# Jika rng (np.random.Generator) tidak diberikan, maka digunakan bilangan acak global numpy
+# Jika statistik (dict) diberikan, maka jumlah percobaan ditambahkan ke statistik["coba"]
+def pilih_acak(kode_harian, batas, hitung, terpilih, maks_coba=5000, rng=None, statistik=None):
+    coba = 0
+    while len(terpilih) < 7 and coba < maks_coba:
+        coba += 1
+        posisi = rng.integers(len(kode_harian)) if rng is not None else np.random.randint(len(kode_harian))    # Memilih menu harian secara acak
+        kode = kode_harian[posisi]
+        # Kalau belum melanggar ambang batas maka menu harian akan ditambahkan ke menu mingguan
+        if np.all(hitung[kode] < batas[kode]):
+            terpilih.append(posisi)
+            np.add.at(hitung, kode, 1)
+    if statistik is not None:
+        statistik["coba"] = statistik.get("coba", 0) + coba
+    return terpilih
+
+
+# Membuat fungsi untuk mencari 7 menu harian yang memenuhi ambang batas dengan backtracking
+# Input dari fungsi adalah kode nama makanan setiap calon menu harian, ambang batas per kode nama,
+# urutan calon menu harian yang dicoba (None berarti sesuai posisi), dan boleh_ulang (menu harian yang sama boleh dipilih lagi)
+# Output dari fungsi adalah (terpilih, terbukti)
+#   1. terpilih : posisi 7 menu harian jika ditemukan, jika tidak maka kombinasi terbanyak yang ditemukan selama pencarian
+#   2. terbukti : True jika seluruh kemungkinan sudah diperiksa, False jika pencarian berhenti karena batas langkah
+# Jika statistik (dict) diberikan, maka jumlah langkah backtracking ditambahkan ke statistik["coba"]
+# Pencarian dipangkas dengan
+#   1. Matriks jumlah makanan yang dibatasi untuk setiap menu harian, dibandingkan dengan sisa ambang batas
+#   2. Matriks kecocokan pasangan menu harian, menu harian yang tidak cocok dengan menu yang sudah dipilih tidak dicoba lagi
+#   3. Jika calon menu harian yang tersisa kurang dari jumlah menu yang masih dibutuhkan, maka cabang tersebut dihentikan
+def cari_tepat(kode_harian, batas, n_hari=7, urutan=None, boleh_ulang=False, maks_langkah=MAKS_LANGKAH, statistik=None):
+    if urutan is None:
+        urutan = np.arange(len(kode_harian))
+    urutan = np.asarray(urutan, dtype=np.int64)
+
+    # Matriks jumlah setiap makanan yang dibatasi (baris : calon menu harian sesuai urutan, kolom : kode nama makanan)
+    kolom = np.flatnonzero(batas < TANPA_BATAS)
+    posisi_kolom = np.full(len(batas), -1, dtype=np.int64)
+    posisi_kolom[kolom] = np.arange(len(kolom))
+    jumlah = np.zeros((len(urutan), len(kolom)), dtype=np.int64)
+    for baris, posisi in enumerate(urutan):
+        k = posisi_kolom[kode_harian[posisi]]
+        np.add.at(jumlah[baris], k[k >= 0], 1)
+    sisa_awal = batas[kolom]
+
+    # Kecocokan pasangan menu harian : kedua menu harian dapat dipilih bersama tanpa melanggar ambang batas
+    cocok = np.array([np.all(jumlah + baris <= sisa_awal, axis=1) for baris in jumlah], dtype=bool).reshape(len(urutan), len(urutan))
+    # Menu harian yang sendirinya melanggar ambang batas tidak pernah dicoba
+    layak = np.all(jumlah <= sisa_awal, axis=1)
+
+    terbaik = []
+    langkah = 0
+    dipilih = []
+
+    def cari(calon, sisa):
+        nonlocal terbaik, langkah
+        if len(dipilih) > len(terbaik):
+            terbaik = list(dipilih)
+        perlu = n_hari - len(dipilih)
+        if perlu == 0:
+            return True
+        # Calon menu harian yang masih muat pada sisa ambang batas
+        calon = calon[np.all(jumlah[calon] <= sisa, axis=1)]
+        if len(calon) == 0 or (not boleh_ulang and len(calon) < perlu):
+            return False
+        for i, baris in enumerate(calon):
+            langkah += 1
+            if langkah > maks_langkah:
+                raise _BatasLangkah
+            dipilih.append(baris)
+            # Calon berikutnya hanya menu harian setelah menu ini (kombinasi, bukan permutasi) yang cocok dengan menu ini
+            berikut = calon[i:] if boleh_ulang else calon[i + 1:]
+            if cari(berikut[cocok[baris, berikut]], sisa - jumlah[baris]):
+                return True
+            dipilih.pop()
+        return False
+
+    try:
+        ketemu = cari(np.flatnonzero(layak), sisa_awal)
+        terbukti = True
+    except _BatasLangkah:
+        ketemu, terbukti = False, False
+    if statistik is not None:
+        statistik["coba"] = statistik.get("coba", 0) + min(langkah, maks_langkah)
+    hasil = dipilih if ketemu else terbaik
+    return [int(urutan[baris]) for baris in hasil], terbukti
+
+
+# Pengecualian untuk menghentikan cari_tepat saat batas langkah tercapai
+class _BatasLangkah(Exception):
+    pass
+
+
+# Membuat fungsi untuk menambahkan label porsi makanan pada menu mingguan
+# Input dari fungsi adalah menu mingguan (id makanan per waktu makan) dan array id makanan -> label porsi makanan
+def beri_label(menu_mingguan, label):
+    hasil = []
+    for menu in menu_mingguan:
+        menu = dict(menu)
+        for waktu in WAKTU_MAKAN:
+            menu[waktu] = [label[i] for i in menu[waktu]]
+        hasil.append(menu)
+    return hasil
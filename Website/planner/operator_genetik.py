@@ -0,0 +1,248 @@
+# MODUL OPERATOR GENETIK DISKRIT
+
+# Operator bawaan C-TAEA (SBX dan PM) bekerja pada bilangan real
+# Calon solusi kemudian dibulatkan ke bawah menjadi indeks makanan pada saat evaluasi, sehingga
+#   1. Anak hasil crossover yang hampir sama dengan induknya menghasilkan menu yang sama
+#   2. Indeks makanan terakhir hampir tidak pernah terpilih
+# Modul ini menyimpan operator yang langsung bekerja pada genom integer dengan memperhatikan jenis makanan
+#   1. SamplingStratifikasi : membangkitkan calon solusi dengan jumlah tiap jenis makanan yang memenuhi constraint
+#   2. CrossoverMultiset : menggabungkan kumpulan makanan kedua induk per jenis makanan
+#   3. MutasiTukarJenis : mengganti makanan dengan makanan lain dari jenis yang sama
+#   4. RepairJenis : memperbaiki jumlah tiap jenis makanan yang melanggar constraint
+# Operator dapat digunakan untuk enkode indeks (Meal_Planning_Batch) maupun enkode slot (Meal_Planning_Slot)
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.sampling import Sampling    # Import kelas dasar sampling pymoo
+from pymoo.core.crossover import Crossover  # Import kelas dasar crossover pymoo
+from pymoo.core.mutation import Mutation    # Import kelas dasar mutasi pymoo
+from pymoo.core.repair import Repair    # Import kelas dasar repair pymoo
+
+from .fitness import KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK, KODE_SUSU
+from .slot import MAKS_PER_JENIS, jumlah_minimal_jenis
+
+# Jenis makanan yang dapat menerima sisa slot makanan harian (snack dibatasi oleh n5)
+JENIS_TAMBAHAN = (KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_POKOK)
+
+
+# Membuat fungsi untuk mengambil generator bilangan acak
+# pymoo versi baru mengirimkan random_state ke operator, versi lama tidak
+def _acak(random_state):
+    return random_state if random_state is not None else np.random.default_rng()
+
+# Membuat fungsi untuk mengecek apakah masalah optimasi menggunakan enkode slot
+def _enkode_slot(problem):
+    return hasattr(problem, "jenis_slot")
+
+
+# Kelompok makanan per jenis pada data makanan masalah optimasi
+# Anggota jenis dengan kode k adalah tabel[awal[k + 1] : awal[k + 1] + jumlah[k + 1]]
+# (kode digeser 1 karena jenis yang tidak dikenal memiliki kode -1)
+class KelompokJenis:
+    def __init__(self, problem):
+        kode = problem.kode_jenis.astype(np.int64) + 1
+        self.kode_jenis = problem.kode_jenis
+        self.tabel = np.argsort(kode, kind="stable")
+        self.jumlah = np.bincount(kode, minlength=KODE_SUSU + 2)
+        self.awal = np.concatenate([[0], np.cumsum(self.jumlah)[:-1]])
+        self.n5 = problem.n5
+        self.ada_susu = self.jumlah[KODE_SUSU + 1] > 0
+        self.minimal = jumlah_minimal_jenis(self.ada_susu)
+
+    # Membuat fungsi untuk mengambil anggota suatu jenis makanan
+    def anggota(self, kode):
+        return self.tabel[self.awal[kode + 1]:self.awal[kode + 1] + self.jumlah[kode + 1]]
+
+    # Membuat fungsi untuk mengambil jumlah makanan yang tersedia pada suatu jenis makanan
+    def tersedia(self, kode):
+        return int(self.jumlah[kode + 1])
+
+    # Membuat fungsi untuk memilih makanan acak dari jenis yang sama dengan makanan yang diberikan
+    def acak_sejenis(self, indeks, rng):
+        kode = self.kode_jenis[indeks].astype(np.int64) + 1
+        return self.tabel[self.awal[kode] + rng.integers(0, self.jumlah[kode])]
+
+    # Membuat fungsi untuk membagi jumlah makanan harian ke tiap jenis secara acak
+    # Jumlah minimal tiap jenis sesuai dengan constraint, snack diacak antara 0 sampai n5,
+    # dan sisa slot dibagi secara acak ke lauk-pauk, sayur-mayur, buah, dan makanan pokok
+    def bagi_jumlah(self, n_var, rng):
+        jumlah = {kode: min(n, self.tersedia(kode)) for kode, n in self.minimal.items()}
+        jumlah[KODE_SNACK] = min(int(rng.integers(0, self.n5 + 1)), self.tersedia(KODE_SNACK),
+                                 n_var - sum(jumlah.values()))
+        sisa = n_var - sum(jumlah.values())
+        while sisa > 0:
+            pilihan = [kode for kode in JENIS_TAMBAHAN if jumlah[kode] < min(MAKS_PER_JENIS, self.tersedia(kode))]
+            if not pilihan:
+                pilihan = [kode for kode in (KODE_SNACK,) + JENIS_TAMBAHAN if self.tersedia(kode) > 0]
+            kode = pilihan[rng.integers(0, len(pilihan))]
+            jumlah[kode] += 1
+            sisa -= 1
+        return jumlah
+
+
+# Sampling calon solusi awal berdasarkan jenis makanan
+class SamplingStratifikasi(Sampling):
+    def _do(self, problem, n_samples, *args, random_state=None, **kwargs):
+        rng = _acak(random_state)
+
+        # Pada enkode slot, setiap gen sudah terikat pada satu jenis makanan
+        # sehingga gen cukup diacak di antara batas bawah dan batas atas
+        if _enkode_slot(problem):
+            return rng.integers(0, problem.xu.astype(np.int64) + 1, size=(n_samples, problem.n_var))
+
+        # Pada enkode indeks, jumlah tiap jenis makanan diacak terlebih dahulu,
+        # kemudian makanan dipilih dari anggota jenis tersebut tanpa pengulangan (jika anggotanya cukup)
+        kelompok = KelompokJenis(problem)
+        X = np.empty((n_samples, problem.n_var), dtype=np.int64)
+        for i in range(n_samples):
+            terpilih = []
+            for kode, n in kelompok.bagi_jumlah(problem.n_var, rng).items():
+                anggota = kelompok.anggota(kode)
+                if n > 0:
+                    terpilih.append(rng.choice(anggota, size=n, replace=n > len(anggota)))
+            X[i] = np.concatenate(terpilih)
+        return X
+
+
+# Crossover berdasarkan kumpulan makanan kedua induk
+# Setiap anak mengikuti jumlah tiap jenis makanan dari salah satu induk,
+# dan makanan untuk tiap jenis dipilih secara acak dari gabungan makanan kedua induk pada jenis tersebut
+# Dengan demikian, anak dari induk yang memenuhi constraint juga memenuhi constraint
+class CrossoverMultiset(Crossover):
+    def __init__(self, prob=0.9, **kwargs):
+        super().__init__(2, 2, prob=prob, **kwargs)
+
+    def _do(self, problem, X, *args, random_state=None, **kwargs):
+        rng = _acak(random_state)
+        _, n_matings, n_var = X.shape
+        X = X.astype(np.int64)
+
+        # Pada enkode slot, posisi gen yang sama memiliki jenis makanan yang sama
+        # sehingga crossover cukup dilakukan dengan uniform crossover
+        if _enkode_slot(problem):
+            tukar = rng.random((n_matings, n_var)) < 0.5
+            return np.stack([np.where(tukar, X[1], X[0]), np.where(tukar, X[0], X[1])])
+
+        kode_jenis = problem.kode_jenis.astype(np.int64)
+        Y = np.empty_like(X)
+        for k in range(n_matings):
+            # Kumpulan makanan unik kedua induk, diurutkan berdasarkan jenis dan diacak di dalam jenis yang sama
+            gabungan = np.unique(np.concatenate([X[0, k], X[1, k]]))
+            urutan = np.argsort(kode_jenis[gabungan] + rng.random(len(gabungan)))
+            gabungan = gabungan[urutan]
+            kode_gabungan = kode_jenis[gabungan]
+
+            for anak in range(2):
+                # Jumlah tiap jenis makanan mengikuti induk ke-anak
+                kode, jumlah = np.unique(kode_jenis[X[anak, k]], return_counts=True)
+                awal = np.searchsorted(kode_gabungan, kode)
+                tersedia = np.searchsorted(kode_gabungan, kode, side="right") - awal
+                # Jika makanan unik pada suatu jenis kurang dari jumlah yang dibutuhkan, maka makanan diulang
+                posisi = np.concatenate([a + np.arange(n) % t for a, n, t in zip(awal, jumlah, tersedia)])
+                Y[anak, k] = gabungan[posisi]
+        return Y
+
+
+# Mutasi dengan mengganti makanan dengan makanan lain dari jenis yang sama
+# Setiap gen dimutasi dengan peluang prob_var (standar 1 / jumlah makanan per hari)
+class MutasiTukarJenis(Mutation):
+    def _do(self, problem, X, *args, random_state=None, **kwargs):
+        rng = _acak(random_state)
+        X = X.astype(np.int64)
+        prob_var = self.get_prob_var(problem, size=(len(X), 1))
+        mutasi = rng.random(X.shape) < prob_var
+
+        # Pada enkode slot, gen baru diacak di antara batas bawah dan batas atas posisi gen tersebut
+        if _enkode_slot(problem):
+            baru = rng.integers(0, problem.xu.astype(np.int64) + 1, size=X.shape)
+        else:
+            baru = KelompokJenis(problem).acak_sejenis(X, rng)
+        return np.where(mutasi, baru, X)
+
+
+# Repair jumlah tiap jenis makanan pada calon solusi
+# Jumlah makanan pokok, lauk-pauk, sayur-mayur, dan buah dinaikkan sampai jumlah minimal,
+# dan jumlah snack diturunkan sampai n5, dengan mengganti makanan dari jenis yang berlebih
+class RepairJenis(Repair):
+    def _do(self, problem, X, *args, random_state=None, **kwargs):
+        X = np.asarray(X)
+
+        # Pada enkode slot, constraint jenis makanan selalu terpenuhi sehingga gen cukup dijaga di dalam batas
+        if _enkode_slot(problem):
+            return np.clip(np.rint(X), 0, problem.xu).astype(np.int64)
+
+        rng = _acak(random_state)
+        X = np.clip(X.astype(np.int64), 0, len(problem.kode_jenis) - 1)
+        kelompok = KelompokJenis(problem)
+        kode_jenis = problem.kode_jenis
+
+        # Mencari calon solusi yang melanggar constraint jenis makanan
+        jenis_X = kode_jenis[X]
+        langgar = (jenis_X == KODE_SNACK).sum(axis=1) > kelompok.n5
+        for kode, n in kelompok.minimal.items():
+            if kelompok.tersedia(kode) > 0:
+                langgar |= (jenis_X == kode).sum(axis=1) < min(n, kelompok.tersedia(kode))
+
+        for i in np.flatnonzero(langgar):
+            X[i] = self._perbaiki(X[i], kelompok, rng)
+        return X
+
+    # Membuat fungsi untuk memperbaiki satu calon solusi
+    def _perbaiki(self, x, kelompok, rng):
+        jenis = kelompok.kode_jenis[x].astype(np.int64)
+        jumlah = {kode: int(np.sum(jenis == kode)) for kode in (KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK)}
+
+        # Batas atas setiap jenis makanan yang dapat diberikan (donor)
+        # Snack dibatasi oleh n5, jenis lain dibatasi oleh jumlah minimalnya, dan susu atau jenis tidak dikenal tidak dibutuhkan
+        def lebih(kode):
+            if kode == KODE_SNACK:
+                return jumlah[kode] - kelompok.n5
+            if kode in kelompok.minimal:
+                return jumlah[kode] - kelompok.minimal[kode]
+            return 1
+
+        # Mengganti makanan pada posisi donor dengan makanan acak dari jenis tujuan
+        def ganti(kode_tujuan):
+            kandidat = [j for j in range(len(x)) if jenis[j] not in jumlah or lebih(jenis[j]) > 0]
+            if not kandidat:
+                return False
+            # Donor diutamakan dari jenis yang paling berlebih
+            j = max(kandidat, key=lambda j: (lebih(jenis[j]) if jenis[j] in jumlah else MAKS_PER_JENIS, rng.random()))
+            if jenis[j] in jumlah:
+                jumlah[jenis[j]] -= 1
+            anggota = kelompok.anggota(kode_tujuan)
+            x[j] = anggota[rng.integers(0, len(anggota))]
+            jenis[j] = kode_tujuan
+            jumlah[kode_tujuan] += 1
+            return True
+
+        # Menambah jenis makanan yang kurang dari jumlah minimal
+        for kode, n in kelompok.minimal.items():
+            while jumlah[kode] < min(n, kelompok.tersedia(kode)):
+                if not ganti(kode):
+                    break
+
+        # Mengurangi snack yang melebihi n5, diganti dengan jenis makanan tambahan yang paling sedikit
+        while jumlah[KODE_SNACK] > kelompok.n5:
+            pilihan = [kode for kode in JENIS_TAMBAHAN if kelompok.tersedia(kode) > 0]
+            if not pilihan:
+                break
+            tujuan = min(pilihan, key=lambda kode: (jumlah[kode], rng.random()))
+            posisi = np.flatnonzero(jenis == KODE_SNACK)
+            j = posisi[rng.integers(0, len(posisi))]
+            anggota = kelompok.anggota(tujuan)
+            x[j] = anggota[rng.integers(0, len(anggota))]
+            jenis[j] = tujuan
+            jumlah[KODE_SNACK] -= 1
+            jumlah[tujuan] += 1
+        return x
+
+
+# Membuat fungsi untuk menyusun operator genetik diskrit yang digunakan pada C-TAEA
+# Hasil fungsi dapat langsung diberikan sebagai argumen CTAEA(..., **operator_diskrit())
+def operator_diskrit(prob_crossover=0.9, prob_mutasi=1.0, prob_var=None):
+    return dict(
+        sampling=SamplingStratifikasi(),
+        crossover=CrossoverMultiset(prob=prob_crossover),
+        mutation=MutasiTukarJenis(prob=prob_mutasi, prob_var=prob_var),
+        repair=RepairJenis(),
+    )
@@ -0,0 +1,171 @@
+# MODUL EVALUASI PARALEL
+
+# Modul ini membagi populasi pada setiap generasi ke beberapa worker sehingga evaluasi dapat berjalan di beberapa core
+# Terdapat dua jenis pool worker
+#   1. "proses" : menggunakan beberapa proses (ProcessPoolExecutor)
+#   2. "thread" : menggunakan beberapa thread dalam satu proses (ThreadPoolExecutor)
+# Pada mode "proses", data makanan (matriks nutrisi dan kode jenis) disimpan satu kali pada memori bersama (planner.memori_bersama)
+# dan setiap proses worker melampirkan memori tersebut saat pool dibuat, tanpa menyalin data makanan
+# Setiap pemanggilan evaluasi hanya mengirim potongan indeks makanan, target, dan bobot
+
+# Evaluasi paralel tidak menggunakan runner elementwise pymoo (StarmapParallelization)
+# karena runner tersebut mengirim ulang masalah optimasi beserta data makanannya untuk setiap calon solusi
+
+import time # Library untuk mengukur waktu
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor   # Library untuk membuat pool worker
+from itertools import repeat
+from multiprocessing import util  # Library untuk menutup pool saat proses worker selesai
+
+import numpy as np  # Library untuk fungsi matematika
+
+from .fitness import KOLOM_NUTRISI_5, KOLOM_NUTRISI_17, buat_bobot, pilih_kernel
+from .katalog import sebagai_katalog
+from .memori_bersama import tabel_makanan, lampirkan
+
+# Data makanan yang disimpan di setiap proses worker
+_DATA_WORKER = {}
+
+
+# Membuat fungsi yang dijalankan sekali saat proses worker dibuat
+# Fungsi ini melampirkan data makanan pada memori bersama ke proses worker (read-only)
+def _inisialisasi_worker(deskripsi):
+    array, _ = lampirkan(deskripsi)
+    _DATA_WORKER.clear()
+    _DATA_WORKER["matriks"] = array["matriks"]
+    _DATA_WORKER["kode_jenis"] = array["kode_jenis"]
+
+# Membuat fungsi untuk mengevaluasi satu potongan populasi pada worker
+# Jika data tidak diberikan, maka digunakan data makanan yang tersimpan pada proses worker
+def _evaluasi_potongan(indeks, posisi_kolom, target, bobot, n5, kernel, data=None):
+    if data is None:
+        data = _DATA_WORKER
+
+    # Matriks nutrisi sesuai kolom objektif disimpan agar tidak dibentuk ulang pada setiap generasi
+    # Matriks ini hanya berisi kolom objektif (jumlah makanan x jumlah objektif), sehingga ukurannya kecil
+    kunci = ("matriks", posisi_kolom)
+    if kunci not in data:
+        data[kunci] = np.ascontiguousarray(data["matriks"][:, list(posisi_kolom)])
+
+    return pilih_kernel(kernel)(indeks, data[kunci], target, bobot, data["kode_jenis"], n5)
+
+
+# Pool worker untuk evaluasi paralel
+class PoolEvaluasi:
+    # Input dari fungsi adalah data makanan lengkap (katalog makanan atau dataframe), jumlah worker, dan jenis pool ("proses" atau "thread")
+    # Pada mode "proses", deskripsi tabel makanan pada memori bersama yang sudah ada dapat diberikan (tabel),
+    # jika tidak diberikan, maka pool membuat tabel makanan pada memori bersama sendiri dan menghapusnya saat pool ditutup
+    def __init__(self, data_makanan, n_worker=2, mode="proses", tabel=None):
+        self.n_worker = n_worker
+        self.mode = mode
+        self.tabel = None   # Tabel makanan pada memori bersama milik pool
+
+        # Membuat pool worker
+        if mode == "proses":
+            if tabel is None:
+                self.tabel = tabel_makanan(data_makanan)
+                tabel = self.tabel.deskripsi
+            self.kolom_nutrisi = tabel["keterangan"]["kolom_nutrisi"]
+            # Setiap proses worker melampirkan tabel makanan pada memori bersama melalui initializer
+            self._data = None
+            self.executor = ProcessPoolExecutor(max_workers=n_worker,
+                                                initializer=_inisialisasi_worker,
+                                                initargs=(tabel,))
+            # Jika pool dibuat di dalam proses worker lain (misalnya PoolOptimasi), maka pool harus ditutup
+            # sebelum proses worker tersebut selesai, karena proses worker menunggu seluruh proses anaknya selesai
+            # Prioritas harus lebih tinggi dari penutupan antrian multiprocessing (10), sehingga sinyal berhenti masih terkirim
+            util.Finalize(self, self.tutup, exitpriority=20)
+        elif mode == "thread":
+            # Thread berbagi memori dengan proses utama sehingga data makanan tidak perlu dikirim
+            # Matriks seluruh kolom nutrisi yang tersedia diambil langsung dari katalog makanan
+            katalog = sebagai_katalog(data_makanan)
+            self.kolom_nutrisi = katalog.kolom_nutrisi
+            self._data = {"matriks": katalog.matriks, "kode_jenis": katalog.kode_jenis}
+            self.executor = ThreadPoolExecutor(max_workers=n_worker)
+        else:
+            raise ValueError(f"Mode paralel '{mode}' tidak dikenal, pilih 'proses' atau 'thread'")
+
+    # Membuat fungsi untuk mengevaluasi seluruh populasi secara paralel
+    # Input indeks adalah indeks makanan pada data makanan lengkap (jumlah calon solusi x jumlah makanan per hari)
+    def evaluasi(self, indeks, kolom_nutrisi, target, bobot, n5, kernel="numpy"):
+        posisi_kolom = tuple(self.kolom_nutrisi.index(kol) for kol in kolom_nutrisi)
+
+        # Membagi populasi menjadi potongan sebanyak jumlah worker
+        potongan = [p for p in np.array_split(indeks, self.n_worker) if len(p) > 0]
+        hasil = list(self.executor.map(_evaluasi_potongan, potongan, repeat(posisi_kolom), repeat(target),
+                                       repeat(bobot), repeat(n5), repeat(kernel), repeat(self._data)))
+
+        # Menggabungkan hasil evaluasi setiap worker
+        F = np.vstack([h[0] for h in hasil])
+        G = np.vstack([h[1] for h in hasil])
+        return F, G
+
+    # Membuat fungsi untuk menutup pool worker
+    def tutup(self):
+        self.executor.shutdown(wait=True)
+        if self.tabel is not None:
+            self.tabel.tutup()
+            self.tabel = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.tutup()
+
+
+# Membuat fungsi untuk mengukur percepatan (speedup) evaluasi paralel dibandingkan evaluasi serial
+# Pengukuran dilakukan untuk populasi 126 (5 objektif) dan 153 (17 objektif)
+def ukur_speedup(data_makanan, target_akg, daftar_n_worker=(2, 4), mode="proses", kernel="numpy",
+                 jumlah_makanan=14, n5=2, ulang=50, seed=1):
+    rng = np.random.default_rng(seed)
+    hasil = []
+    data_makanan = sebagai_katalog(data_makanan)
+
+    for kolom_nutrisi, n_pop in [(KOLOM_NUTRISI_5, 126), (KOLOM_NUTRISI_17, 153)]:
+        matriks, kode_jenis = data_makanan.nutrisi(kolom_nutrisi), data_makanan.kode_jenis
+        target = target_akg[kolom_nutrisi].to_numpy(dtype=np.float64)
+        bobot = buat_bobot(kolom_nutrisi)
+        indeks = rng.integers(0, len(data_makanan), size=(n_pop, jumlah_makanan))
+        fungsi = pilih_kernel(kernel)
+
+        # Mengukur waktu evaluasi serial
+        fungsi(indeks, matriks, target, bobot, kode_jenis, n5)
+        mulai = time.perf_counter()
+        for _ in range(ulang):
+            fungsi(indeks, matriks, target, bobot, kode_jenis, n5)
+        waktu_serial = (time.perf_counter() - mulai) / ulang
+
+        # Mengukur waktu evaluasi paralel untuk setiap jumlah worker
+        for n_worker in daftar_n_worker:
+            with PoolEvaluasi(data_makanan, n_worker=n_worker, mode=mode) as pool:
+                pool.evaluasi(indeks, kolom_nutrisi, target, bobot, n5, kernel)
+                mulai = time.perf_counter()
+                for _ in range(ulang):
+                    pool.evaluasi(indeks, kolom_nutrisi, target, bobot, n5, kernel)
+                waktu_paralel = (time.perf_counter() - mulai) / ulang
+
+            hasil.append({"populasi": n_pop, "objektif": len(kolom_nutrisi), "n_worker": n_worker,
+                          "serial_ms": waktu_serial * 1000, "paralel_ms": waktu_paralel * 1000,
+                          "speedup": waktu_serial / waktu_paralel})
+            print(f"Populasi {n_pop} ({len(kolom_nutrisi)} objektif), {n_worker} worker {mode} : "
+                  f"serial {waktu_serial * 1000:.3f} ms, paralel {waktu_paralel * 1000:.3f} ms, "
+                  f"speedup {waktu_serial / waktu_paralel:.2f}x")
+
+    return hasil
+
+
+# Menjalankan pengukuran speedup dari folder Website
+# Contoh : python -m planner.paralel proses 2 4
+if __name__ == "__main__":
+    import sys
+    from .dataset import baca_dataset
+
+    mode = sys.argv[1] if len(sys.argv) > 1 else "proses"
+    daftar_n_worker = tuple(int(n) for n in sys.argv[2:]) or (2, 4)
+
+    # Dataset dibaca melalui snapshot biner, nama kolom sudah dibersihkan
+    data_makanan = baca_dataset("Dataset_Makanan.xlsx")
+    data_AKG = baca_dataset("AKG.xlsx")
+    target_akg = data_AKG[(data_AKG["Tahun"] == 2019) & (data_AKG["umur"] == 3)].iloc[0]
+
+    ukur_speedup(data_makanan, target_akg, daftar_n_worker=daftar_n_worker, mode=mode)
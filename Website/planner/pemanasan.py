@@ -0,0 +1,79 @@
+# MODUL PEMANASAN OPTIMASI
+
+# Optimasi pertama setelah website dijalankan lebih lambat dari optimasi berikutnya,
+# karena import pymoo, kompilasi kernel, dan pemanggilan pertama fungsi-fungsi pymoo terjadi pada optimasi tersebut
+# Modul ini menyiapkan komponen optimasi sebelum request pertama datang
+#   1. ref_dirs_objektif menyimpan reference direction per jumlah objektif, sehingga hanya dibangkitkan satu kali
+#   2. PoolOptimasi menjalankan optimasi pada proses worker yang hidup selama website berjalan
+#      Setiap proses worker dipanaskan satu kali saat dibuat (import pymoo, data makanan, dan optimasi singkat)
+#      Progres optimasi pada proses worker dikirim kembali ke proses utama melalui dict bersama
+
+import multiprocessing  # Library untuk membuat dict bersama antar proses
+from concurrent.futures import ProcessPoolExecutor, TimeoutError   # Library untuk membuat pool proses worker
+from functools import lru_cache # Library untuk menyimpan reference direction
+
+from pymoo.util.ref_dirs import get_reference_directions    # Import reference direction untuk optimasi
+
+# Jumlah partisi das-dennis per jumlah objektif
+#   5 objektif dengan 5 partisi : 126 reference direction
+#   17 objektif dengan 2 partisi : 153 reference direction
+PARTISI_REF_DIRS = {5: 5, 17: 2}
+
+
+# Membuat fungsi untuk mengambil reference direction sesuai jumlah objektif
+# Reference direction hanya dibaca oleh C-TAEA, sehingga array yang sama digunakan oleh seluruh optimasi
+# Array tidak ditandai read-only karena fungsi Cython pymoo membutuhkan buffer yang dapat ditulis
+@lru_cache(maxsize=None)
+def ref_dirs_objektif(n_obj):
+    return get_reference_directions("das-dennis", n_obj, n_partitions=PARTISI_REF_DIRS[n_obj])
+
+
+# Pool proses worker untuk optimasi
+class PoolOptimasi:
+    # Input dari fungsi adalah jumlah proses worker dan fungsi pemanasan yang dijalankan sekali pada setiap proses worker
+    def __init__(self, n_worker=1, pemanasan=None):
+        self.n_worker = n_worker
+        self.manager = multiprocessing.Manager()    # Proses pengelola dict bersama untuk progres optimasi
+        self.executor = ProcessPoolExecutor(max_workers=n_worker, initializer=_inisialisasi_worker, initargs=(pemanasan,))
+
+    # Membuat fungsi untuk membuat seluruh proses worker sekarang, bukan saat request pertama datang
+    # Fungsi _siap dijalankan sebanyak jumlah worker, sehingga seluruh proses worker dibuat dan dipanaskan
+    def mulai(self):
+        return [self.executor.submit(_siap) for _ in range(self.n_worker)]
+
+    # Membuat fungsi untuk menjalankan fungsi optimasi pada proses worker
+    # Fungsi optimasi dipanggil dengan argumen info berupa dict bersama,
+    # isi dict bersama disalin ke info setiap selang waktu sampai optimasi selesai
+    def jalankan(self, fungsi, *args, info=None, selang=0.5, **kwargs):
+        bersama = self.manager.dict()
+        future = self.executor.submit(fungsi, *args, info=bersama, **kwargs)
+        try:
+            while True:
+                try:
+                    return future.result(timeout=selang)
+                except TimeoutError:
+                    if info is not None:
+                        info.update(bersama.copy())
+        finally:
+            if info is not None:
+                info.update(bersama.copy())
+
+    def tutup(self):
+        self.executor.shutdown()
+        self.manager.shutdown()
+
+
+# Membuat fungsi yang dijalankan sekali saat proses worker dibuat
+# Jika pemanasan gagal, maka proses worker tetap digunakan (tanpa pemanasan), karena error pada initializer merusak seluruh pool
+def _inisialisasi_worker(pemanasan):
+    if pemanasan is None:
+        return
+    try:
+        pemanasan()
+    except Exception as e:
+        print(f"❌ Pemanasan proses worker gagal : {e}")
+
+
+# Fungsi kosong untuk memastikan proses worker sudah dibuat dan sudah dipanaskan
+def _siap():
+    return True
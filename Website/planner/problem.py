@@ -0,0 +1,75 @@
+# MODUL MASALAH OPTIMASI MENU MAKANAN DENGAN EVALUASI PER POPULASI
+
+# Modul ini menyimpan versi "batch" dari Meal_Planning
+# Pada Meal_Planning (ElementwiseProblem), setiap calon solusi dievaluasi satu per satu dengan pandas
+# Pada Meal_Planning_Batch (Problem), seluruh populasi dalam satu generasi dievaluasi sekaligus
+# Nilai objektif (F) dan constraint (G) yang dihasilkan sama dengan Meal_Planning
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.problem import Problem  # Import Problem untuk mendefinisikan masalah optimasi yang dievaluasi per populasi
+
+from .fitness import buat_bobot, pilih_kernel
+from .katalog import sebagai_katalog
+from .cache import CacheFitness
+
+
+# Mendefinisikan pencarian rekomendasi makanan sebagai masalah optimasi yang dievaluasi per populasi
+class Meal_Planning_Batch(Problem):
+    # Input dari fungsi adalah target AKG, jumlah makanan untuk 1 hari, jumlah maksimal snack, dan data makanan
+    # Data makanan berupa katalog makanan (KatalogMakanan), dataframe data makanan diubah menjadi katalog
+    # Kernel fitness dapat dipilih antara "numpy" dan "jit"
+    # Jika pool diberikan, maka populasi dievaluasi secara paralel pada pool worker (PoolEvaluasi)
+    # Jika ukuran_cache lebih dari 0, maka hasil evaluasi disimpan pada cache (CacheFitness)
+    # Vektor target dan bobot objektif dapat diberikan langsung dari tabel target AKG (ProfilAKG.target_bobot),
+    # jika tidak diberikan maka dibuat dari target AKG
+    def __init__(self, Target_AKG_MaOO, jumlah_makanan, n5, dm, kernel="numpy", pool=None, ukuran_cache=0, target=None, bobot=None):
+        self.akg = Target_AKG_MaOO.reset_index(drop=True)   # Mendeklarasi Target AKG
+        self.n5 = n5 # Mendeklarasi jumlah maksimal snack
+        self.kolom_nutrisi = list(self.akg.columns) # Kolom nutrisi yang menjadi objektif
+
+        # Menyiapkan array yang digunakan selama optimasi (dibuat sekali saja)
+        dm = sebagai_katalog(dm)
+        self.matriks, self.kode_jenis = dm.nutrisi(self.kolom_nutrisi), dm.kode_jenis
+        self.target = target if target is not None else self.akg.iloc[0][self.kolom_nutrisi].to_numpy(dtype=np.float64)
+        self.bobot = bobot if bobot is not None else buat_bobot(self.kolom_nutrisi)
+        self.nama_kernel = kernel
+        self.kernel = pilih_kernel(kernel)  # Mendeklarasi kernel perhitungan fitness
+
+        # Mendeklarasi pool worker untuk evaluasi paralel
+        # Pool menyimpan data makanan lengkap, sehingga indeks makanan perlu dipetakan ke id makanan pada data lengkap
+        self.pool = pool
+        self.id_makanan = dm.id_makanan
+
+        # Mendeklarasi cache hasil evaluasi
+        self.cache = CacheFitness(ukuran_cache) if ukuran_cache > 0 else None
+
+        # Mendeklarasi variabel optimasi
+        super().__init__(n_var=jumlah_makanan,  # Mendeklarasi jumlah variabel per 1 solusi sebagai jumlah makanan untuk 1 hari
+                         n_obj=len(self.kolom_nutrisi),  # Mendeklarasi objektif optimasi sebagai Target AKG
+                         n_ieq_constr=1,    # Mendeklarasi jumlah constraint
+                         xl=0,  # Mendeklarasi index pertama untuk calon solusi
+                         xu=len(dm) - 1,    # Mendeklarasi index terakhir untuk calon solusi
+                         vtype=int) # Mendeklarasi tipe variabel untuk calon solusi yaitu integer
+
+    # Membuat fungsi untuk mengubah genom menjadi indeks makanan pada data makanan
+    # Calon solusi dibulatkan ke bawah menjadi indeks makanan, sama seperti int(i) pada Meal_Planning
+    def ke_indeks(self, X):
+        return np.asarray(X).astype(np.int64)
+
+    # Membuat fungsi untuk mengubah indeks makanan pada data makanan menjadi genom (kebalikan dari ke_indeks)
+    def dari_indeks(self, indeks, rng=None):
+        return np.asarray(indeks).astype(np.int64)
+
+    def _evaluate(self, X, out, *args, **kwargs):
+        indeks = self.ke_indeks(X)
+        if self.cache is not None:
+            out["F"], out["G"] = self.cache.evaluasi(indeks, self._hitung)
+        else:
+            out["F"], out["G"] = self._hitung(indeks)
+
+    # Membuat fungsi untuk menghitung nilai objektif dan constraint dari matriks indeks makanan
+    def _hitung(self, indeks):
+        if self.pool is not None:
+            return self.pool.evaluasi(self.id_makanan[indeks], self.kolom_nutrisi, self.target,
+                                      self.bobot, self.n5, self.nama_kernel)
+        return self.kernel(indeks, self.matriks, self.target, self.bobot, self.kode_jenis, self.n5)
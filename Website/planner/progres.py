@@ -0,0 +1,53 @@
+# MODUL PROGRES OPTIMASI
+
+# Dengan verbose=True, pymoo menampilkan satu baris ke stdout server untuk setiap generasi,
+# sedangkan user hanya melihat layar penunggu tanpa keterangan
+# CallbackProgres dipanggil oleh pymoo setiap generasi dan menyimpan progres optimasi ke dalam dict
+#   1. Generasi saat ini dan jumlah generasi maksimal
+#   2. Jumlah calon solusi feasible pada populasi
+#   3. Selisih kalori terbaik (persen terhadap target) dari calon solusi feasible
+# Dict progres dibaca oleh halaman status pekerjaan, sehingga user dapat melihat progres optimasi
+
+import time # Library untuk menghitung waktu optimasi
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.callback import Callback    # Import kelas dasar callback pymoo
+
+from .fitness import buat_bobot
+
+KOLOM_KALORI = "Kalori (kkal)"
+
+
+# Callback untuk menyimpan progres optimasi setiap generasi
+class CallbackProgres(Callback):
+    # Input dari fungsi adalah dict tujuan (progres disimpan pada tujuan["progres"]), kolom nutrisi objektif,
+    # jumlah generasi maksimal, dan jarak generasi untuk menampilkan progres ke stdout (0 berarti tidak ditampilkan)
+    def __init__(self, tujuan, kolom_nutrisi, n_gen_maks, cetak_setiap=0):
+        super().__init__()
+        self.tujuan = tujuan
+        self.n_gen_maks = n_gen_maks
+        self.cetak_setiap = cetak_setiap
+        # Objektif kalori adalah persentase selisih kalori dikali bobot, sehingga dibagi bobot untuk mendapatkan persentase selisih
+        self.indeks_kalori = list(kolom_nutrisi).index(KOLOM_KALORI) if KOLOM_KALORI in kolom_nutrisi else 0
+        self.bobot_kalori = buat_bobot(kolom_nutrisi)[self.indeks_kalori]
+        self.waktu_mulai = time.time()
+
+    def notify(self, algorithm):
+        feas, F = algorithm.pop.get("feas", "F")
+        selisih_kalori = float(np.min(F[feas, self.indeks_kalori]) / self.bobot_kalori) if feas.any() else None
+
+        # Dict progres dibuat baru setiap generasi, sehingga pembaca tidak pernah melihat progres yang setengah diperbarui
+        self.tujuan["progres"] = {
+            "generasi": int(algorithm.n_gen),
+            "n_gen_maks": self.n_gen_maks,
+            "n_feasible": int(feas.sum()),
+            "n_populasi": len(feas),
+            "selisih_kalori_terbaik": round(selisih_kalori, 2) if selisih_kalori is not None else None,
+            "n_evaluasi": int(algorithm.evaluator.n_eval),
+            "waktu": round(time.time() - self.waktu_mulai, 2),
+        }
+
+        if self.cetak_setiap and algorithm.n_gen % self.cetak_setiap == 0:
+            p = self.tujuan["progres"]
+            print(f"Generasi {p['generasi']}/{p['n_gen_maks']} : {p['n_feasible']}/{p['n_populasi']} feasible, "
+                  f"selisih kalori terbaik {p['selisih_kalori_terbaik']}%")
@@ -0,0 +1,110 @@
+# MODUL ENKODE GENOM BERDASARKAN SLOT JENIS MAKANAN
+
+# Pada enkode biasa, setiap gen dapat memilih makanan mana saja (xl = 0 sampai xu = jumlah makanan - 1)
+# sehingga banyak calon solusi yang melanggar constraint jumlah jenis makanan
+# Pada enkode slot, setiap posisi gen terikat pada satu jenis makanan (Makanan Pokok, Lauk-pauk, Sayur-mayur, Buah, atau Snack)
+# dan gen hanya memilih makanan di dalam jenis tersebut
+#   1. Constraint jumlah jenis makanan selalu terpenuhi
+#   2. Susunan menu per waktu makan dapat dibaca langsung dari posisi gen
+
+import numpy as np  # Library untuk fungsi matematika
+
+from .fitness import KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK
+from .problem import Meal_Planning_Batch
+
+# Jumlah maksimal makanan untuk setiap jenis dalam menu harian (sesuai dengan pad_df_to_six)
+MAKS_PER_JENIS = 6
+
+
+# Membuat fungsi untuk menentukan jumlah minimal tiap jenis makanan sesuai dengan constraint
+# Jika anak alergi susu, maka satu buah akan menggantikan susu pada snack sore sehingga ditambah 1 buah
+def jumlah_minimal_jenis(ada_susu=True):
+    return {
+        KODE_POKOK: 2,
+        KODE_LAUK: 1,
+        KODE_SAYUR: 1,
+        KODE_BUAH: 1 if ada_susu else 2,
+    }
+
+
+# Membuat fungsi untuk menyusun jenis makanan pada setiap posisi gen
+# Input dari fungsi adalah jumlah makanan per hari, jumlah maksimal snack, keadaan ada susu, dan jumlah makanan tersedia per jenis
+def susun_slot(jumlah_makanan, n5, ada_susu=True, tersedia=None):
+    if tersedia is None:
+        tersedia = {kode: MAKS_PER_JENIS for kode in (KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK)}
+
+    # Jumlah minimal tiap jenis sesuai dengan constraint
+    jumlah = jumlah_minimal_jenis(ada_susu)
+    jumlah[KODE_SNACK] = n5 # Snack diisi sampai batas maksimal snack
+    # Jenis makanan yang tidak tersedia (misalnya karena alergi) tidak diberi slot
+    for kode in jumlah:
+        jumlah[kode] = min(jumlah[kode], tersedia.get(kode, 0), MAKS_PER_JENIS)
+
+    # Sisa slot dibagi bergiliran ke lauk-pauk, sayur-mayur, buah, dan makanan pokok
+    sisa = jumlah_makanan - sum(jumlah.values())
+    urutan = [KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_POKOK]
+    while sisa > 0:
+        bertambah = False
+        for kode in urutan:
+            if sisa > 0 and jumlah[kode] < min(MAKS_PER_JENIS, tersedia.get(kode, 0)):
+                jumlah[kode] += 1
+                sisa -= 1
+                bertambah = True
+        if not bertambah:
+            break
+    if sisa > 0:
+        raise ValueError("Jumlah makanan yang tersedia tidak cukup untuk mengisi seluruh slot menu harian")
+
+    # Slot disusun berurutan sesuai jenis makanan
+    return np.array([kode for kode in (KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK)
+                     for _ in range(jumlah[kode])], dtype=np.int8)
+
+
+# Mendefinisikan masalah optimasi dengan enkode slot jenis makanan
+# Evaluasi objektif sama dengan Meal_Planning_Batch, hanya cara membaca genom yang berbeda
+class Meal_Planning_Slot(Meal_Planning_Batch):
+    # Input dari fungsi sama dengan Meal_Planning_Batch, ditambah keadaan ada susu
+    def __init__(self, Target_AKG_MaOO, jumlah_makanan, n5, dm, ada_susu=True, **kwargs):
+        super().__init__(Target_AKG_MaOO, jumlah_makanan, n5, dm, **kwargs)
+
+        # Mengelompokkan indeks makanan berdasarkan jenisnya
+        self.anggota = anggota = {kode: np.flatnonzero(self.kode_jenis == kode)
+                                  for kode in (KODE_POKOK, KODE_LAUK, KODE_SAYUR, KODE_BUAH, KODE_SNACK)}
+        tersedia = {kode: len(idx) for kode, idx in anggota.items()}
+
+        # Menyusun jenis makanan pada setiap posisi gen
+        self.jenis_slot = susun_slot(jumlah_makanan, n5, ada_susu, tersedia)
+
+        # Tabel untuk mengubah gen menjadi indeks makanan
+        # Gen pada posisi ke-i menunjuk ke tabel_indeks[offset[i] + gen]
+        urutan_jenis = list(anggota)
+        self.tabel_indeks = np.concatenate([anggota[kode] for kode in urutan_jenis])
+        awal = np.cumsum([0] + [tersedia[kode] for kode in urutan_jenis])[:-1]
+        self.offset = np.array([awal[urutan_jenis.index(kode)] for kode in self.jenis_slot], dtype=np.int64)
+
+        # Batas gen pada setiap posisi adalah jumlah makanan pada jenis tersebut
+        self.xl = np.zeros(self.n_var)
+        self.xu = np.array([tersedia[kode] - 1 for kode in self.jenis_slot], dtype=float)
+
+    # Membuat fungsi untuk mengubah genom slot menjadi indeks makanan pada data makanan
+    def ke_indeks(self, X):
+        gen = np.clip(np.asarray(X).astype(np.int64), 0, self.xu.astype(np.int64))
+        return self.tabel_indeks[self.offset + gen]
+
+    # Membuat fungsi untuk mengubah indeks makanan pada data makanan menjadi genom slot (kebalikan dari ke_indeks)
+    # Makanan ditempatkan pada slot dengan jenis yang sama, makanan yang tidak mendapat slot dibuang,
+    # dan slot yang tidak terisi diisi dengan makanan acak dari jenis slot tersebut
+    def dari_indeks(self, indeks, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        indeks = np.atleast_2d(np.asarray(indeks).astype(np.int64))
+        X = np.empty((len(indeks), self.n_var), dtype=np.int64)
+        for i, baris in enumerate(indeks):
+            jenis_baris = self.kode_jenis[baris]
+            for kode, anggota in self.anggota.items():
+                posisi = np.flatnonzero(self.jenis_slot == kode)
+                if len(posisi) == 0:
+                    continue
+                gen = np.searchsorted(anggota, rng.permutation(baris[jenis_baris == kode]))[:len(posisi)]
+                kurang = len(posisi) - len(gen)
+                X[i, posisi] = np.concatenate([gen, rng.integers(0, len(anggota), size=kurang)])
+        return X
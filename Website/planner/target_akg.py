@@ -0,0 +1,118 @@
+# MODUL TABEL TARGET AKG
+
+# Sebelumnya, setiap request mencari target AKG dengan memfilter dataset AKG berdasarkan tahun dan usia (cari_Tahun_AKG dan cari_Target_AKG),
+# kemudian menentukan jumlah makanan harian (jumlah_n), jumlah maksimal snack (n5), dan ambang batas menu mingguan (n2 dan n3)
+# dengan rangkaian if untuk setiap tahun dan usia
+# Modul ini menyusun tabel target AKG satu kali saat dataset AKG dimuat, dengan kunci (tahun, umur, ada_susu)
+# Setiap entri tabel (ProfilAKG) menyimpan
+#   1. Target AKG (dataframe 1 baris dan vektor numpy) untuk seluruh kolom nutrisi dan untuk 5 objektif
+#   2. Vektor bobot objektif
+#   3. Jumlah makanan harian, jumlah maksimal snack, dan ambang batas jumlah makanan yang sama dalam menu mingguan
+# Dengan demikian, penyiapan profil setiap request hanya berupa pencarian pada dict
+
+import numpy as np  # Library untuk fungsi matematika
+
+from .fitness import KOLOM_NUTRISI_5, buat_bobot
+
+
+# Membuat fungsi untuk menentukan jumlah makanan harian dan jumlah maksimal snack
+# Jumlah makanan untuk setiap usia, dengan usia termuda memiliki jumlah makanan terkecil dan usia tertua dengan jumlah terbanyak
+# Hal ini dilakukan mengingat semakin tinggi usia, semakin tinggi juga AKG yang perlu dicapai
+def jumlah_makanan_harian(tahun, umur, ada_susu):
+    # Berdasarkan standar AKG 2014, berikut adalah jumlah makanan untuk setiap usia
+    if tahun == 2014:
+        if umur == 1:
+            jumlah_n = 11
+        elif umur == 2 or umur == 3:
+            jumlah_n = 12
+        else:   # umur == 4 and umur == 5
+            jumlah_n = 14
+    # Bedasarkan standar AKG 2019, berikut adalah jumlah makanan untuk setiap usia
+    else:
+        if umur == 4 or umur == 5:
+            jumlah_n = 15
+        else:   # umur == 1 or umur == 2 or umur == 3
+            jumlah_n = 14
+
+    # Mendeklarasi jumlah maksimal snack dalam menu harian
+    n5 = 3 if umur == 4 or umur == 5 else 2
+
+    # Jika anak alergi dengan susu, maka
+    #   1. Jumlah makanan akan ditambah 1, mengingat susu tidak akan ditambahkan ke menu makanan
+    #   2. Batas maksimal snack pada menu makanan ditambah 1
+    if not ada_susu:
+        jumlah_n += 1
+        n5 += 1
+    return jumlah_n, n5
+
+
+# Membuat fungsi untuk menentukan ambang batas jumlah makanan yang sama untuk tiap jenis makanan dalam menu mingguan
+#   n2 : ambang batas makanan pokok
+#   n3 : ambang batas lauk-pauk (snack n3 + 1)
+def batas_mingguan(tahun, umur):
+    if tahun == 2014:
+        n2 = 5 if umur == 1 or umur == 2 else 6
+        n3 = 3 if umur == 1 or umur == 2 else 4
+    else:
+        n2 = 12
+        n3 = 4
+    return {"Lauk-pauk": n3, "Snack": n3 + 1, "Makanan Pokok": n2}
+
+
+# Entri tabel target AKG untuk satu kombinasi (tahun, umur, ada_susu)
+class ProfilAKG:
+    __slots__ = ("tahun", "umur", "ada_susu", "Target_AKG", "Target_AKG_obj", "target", "target_obj",
+                 "bobot", "bobot_obj", "jumlah_n", "n5", "batas_jenis")
+
+    def __init__(self, tahun, umur, ada_susu, baris_akg):
+        self.tahun, self.umur, self.ada_susu = tahun, umur, ada_susu
+
+        # Target AKG seluruh kolom nutrisi (tanpa kolom "Tahun" dan "umur") dan target 5 objektif
+        self.Target_AKG = baris_akg.drop(columns=["Tahun", "umur"]).reset_index(drop=True)
+        self.Target_AKG_obj = self.Target_AKG[KOLOM_NUTRISI_5].reset_index(drop=True)
+        self.target = _baca_saja(self.Target_AKG.iloc[0].to_numpy(dtype=np.float64))
+        self.target_obj = _baca_saja(self.Target_AKG_obj.iloc[0].to_numpy(dtype=np.float64))
+        self.bobot = _baca_saja(buat_bobot(list(self.Target_AKG.columns)))
+        self.bobot_obj = _baca_saja(buat_bobot(KOLOM_NUTRISI_5))
+
+        self.jumlah_n, self.n5 = jumlah_makanan_harian(tahun, umur, ada_susu)
+        self.batas_jenis = batas_mingguan(tahun, umur)
+
+    # Membuat fungsi untuk mengambil target AKG pada kolom nutrisi tertentu
+    def target_kolom(self, kolom):
+        return self.Target_AKG.iloc[0][list(kolom)].to_numpy(dtype=np.float64)
+
+    # Membuat fungsi untuk mengambil vektor target dan bobot objektif untuk kolom nutrisi objektif
+    # Untuk 5 objektif dan seluruh kolom nutrisi, vektor yang sudah disiapkan pada tabel digunakan langsung
+    def target_bobot(self, kolom):
+        kolom = list(kolom)
+        if kolom == KOLOM_NUTRISI_5:
+            return self.target_obj, self.bobot_obj
+        if kolom == list(self.Target_AKG.columns):
+            return self.target, self.bobot
+        return self.target_kolom(kolom), buat_bobot(kolom)
+
+
+# Membuat fungsi untuk menandai array numpy sebagai read-only, karena entri tabel digunakan bersama oleh seluruh request
+def _baca_saja(nilai):
+    nilai.setflags(write=False)
+    return nilai
+
+
+# Membuat fungsi untuk menyusun tabel target AKG dari dataset AKG
+# Output dari fungsi adalah dict (tahun, umur, ada_susu) -> ProfilAKG
+def bangun_tabel_akg(data_AKG):
+    tabel = {}
+    for (tahun, umur), baris in data_AKG.groupby(["Tahun", "umur"], sort=True):
+        for ada_susu in (True, False):
+            tabel[(int(tahun), int(umur), ada_susu)] = ProfilAKG(int(tahun), int(umur), ada_susu, baris.iloc[[0]])
+    return tabel
+
+
+# Membuat fungsi untuk mengambil entri tabel target AKG
+# Jika tahun atau usia tidak terdapat pada dataset AKG, maka ValueError
+def cari_profil_akg(tabel, tahun, umur, ada_susu=True):
+    try:
+        return tabel[(tahun, umur, bool(ada_susu))]
+    except KeyError:
+        raise ValueError(f"Target AKG untuk tahun {tahun} dan usia {umur} tahun tidak ditemukan") from None
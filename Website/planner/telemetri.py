@@ -0,0 +1,158 @@
+# MODUL TELEMETRI OPTIMASI
+
+# Selain tabel verbose pymoo pada stdout, perilaku C-TAEA setiap generasi sebelumnya tidak disimpan
+# CallbackTelemetri (opsional) mencatat setiap generasi
+#   1. Waktu evaluasi calon solusi (diukur oleh EvaluatorTerukur) dan waktu sisa generasi (mating dan survival C-TAEA)
+#   2. Jumlah evaluasi dan rasio calon solusi feasible pada populasi
+#   3. Ukuran convergence archive (pop) dan diversity archive (da) C-TAEA, serta jumlah solusi optimal
+#   4. Titik ideal (nilai objektif terkecil dari calon solusi feasible) untuk 5 atau 17 objektif dan pergerakannya dari generasi sebelumnya
+# Setiap optimasi ditulis ke satu file .npz (satu array per kolom) beserta keterangan optimasi (JSON),
+# sehingga op_size, reference direction, dan jumlah generasi dapat dipilih berdasarkan data
+# Kolom disimpan pada buffer numpy yang diperbesar dua kali lipat saat penuh, sehingga menambah satu generasi murah,
+# dan file ditulis ulang setiap simpan_setiap generasi dan saat optimasi selesai
+
+import itertools    # Library untuk nomor urut file telemetri
+import json # Library untuk menyimpan keterangan optimasi
+import os   # Library untuk membuat folder dan mengganti file telemetri
+import time # Library untuk mengukur waktu generasi
+
+import numpy as np  # Library untuk fungsi matematika
+import pandas as pd # Library untuk membaca telemetri sebagai dataframe
+from pymoo.core.callback import Callback    # Import kelas dasar callback pymoo
+from pymoo.core.evaluator import Evaluator  # Import evaluator pymoo
+
+# Kolom telemetri dan tipe datanya (kolom "ideal" berukuran jumlah generasi x jumlah objektif)
+KOLOM_TELEMETRI = {
+    "generasi": np.int32,
+    "n_evaluasi": np.int32,   # Jumlah evaluasi kumulatif
+    "waktu_evaluasi": np.float32,   # Waktu evaluasi calon solusi pada generasi ini (detik)
+    "waktu_seleksi": np.float32,    # Waktu generasi selain evaluasi : mating dan survival C-TAEA (detik)
+    "waktu_total": np.float32,  # Waktu sejak optimasi dimulai (detik)
+    "rasio_feasible": np.float32,   # Rasio calon solusi feasible pada populasi (convergence archive)
+    "n_pop": np.int32,  # Ukuran convergence archive
+    "n_da": np.int32,   # Ukuran diversity archive
+    "n_opt": np.int32,  # Jumlah solusi optimal
+    "pergerakan_ideal": np.float32, # Jarak euclidean titik ideal terhadap generasi sebelumnya (NaN jika belum ada yang feasible)
+}
+
+_urutan_file = itertools.count()
+
+
+# Evaluator pymoo yang mencatat waktu evaluasi calon solusi (detik, kumulatif)
+class EvaluatorTerukur(Evaluator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.waktu_evaluasi = 0.0
+
+    def eval(self, *args, **kwargs):
+        mulai = time.perf_counter()
+        try:
+            return super().eval(*args, **kwargs)
+        finally:
+            self.waktu_evaluasi += time.perf_counter() - mulai
+
+
+# Callback yang menjalankan beberapa callback secara berurutan
+# CallbackCollection pymoo hanya meneruskan update, sehingga notify callback tidak dipanggil
+class CallbackGabungan(Callback):
+    def __init__(self, *callback):
+        super().__init__()
+        self.callback = [c for c in callback if c is not None]
+
+    def notify(self, algorithm):
+        for c in self.callback:
+            c(algorithm)
+
+
+# Membuat fungsi untuk membuat lokasi file telemetri satu optimasi
+# Contoh : telemetri/telemetri_20260101-120000_2019_3_5obj_1234_0.npz
+def lokasi_telemetri(folder, tahun, umur, n_obj):
+    os.makedirs(folder, exist_ok=True)
+    nama = f"telemetri_{time.strftime('%Y%m%d-%H%M%S')}_{tahun}_{umur}_{n_obj}obj_{os.getpid()}_{next(_urutan_file)}.npz"
+    return os.path.join(folder, nama)
+
+
+# Callback untuk mencatat telemetri optimasi setiap generasi
+class CallbackTelemetri(Callback):
+    # Input dari fungsi adalah lokasi file .npz, kolom nutrisi objektif, keterangan optimasi (dict, disimpan sebagai JSON),
+    # jumlah generasi maksimal (kapasitas awal buffer), dan jarak generasi untuk menulis file (0 berarti hanya saat simpan dipanggil)
+    def __init__(self, lokasi, kolom_objektif, keterangan=None, n_gen_maks=100, simpan_setiap=50):
+        super().__init__()
+        self.lokasi = lokasi
+        self.kolom_objektif = list(kolom_objektif)
+        self.keterangan = dict(keterangan or {})
+        self.simpan_setiap = simpan_setiap
+        self.n = 0
+        kapasitas = max(int(n_gen_maks), 1)
+        self.kolom = {nama: np.empty(kapasitas, dtype=tipe) for nama, tipe in KOLOM_TELEMETRI.items()}
+        self.kolom["ideal"] = np.empty((kapasitas, len(self.kolom_objektif)), dtype=np.float32)
+        self.waktu_mulai = self.waktu_sebelumnya = time.perf_counter()
+        self.evaluasi_sebelumnya = 0.0
+        self.ideal_sebelumnya = None
+
+    def notify(self, algorithm):
+        sekarang = time.perf_counter()
+        waktu_evaluasi = getattr(algorithm.evaluator, "waktu_evaluasi", np.nan)
+        durasi_evaluasi = waktu_evaluasi - self.evaluasi_sebelumnya
+
+        # Titik ideal dari calon solusi feasible pada populasi
+        feas, F = algorithm.pop.get("feas", "F")
+        ideal = F[feas].min(axis=0) if feas.any() else np.full(F.shape[1], np.nan)
+        if self.ideal_sebelumnya is not None and feas.any():
+            pergerakan = float(np.linalg.norm(ideal - self.ideal_sebelumnya))
+        else:
+            pergerakan = np.nan
+
+        self._tambah(generasi=algorithm.n_gen,
+                     n_evaluasi=algorithm.evaluator.n_eval,
+                     waktu_evaluasi=durasi_evaluasi,
+                     waktu_seleksi=sekarang - self.waktu_sebelumnya - durasi_evaluasi,
+                     waktu_total=sekarang - self.waktu_mulai,
+                     rasio_feasible=feas.mean(),
+                     n_pop=len(algorithm.pop),
+                     n_da=len(algorithm.da) if getattr(algorithm, "da", None) is not None else 0,
+                     n_opt=len(algorithm.opt) if algorithm.opt is not None else 0,
+                     pergerakan_ideal=pergerakan,
+                     ideal=ideal)
+
+        self.waktu_sebelumnya = sekarang
+        self.evaluasi_sebelumnya = waktu_evaluasi
+        if feas.any():
+            self.ideal_sebelumnya = ideal
+        if self.simpan_setiap and self.n % self.simpan_setiap == 0:
+            self.simpan()
+
+    # Membuat fungsi untuk menambahkan satu generasi ke buffer kolom, buffer diperbesar dua kali lipat jika penuh
+    def _tambah(self, **baris):
+        if self.n == len(self.kolom["generasi"]):
+            for nama, buffer in self.kolom.items():
+                baru = np.empty((2 * len(buffer),) + buffer.shape[1:], dtype=buffer.dtype)
+                baru[:self.n] = buffer[:self.n]
+                self.kolom[nama] = baru
+        for nama, nilai in baris.items():
+            self.kolom[nama][self.n] = nilai
+        self.n += 1
+
+    # Membuat fungsi untuk menulis telemetri ke file .npz
+    # File ditulis ke file sementara kemudian diganti, sehingga pembaca tidak pernah melihat file yang setengah ditulis
+    def simpan(self):
+        array = {nama: buffer[:self.n] for nama, buffer in self.kolom.items()}
+        keterangan = {**self.keterangan, "kolom_objektif": self.kolom_objektif, "n_generasi": self.n}
+        array["keterangan"] = np.array(json.dumps(keterangan, default=str))
+        sementara = f"{self.lokasi}.{os.getpid()}.tmp"
+        with open(sementara, "wb") as berkas:
+            np.savez(berkas, **array)
+        os.replace(sementara, self.lokasi)
+        return self.lokasi
+
+
+# Membuat fungsi untuk membaca file telemetri
+# Output dari fungsi adalah dataframe (satu baris per generasi, titik ideal sebagai kolom "ideal <kolom objektif>") dan keterangan optimasi
+def baca_telemetri(lokasi):
+    with np.load(lokasi) as berkas:
+        keterangan = json.loads(str(berkas["keterangan"]))
+        data = pd.DataFrame({nama: berkas[nama] for nama in KOLOM_TELEMETRI})
+        ideal = berkas["ideal"]
+    for i, kolom in enumerate(keterangan["kolom_objektif"]):
+        data[f"ideal {kolom}"] = ideal[:, i]
+    return data, keterangan
@@ -0,0 +1,147 @@
+# MODUL PENGHENTIAN OPTIMASI BERDASARKAN KONVERGENSI
+
+# Optimasi dengan termination ('n_gen', 500) selalu berjalan sampai generasi ke-500,
+# walaupun front solusi feasible sudah tidak bergerak jauh sebelum generasi tersebut
+# TerminasiKonvergensi menghentikan optimasi lebih awal jika
+#   1. Rasio calon solusi feasible pada populasi sudah mencapai batas minimal, dan
+#   2. Pergerakan front solusi feasible terhadap front satu jendela generasi sebelumnya berada di bawah toleransi
+#      selama satu jendela generasi berturut-turut
+# Pergerakan front dihitung dari perubahan ideal point dan IGD antara kedua front yang dinormalisasi
+# terhadap ideal point dan nadir point front saat ini
+# Front dibandingkan dengan front satu jendela sebelumnya (bukan generasi sebelumnya),
+# karena perubahan front antar generasi pada C-TAEA naik turun dan sering kali berada di bawah toleransi walaupun front masih membaik
+# Jumlah generasi maksimal tetap digunakan sebagai batas atas
+
+# TerminasiAnggaran membatasi optimasi dengan anggaran waktu (detik) dan/atau jumlah evaluasi
+# Jika anggaran habis, maka optimasi dihentikan dan arsip solusi pada generasi terakhir digunakan sebagai hasil optimasi
+
+import time # Library untuk menghitung waktu
+from collections import deque   # Library untuk menyimpan front pada jendela generasi
+
+import numpy as np  # Library untuk fungsi matematika
+from pymoo.core.termination import Termination  # Import kelas dasar termination pymoo
+from pymoo.indicators.igd import IGD    # Import indikator IGD
+from pymoo.util.normalization import normalize  # Import normalisasi objektif
+from pymoo.termination import get_termination   # Import pembuatan termination dari tuple
+
+
+# Membuat fungsi untuk menghitung pergerakan front feasible dari front lama ke front baru
+def pergerakan_front(F_lama, F_baru):
+    if len(F_lama) == 0 or len(F_baru) == 0:
+        return np.inf
+
+    # Rentang front baru sebagai normalisasi, rentang yang sangat kecil tidak dinormalisasi
+    ideal, nadir = F_baru.min(axis=0), F_baru.max(axis=0)
+    rentang = nadir - ideal
+    rentang[rentang < 1e-32] = 1.0
+
+    gerak_ideal = np.max(np.abs(ideal - F_lama.min(axis=0)) / rentang)
+    gerak_front = IGD(normalize(F_baru, ideal, nadir)).do(normalize(F_lama, ideal, nadir))
+    return max(gerak_ideal, gerak_front)
+
+
+# Termination berdasarkan konvergensi front solusi feasible dengan jumlah generasi maksimal
+class TerminasiKonvergensi(Termination):
+    # Input dari fungsi adalah jumlah generasi maksimal, toleransi pergerakan front,
+    # jumlah generasi pada jendela, dan rasio feasible minimal pada populasi
+    def __init__(self, n_gen_maks=500, toleransi=0.02, jendela=30, rasio_feasible=0.9):
+        super().__init__()
+        self.n_gen_maks = n_gen_maks
+        self.toleransi = toleransi
+        self.jendela = jendela
+        self.rasio_feasible = rasio_feasible
+
+        self.riwayat = deque(maxlen=jendela + 1)    # Front feasible pada jendela generasi terakhir
+        self.stabil = 0 # Jumlah generasi berturut-turut dengan pergerakan front di bawah toleransi
+
+        # Keterangan penghentian optimasi
+        self.alasan = None  # "konvergen" atau "n_gen"
+        self.n_gen_berhenti = None  # Generasi saat optimasi berhenti
+        self.pergerakan = np.inf    # Pergerakan front pada generasi saat ini
+        self.rasio_feasible_akhir = 0.0 # Rasio calon solusi feasible pada populasi saat ini
+
+    def _update(self, algorithm):
+        # Menyimpan front feasible pada generasi saat ini
+        feas, F = algorithm.opt.get("feas", "F")
+        self.riwayat.append(F[feas])
+
+        # Menghitung rasio calon solusi feasible pada populasi
+        self.rasio_feasible_akhir = float(np.mean(algorithm.pop.get("feas")))
+
+        # Menghitung pergerakan front terhadap front satu jendela sebelumnya
+        if len(self.riwayat) == self.riwayat.maxlen:
+            self.pergerakan = pergerakan_front(self.riwayat[0], self.riwayat[-1])
+        if self.pergerakan <= self.toleransi and self.rasio_feasible_akhir >= self.rasio_feasible:
+            self.stabil += 1
+        else:
+            self.stabil = 0
+
+        if self.stabil >= self.jendela:
+            self.alasan, self.n_gen_berhenti = "konvergen", algorithm.n_gen
+            return 1.0
+        if algorithm.n_gen >= self.n_gen_maks:
+            self.alasan, self.n_gen_berhenti = "n_gen", algorithm.n_gen
+            return 1.0
+        return max(algorithm.n_gen / self.n_gen_maks, self.stabil / self.jendela)
+
+
+# Termination berdasarkan anggaran waktu dan jumlah evaluasi
+# Termination lain (misalnya ('n_gen', 500) atau TerminasiKonvergensi) tetap digunakan sebagai kriteria utama
+class TerminasiAnggaran(Termination):
+    # Input dari fungsi adalah termination utama, tenggat waktu (time.time()), dan jumlah evaluasi maksimal
+    # Tenggat waktu dan jumlah evaluasi maksimal bernilai None berarti tidak dibatasi
+    def __init__(self, terminasi, tenggat=None, batas_evaluasi=None):
+        super().__init__()
+        self.terminasi = get_termination(*terminasi) if isinstance(terminasi, tuple) else terminasi
+        self.tenggat = tenggat
+        self.batas_evaluasi = batas_evaluasi
+
+        # Keterangan penghentian optimasi karena anggaran
+        self.alasan = None  # "waktu" atau "evaluasi"
+        self.n_gen_berhenti = None  # Generasi saat optimasi berhenti
+
+    def _update(self, algorithm):
+        progres = self.terminasi.update(algorithm)
+        if progres >= 1.0:
+            return 1.0
+
+        # Optimasi dihentikan jika generasi berikutnya diperkirakan melewati anggaran
+        # Perkiraan waktu satu generasi adalah rata-rata waktu generasi sebelumnya
+        if self.tenggat is not None:
+            sekarang = time.time()
+            waktu_generasi = (sekarang - algorithm.start_time) / max(algorithm.n_gen, 1)
+            if sekarang + waktu_generasi >= self.tenggat:
+                self.alasan, self.n_gen_berhenti = "waktu", algorithm.n_gen
+                return 1.0
+        if self.batas_evaluasi is not None:
+            if algorithm.evaluator.n_eval + algorithm.n_offsprings > self.batas_evaluasi:
+                self.alasan, self.n_gen_berhenti = "evaluasi", algorithm.n_gen
+                return 1.0
+        return progres
+
+
+# Membuat fungsi untuk mengecek apakah optimasi dihentikan lebih awal karena anggaran waktu atau evaluasi
+def berhenti_karena_anggaran(hasil):
+    terminasi = hasil.algorithm.termination
+    return isinstance(terminasi, TerminasiAnggaran) and terminasi.alasan is not None
+
+
+# Membuat fungsi untuk menampilkan keterangan penghentian optimasi dari hasil minimize
+def ringkasan_terminasi(hasil):
+    terminasi = hasil.algorithm.termination
+    waktu = hasil.exec_time
+
+    if isinstance(terminasi, TerminasiAnggaran):
+        if terminasi.alasan == "waktu":
+            return f"Optimasi berhenti pada generasi {terminasi.n_gen_berhenti} (anggaran waktu habis) dalam {waktu:.1f} detik"
+        if terminasi.alasan == "evaluasi":
+            return (f"Optimasi berhenti pada generasi {terminasi.n_gen_berhenti} (anggaran {terminasi.batas_evaluasi} evaluasi habis) "
+                    f"dalam {waktu:.1f} detik")
+        terminasi = terminasi.terminasi
+
+    if isinstance(terminasi, TerminasiKonvergensi) and terminasi.alasan == "konvergen":
+        return (f"Optimasi berhenti pada generasi {terminasi.n_gen_berhenti} dari maksimal {terminasi.n_gen_maks} "
+                f"(konvergen: pergerakan front <= {terminasi.toleransi} selama {terminasi.jendela} generasi, "
+                f"{terminasi.rasio_feasible_akhir:.0%} feasible) dalam {waktu:.1f} detik")
+    # Generasi pada algoritma sudah bertambah 1 setelah generasi terakhir selesai
+    return f"Optimasi berhenti pada generasi {hasil.algorithm.n_gen - 1} (batas maksimal generasi) dalam {waktu:.1f} detik"
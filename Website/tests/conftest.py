@@ -0,0 +1,35 @@
+# Fixture bersama untuk pengujian regresi planner dan website
+# Pengujian dijalankan dari folder Website : python -m pytest -q
+
+import importlib
+import os
+import sys
+
+import pytest
+
+FOLDER_WEBSITE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if FOLDER_WEBSITE not in sys.path:
+    sys.path.insert(0, FOLDER_WEBSITE)
+
+from planner.dataset import baca_dataset
+from planner.katalog import KatalogMakanan
+
+
+# Dataset makanan lengkap (dibaca melalui snapshot)
+@pytest.fixture(scope="session")
+def data_makanan():
+    return baca_dataset(os.path.join(FOLDER_WEBSITE, "Dataset_Makanan.xlsx"), cetak=False)
+
+
+# Katalog makanan lengkap dari dataset makanan
+@pytest.fixture(scope="session")
+def katalog_makanan(data_makanan):
+    return KatalogMakanan.dari_dataframe(data_makanan)
+
+
+# Modul website (app.py), dataset pada app.py dibaca relatif terhadap folder Website
+@pytest.fixture(scope="session")
+def web():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(FOLDER_WEBSITE)
+        return importlib.import_module("app")
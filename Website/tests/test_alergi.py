@@ -0,0 +1,64 @@
+# Pengujian regresi IndeksAlergi
+# Makanan yang diizinkan harus sama dengan filter alergi sebelumnya (regex pada kolom "Nama Makanan" dan "Tipe"),
+# kecuali input yang membuat filter sebelumnya salah (item alergi kosong cocok dengan seluruh makanan)
+
+import numpy as np
+import pytest
+
+from planner.alergi import IndeksAlergi
+
+INPUT_ALERGI = [
+    "", "none", "None", "udang", "Udang", "telur", "susu", "kacang", "ikan", "ayam",
+    "sapi", "daging", "makanan laut", "unggas", "gandum", "kedelai", "tempe", "kerang", "ikan nila", "goreng",
+    "ud", "an", "udang, telur", "udang,telur, kacang", " Susu , Ikan ", "telur, telur", "xyz", "ayam, sapi, ikan, udang",
+]
+
+
+# Filter alergi sebelum IndeksAlergi, output dari fungsi adalah array boolean makanan yang diizinkan
+def filter_lama(data_makanan, input_alergi_str, umur):
+    lolos = np.ones(len(data_makanan), dtype=bool)
+    if input_alergi_str and input_alergi_str.lower() != 'none':
+        alergi_list = [a.strip().lower() for a in input_alergi_str.split(",")]
+        kondisi_nama = data_makanan["Nama Makanan"].str.lower().str.contains("|".join(alergi_list))
+        kondisi_tipe = data_makanan["Tipe"].str.lower().str.contains("|".join(alergi_list))
+        lolos &= ~(kondisi_nama | kondisi_tipe).to_numpy(dtype=bool)
+    if umur == 1:
+        kondisi_snack_kacang = (data_makanan["Jenis"].str.lower() == "snack") & (data_makanan["Tipe"].str.lower() == "kacang")
+        lolos &= ~kondisi_snack_kacang.to_numpy(dtype=bool)
+    return lolos
+
+
+@pytest.fixture(scope="module")
+def indeks_alergi(katalog_makanan):
+    return IndeksAlergi(katalog_makanan)
+
+
+@pytest.mark.parametrize("umur", [1, 3])
+@pytest.mark.parametrize("input_alergi_str", INPUT_ALERGI)
+def test_sama_dengan_filter_lama(data_makanan, indeks_alergi, input_alergi_str, umur):
+    izin = indeks_alergi.diizinkan(input_alergi_str, umur)
+    assert izin.dtype == bool
+    assert np.array_equal(izin, filter_lama(data_makanan, input_alergi_str, umur))
+
+
+# Filter sebelumnya menggabungkan "udang, " menjadi regex "udang|" yang cocok dengan seluruh makanan,
+# IndeksAlergi mengabaikan item alergi kosong, sehingga hasilnya sama dengan "udang"
+@pytest.mark.parametrize("input_alergi_str", ["udang, ", "udang,,telur", ","])
+def test_item_alergi_kosong(data_makanan, indeks_alergi, input_alergi_str):
+    assert not filter_lama(data_makanan, input_alergi_str, 3).any()
+    tanpa_kosong = ",".join(a for a in input_alergi_str.split(",") if a.strip())
+    assert np.array_equal(indeks_alergi.diizinkan(input_alergi_str, 3), filter_lama(data_makanan, tanpa_kosong, 3))
+
+
+# Karakter regex pada input alergi dicocokkan sebagai teks biasa
+def test_input_bukan_regex(indeks_alergi):
+    assert indeks_alergi.diizinkan("(", 3).all()
+    assert indeks_alergi.diizinkan("udang|telur", 3).all()
+
+
+# Hasil pencocokan alergi disimpan pada cache LRU dengan ukuran terbatas
+def test_cache_alergi_terbatas(indeks_alergi):
+    for i in range(indeks_alergi.cocok.cache_info().maxsize + 50):
+        indeks_alergi.diizinkan(f"alergi{i}")
+    info = indeks_alergi.cocok.cache_info()
+    assert info.currsize == info.maxsize
@@ -0,0 +1,27 @@
+# Pengujian jumlah_proses_website
+# Antrian pekerjaan hanya dapat digunakan jika website berjalan pada satu proses
+
+import pytest
+
+from planner.antrian import jumlah_proses_website
+
+
+@pytest.mark.parametrize("argv, environ, jumlah", [
+    (["gunicorn", "app:app"], {}, 1),
+    (["gunicorn", "-w", "4", "app:app"], {}, 4),
+    (["gunicorn", "-w4", "app:app"], {}, 4),
+    (["gunicorn", "--workers", "2", "app:app"], {}, 2),
+    (["gunicorn", "--workers=3", "app:app"], {}, 3),
+    (["gunicorn", "app:app"], {"GUNICORN_CMD_ARGS": "--workers 6"}, 6),
+    (["gunicorn", "-w", "2", "app:app"], {"GUNICORN_CMD_ARGS": "--workers 6"}, 2),
+    (["gunicorn", "app:app"], {"WEB_CONCURRENCY": "5"}, 5),
+    (["gunicorn", "-w", "4", "app:app"], {"N_PROSES_WEBSITE": "1"}, 1),
+])
+def test_jumlah_proses_gunicorn(argv, environ, jumlah):
+    assert jumlah_proses_website(argv, environ, gunicorn=True) == jumlah
+
+
+# Tanpa gunicorn (python app.py / flask run), website berjalan pada satu proses
+def test_jumlah_proses_tanpa_gunicorn():
+    assert jumlah_proses_website(["app.py", "-w", "4"], {"WEB_CONCURRENCY": "5"}, gunicorn=False) == 1
+    assert jumlah_proses_website(["app.py"], {"N_PROSES_WEBSITE": "3"}, gunicorn=False) == 3
@@ -0,0 +1,59 @@
+# Pengujian regresi cari_tepat
+# Backtracking harus menemukan 7 menu harian jika dan hanya jika kombinasi tersebut ada (dicek dengan brute force)
+
+import itertools
+
+import numpy as np
+import pytest
+
+from planner.mingguan import TANPA_BATAS, cari_tepat
+
+N_KASUS = 300
+
+
+# Membuat fungsi untuk mengecek apakah menu harian terpilih memenuhi ambang batas per kode nama makanan
+def memenuhi_batas(kode_harian, batas, terpilih):
+    hitung = np.zeros(len(batas), dtype=np.int64)
+    for posisi in terpilih:
+        np.add.at(hitung, kode_harian[posisi], 1)
+    return bool(np.all(hitung <= batas))
+
+
+# Membuat fungsi untuk mencari menu mingguan dengan mencoba seluruh kombinasi menu harian
+def ada_brute_force(kode_harian, batas, n_hari, boleh_ulang):
+    kombinasi = itertools.combinations_with_replacement if boleh_ulang else itertools.combinations
+    return any(memenuhi_batas(kode_harian, batas, terpilih) for terpilih in kombinasi(range(len(kode_harian)), n_hari))
+
+
+# Membuat fungsi untuk membuat kasus acak : calon menu harian (kode nama makanan) dan ambang batas per kode nama
+def kasus_acak(rng, boleh_ulang):
+    n_nama = int(rng.integers(4, 12))
+    n_menu = int(rng.integers(1, 7 if boleh_ulang else 11))
+    kode_harian = [rng.integers(0, n_nama, size=int(rng.integers(2, 7))) for _ in range(n_menu)]
+    batas = rng.integers(1, 8, size=n_nama)
+    batas[rng.random(n_nama) < 0.3] = TANPA_BATAS  # Sebagian jenis makanan tidak dibatasi
+    return kode_harian, batas
+
+
+@pytest.mark.parametrize("boleh_ulang", [False, True])
+def test_cari_tepat_sama_dengan_brute_force(boleh_ulang):
+    rng = np.random.default_rng(2024 + boleh_ulang)
+    for _ in range(N_KASUS):
+        kode_harian, batas = kasus_acak(rng, boleh_ulang)
+        terpilih, terbukti = cari_tepat(kode_harian, batas, boleh_ulang=boleh_ulang)
+
+        assert terbukti
+        assert (len(terpilih) == 7) == ada_brute_force(kode_harian, batas, 7, boleh_ulang)
+        assert memenuhi_batas(kode_harian, batas, terpilih)
+        if not boleh_ulang:
+            assert len(set(terpilih)) == len(terpilih)
+
+
+# Jika batas langkah tercapai sebelum pencarian selesai, maka hasil tidak dianggap terbukti
+def test_cari_tepat_batas_langkah():
+    kode_harian = [np.array([i % 3, 3 + i % 4]) for i in range(40)]
+    batas = np.array([1, 1, 1, 2, 2, 2, 2])
+    terpilih, terbukti = cari_tepat(kode_harian, batas, maks_langkah=10)
+    assert not terbukti
+    assert len(terpilih) < 7
+    assert memenuhi_batas(kode_harian, batas, terpilih)
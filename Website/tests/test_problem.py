@@ -0,0 +1,73 @@
+# Pengujian regresi Meal_Planning_Batch
+# Nilai objektif (F) dan constraint (G) yang dievaluasi per populasi harus sama dengan Meal_Planning (per calon solusi)
+# Meal_Planning_Batch menggunakan katalog makanan, Meal_Planning menggunakan dataframe data makanan
+
+import numpy as np
+import pytest
+
+from planner import Meal_Planning_Batch, KOLOM_NUTRISI_5
+from planner.target_akg import cari_profil_akg
+
+# Selisih maksimal nilai objektif (urutan penjumlahan nutrisi pandas dan numpy berbeda)
+# Selisih absolut 5e-13, ditambah selisih relatif untuk nilai objektif yang besar (beberapa ulp)
+TOLERANSI = 5e-13
+TOLERANSI_RELATIF = 1e-14
+# Profil pengujian : tahun AKG, umur, jumlah makanan harian, dan jumlah maksimal snack
+PROFIL = [(2019, 1, 11, 1), (2019, 3, 14, 2), (2014, 5, 15, 2), (2014, 2, 12, 1)]
+
+
+# Membuat fungsi untuk mengambil target AKG 5 objektif dari dataset AKG
+def target_akg(web, tahun, umur):
+    data_AKG = web.data_AKG
+    return data_AKG[(data_AKG["Tahun"] == tahun) & (data_AKG["umur"] == umur)][KOLOM_NUTRISI_5].reset_index(drop=True)
+
+
+@pytest.mark.parametrize("kernel", ["numpy", "jit"])
+@pytest.mark.parametrize("tahun, umur, jumlah_n, n5", PROFIL)
+def test_batch_sama_dengan_elementwise(web, kernel, tahun, umur, jumlah_n, n5):
+    Target_AKG_obj = target_akg(web, tahun, umur)
+    elementwise = web.Meal_Planning(Target_AKG_obj, jumlah_n, n5, umur, web.data_makanan)
+    batch = Meal_Planning_Batch(Target_AKG_obj, jumlah_n, n5, web.katalog_makanan, kernel=kernel)
+
+    rng = np.random.default_rng(umur * 10000 + tahun)
+    X = rng.integers(0, len(web.data_makanan), size=(200, jumlah_n))
+    F, G = elementwise.evaluate(X, return_values_of=["F", "G"])
+    F_batch, G_batch = batch.evaluate(X, return_values_of=["F", "G"])
+    np.testing.assert_allclose(F_batch, F, rtol=TOLERANSI_RELATIF, atol=TOLERANSI)
+    assert np.array_equal(G_batch, G)
+
+
+# Genom pecahan dibulatkan ke bawah menjadi indeks makanan, sama seperti int(i) pada Meal_Planning
+def test_batch_genom_pecahan(web):
+    Target_AKG_obj = target_akg(web, 2019, 3)
+    elementwise = web.Meal_Planning(Target_AKG_obj, 14, 2, 3, web.data_makanan)
+    batch = Meal_Planning_Batch(Target_AKG_obj, 14, 2, web.katalog_makanan)
+
+    rng = np.random.default_rng(7)
+    X = rng.uniform(0, len(web.data_makanan) - 1, size=(50, 14))
+    F, G = elementwise.evaluate(X, return_values_of=["F", "G"])
+    F_batch, G_batch = batch.evaluate(X, return_values_of=["F", "G"])
+    np.testing.assert_allclose(F_batch, F, rtol=TOLERANSI_RELATIF, atol=TOLERANSI)
+    assert np.array_equal(G_batch, G)
+
+
+# Vektor target dan bobot dari tabel target AKG (ProfilAKG.target_bobot) menghasilkan nilai yang sama
+# dengan vektor yang dibuat dari target AKG oleh Meal_Planning_Batch
+@pytest.mark.parametrize("tahun, umur, ada_susu", [(2019, 1, True), (2019, 3, False), (2014, 5, True), (2014, 2, False)])
+def test_batch_target_tabel_akg(web, tahun, umur, ada_susu):
+    profil = cari_profil_akg(web.tabel_akg, tahun, umur, ada_susu)
+    target, bobot = profil.target_bobot(KOLOM_NUTRISI_5)
+    elementwise = web.Meal_Planning(profil.Target_AKG_obj, profil.jumlah_n, profil.n5, umur, web.data_makanan)
+    batch = Meal_Planning_Batch(profil.Target_AKG_obj, profil.jumlah_n, profil.n5, web.katalog_makanan)
+    batch_tabel = Meal_Planning_Batch(profil.Target_AKG_obj, profil.jumlah_n, profil.n5, web.katalog_makanan,
+                                      target=target, bobot=bobot)
+
+    rng = np.random.default_rng(umur * 10000 + tahun + ada_susu)
+    X = rng.integers(0, len(web.data_makanan), size=(200, profil.jumlah_n))
+    F, G = elementwise.evaluate(X, return_values_of=["F", "G"])
+    F_batch, G_batch = batch.evaluate(X, return_values_of=["F", "G"])
+    F_tabel, G_tabel = batch_tabel.evaluate(X, return_values_of=["F", "G"])
+    assert np.array_equal(F_tabel, F_batch)
+    assert np.array_equal(G_tabel, G_batch)
+    np.testing.assert_allclose(F_tabel, F, rtol=TOLERANSI_RELATIF, atol=TOLERANSI)
+    assert np.array_equal(G_tabel, G)